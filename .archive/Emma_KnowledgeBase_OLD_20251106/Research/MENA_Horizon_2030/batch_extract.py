@@ -0,0 +1,271 @@
+"""
+Batch Report Extraction for the Emma KnowledgeBase
+ERIC - discovers research PDFs and Word reports recursively, extracts them across a worker pool,
+checkpoints every finished report and writes a batch manifest
+
+Usage:
+    python batch_extract.py [ROOT] [--workers N] [--output DIR] [--restart] [--index [DB]]
+                            [--telemetry [PATH|-]] [--quiet]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from pathlib import Path
+
+from extract_pdf import REPO_ROOT, SOURCES_DIR, extract_report, new_ocr
+from telemetry import DISABLED, Telemetry
+
+REPORT_SUFFIXES = ('.pdf', '.docx')
+DEFAULT_ROOT = REPO_ROOT / "server" / "Emma_KnowledgeBase"
+DEFAULT_OUTPUT = Path(__file__).parent / "Extracted_Text" / "batch"
+CHECKPOINT_NAME = "batch_checkpoint.jsonl"
+MANIFEST_NAME = "batch_manifest.json"
+
+
+def discover_reports(root):
+    """Return every PDF and DOCX under root (case-insensitive), sorted for stable ordering"""
+    return sorted(p for p in Path(root).rglob('*')
+                  if p.is_file() and p.suffix.lower() in REPORT_SUFFIXES and not p.name.startswith('~$'))
+
+
+def slugify(relative_path):
+    """Turn 'Research/MENA Horizon 2030.pdf' into 'research_mena_horizon_2030'"""
+    stem = str(Path(relative_path).with_suffix('')).lower()
+    return re.sub(r'[^a-z0-9]+', '_', stem).strip('_')
+
+
+def signature(report_path):
+    """Size + mtime fingerprint: a changed file is re-extracted on resume"""
+    stat = report_path.stat()
+    return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def current_signature(report_path):
+    """signature(), or None when the report was moved or deleted mid-batch"""
+    try:
+        return signature(report_path)
+    except OSError:
+        return None
+
+
+def load_checkpoint(checkpoint_path):
+    """Read finished records from the append-only checkpoint (last record per path wins)"""
+    done = {}
+    if not checkpoint_path.exists():
+        return done
+    with open(checkpoint_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Torn final line from an interrupted run
+            done[record['path']] = record
+    return done
+
+
+def append_checkpoint(checkpoint_path, record):
+    with open(checkpoint_path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def extract_one(report_path, relative, output_dir, segments_root, index_db=None, telemetry=None):
+    """Worker entry point: extract one report and return its manifest record
+
+    telemetry is the parent's Telemetry.settings(), so every worker appends
+    its stage events to the same JSONL stream.
+    """
+    slug = slugify(relative)
+    started = time.perf_counter()
+    record = {'path': str(relative), 'slug': slug, 'signature': None}
+    telemetry = Telemetry(**telemetry) if telemetry else DISABLED
+    index = ocr = None
+    try:
+        record['signature'] = signature(report_path)
+        with telemetry.stage('report', source=str(relative)):
+            if index_db:
+                from search_index import SearchIndex
+                index = SearchIndex(index_db)
+            if report_path.suffix.lower() == '.docx':
+                from extract_docx import extract_docx_report as extractor
+                options = {}
+            else:
+                # OCR inline: the batch already runs one report per CPU
+                ocr = new_ocr(workers=0)
+                extractor, options = extract_report, {'ocr': ocr or 'off'}
+            stats = extractor(report_path, output_dir / f"{slug}_Extracted.md",
+                              segments_root / slug, progress=None, index=index, telemetry=telemetry, **options)
+        record.update(status='ok', pages=stats['pages'], ocr_pages=stats.get('ocr_pages', 0),
+                      words=stats['words'], bytes=stats['bytes'],
+                      segments=stats['segments'], tokens=stats['tokens'], backend=stats['backend'])
+    except Exception as e:
+        record.update(status='failed', error=f"{type(e).__name__}: {e}")
+    finally:
+        if index:
+            index.close()
+        if ocr:
+            ocr.close()
+    record['duration'] = round(time.perf_counter() - started, 3)
+    return record
+
+
+def crashed_record(report_path, relative):
+    """Manifest record for a report whose worker process died (OOM kill, segfault in a backend)"""
+    return {'path': str(relative), 'slug': slugify(relative), 'signature': current_signature(report_path),
+            'status': 'failed', 'error': "BrokenProcessPool: worker process died (out of memory?)", 'duration': 0.0}
+
+
+def _drain(queue, workers, submit):
+    """Run queued (report, relative) jobs with at most `workers` in flight, yielding records
+
+    Returns the jobs whose futures were lost when a worker died, so the
+    caller can decide how to retry them.
+    """
+    lost, broken = [], False
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = {}
+        while (queue and not broken) or in_flight:
+            while queue and not broken and len(in_flight) < workers:
+                job = queue.popleft()
+                try:
+                    in_flight[submit(pool, *job)] = job
+                except BrokenProcessPool:
+                    queue.appendleft(job)  # Never started: the next pool picks it up
+                    broken = True
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = in_flight.pop(future)
+                try:
+                    yield future.result()
+                except BrokenProcessPool:
+                    lost.append(job)
+                    broken = True
+    return lost
+
+
+def iter_records(pending, workers, submit):
+    """Yield one record per pending job, surviving worker crashes
+
+    The window is bounded to `workers` jobs, so a crash only loses those in
+    flight. Each of them is re-run alone in a fresh single-worker pool: the
+    report that kills its worker again is recorded as failed, the rest
+    complete normally, and the batch continues with a new pool.
+    """
+    workers = workers or os.cpu_count() or 1
+    queue = deque(pending)
+    while queue:
+        casualties = yield from _drain(queue, workers, submit)
+        for job in casualties:
+            for report, relative in (yield from _drain(deque([job]), 1, submit)):
+                yield crashed_record(report, relative)
+
+
+def write_manifest(output_dir, root, records):
+    ok = [r for r in records if r['status'] == 'ok']
+    manifest = {
+        'root': str(root),
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'total_reports': len(records),
+        'succeeded': len(ok),
+        'failed': len(records) - len(ok),
+        'total_pages': sum(r['pages'] for r in ok),
+        'total_words': sum(r['words'] for r in ok),
+        'total_bytes': sum(r['bytes'] for r in ok),
+        'total_duration': round(sum(r['duration'] for r in records), 3),
+        'reports': sorted(records, key=lambda r: r['path']),
+    }
+    with open(output_dir / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def run_batch(root=DEFAULT_ROOT, output_dir=DEFAULT_OUTPUT, segments_root=SOURCES_DIR,
+              workers=None, restart=False, index_db=None, telemetry=DISABLED):
+    """Extract every PDF and DOCX under root, skipping reports already checkpointed as ok"""
+    root = Path(root)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    checkpoint_path = output_dir / CHECKPOINT_NAME
+    if restart and checkpoint_path.exists():
+        checkpoint_path.unlink()
+
+    done = load_checkpoint(checkpoint_path)
+    reports = discover_reports(root)
+    pending = []
+    for report in reports:
+        relative = report.relative_to(root)
+        previous = done.get(str(relative))
+        if previous and previous['status'] == 'ok' and previous['signature'] == current_signature(report):
+            continue
+        pending.append((report, relative))
+
+    print(f"📚 Found {len(reports)} reports (PDF/DOCX) under {root}")
+    print(f"⏭️  Already extracted: {len(reports) - len(pending)}  |  🔄 Pending: {len(pending)}\n")
+
+    def submit(pool, report, relative):
+        return pool.submit(extract_one, report, relative, output_dir, Path(segments_root), index_db,
+                           telemetry.settings())
+
+    with telemetry.stage('batch', reports=len(pending)) as stage:
+        for finished, record in enumerate(iter_records(pending, workers, submit), 1):
+            append_checkpoint(checkpoint_path, record)
+            done[record['path']] = record
+            icon = '✅' if record['status'] == 'ok' else '❌'
+            detail = f"{record.get('pages', 0)} pages, {record['duration']:.1f}s" if record['status'] == 'ok' else record['error']
+            print(f"{icon} [{finished}/{len(pending)}] {record['path']} ({detail})")
+            if record['status'] == 'ok':
+                stage.update(pages=stage.fields.get('pages', 0) + record['pages'],
+                             bytes_out=stage.fields.get('bytes_out', 0) + record['bytes'])
+            else:
+                stage.update(failed=stage.fields.get('failed', 0) + 1)
+
+    current = {str(report.relative_to(root)) for report in reports}
+    manifest = write_manifest(output_dir, root, [r for path, r in done.items() if path in current])
+
+    print("\n" + "="*60)
+    print("🎯 BATCH EXTRACTION COMPLETE!")
+    print("="*60)
+    print(f"📄 Reports: {manifest['succeeded']} ok, {manifest['failed']} failed")
+    print(f"📊 Pages: {manifest['total_pages']:,}  |  📝 Words: {manifest['total_words']:,}")
+    print(f"📍 Manifest: {output_dir / MANIFEST_NAME}")
+    print("="*60)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ERIC batch PDF/DOCX extraction")
+    parser.add_argument('root', nargs='?', default=DEFAULT_ROOT, help="Directory searched recursively for PDF and DOCX reports")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="Directory for markdown, checkpoint and manifest")
+    parser.add_argument('--segments', default=SOURCES_DIR, help="Root for per-report segment directories")
+    parser.add_argument('--restart', action='store_true', help="Ignore the checkpoint and extract everything again")
+    parser.add_argument('--index', nargs='?', const='default', metavar='DB',
+                        help="Upsert every report into the FTS5 search index (optionally at DB)")
+    parser.add_argument('--telemetry', nargs='?', const='1', metavar='PATH',
+                        help="Append JSONL stage events to PATH ('-' = stdout, default: Reports/pipeline_telemetry.jsonl)")
+    parser.add_argument('--quiet', action='store_true', help="Suppress the console banners")
+    args = parser.parse_args()
+
+    index_db = None
+    if args.index:
+        from search_index import INDEX_DB
+        index_db = INDEX_DB if args.index == 'default' else Path(args.index)
+    telemetry = Telemetry.from_env('ERIC', args.telemetry, args.quiet)
+    with telemetry.console():
+        manifest = run_batch(args.root, args.output, args.segments, args.workers, args.restart, index_db, telemetry)
+    return 1 if manifest['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
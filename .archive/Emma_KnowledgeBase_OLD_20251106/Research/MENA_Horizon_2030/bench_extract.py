@@ -0,0 +1,390 @@
+"""
+Extraction Scaling Benchmark for ERIC
+Generates synthetic reports locally and measures how extract_pdf scales with
+page count, text density and duplicate ratio, per extraction configuration
+(text backend x dedupe mode), so we no longer depend on one real PDF
+
+Synthetic reports are plain PDFs written here (standard Helvetica fonts, Flate
+content streams, streamed to disk so 5,000 pages stay small in memory), with
+numbered headings, body text from a fixed vocabulary, a share of repeated
+boilerplate lines, an optional running header / "Page N of M" footer and an
+optional diagonal CONFIDENTIAL watermark. They are seeded, so a given set of
+parameters always produces the same file, and cached under
+Benchmarks/synthetic/.
+
+Each run extracts in a fresh interpreter (peak RSS is per process), with OCR
+off and the section index on, and reports pages/sec, peak and extraction RSS,
+and output size (markdown + sections.json + segments). Results land in
+Benchmarks/bench_<stamp>.json (plus latest.json and a history.jsonl line);
+scaling curves are plotted to Benchmarks/scaling.png when matplotlib is
+installed. --compare flags configurations that got slower or bigger than a
+previous result file.
+
+Usage:
+    python bench_extract.py [--pages 10,100,1000,5000] [--backends pypdfium2,pypdf|all] [--dedupe exact,probabilistic]
+                            [--lines 40] [--duplicate-ratio 0.3] [--no-headers] [--no-watermark] [--segments]
+                            [--repeat N] [--output DIR] [--compare PREVIOUS.json] [--tolerance 0.2] [--no-plot]
+"""
+
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+from telemetry import Telemetry
+
+HERE = Path(__file__).parent
+BENCH_DIR = Path(os.environ.get("ERIC_BENCH_DIR", HERE / "Benchmarks"))
+DEFAULT_PAGES = (10, 100, 1000, 5000)
+DEFAULT_LINES = 40
+DEFAULT_DUPLICATE_RATIO = 0.3
+DEFAULT_TOLERANCE = 0.2
+SEED = 2030
+
+# === SYNTHETIC REPORTS ======================================================
+
+VOCABULARY = (
+    "regional energy transition investment corridor logistics water security desalination capacity "
+    "sovereign fund diversification tourism fintech adoption labour market participation youth "
+    "education reform digital infrastructure hydrogen solar grid interconnection manufacturing "
+    "localisation supply chain resilience governance regulatory framework public private partnership "
+    "urbanisation housing mobility healthcare outcomes productivity growth scenario baseline outlook "
+    "Gulf Levant Maghreb Egypt Saudi Emirates Jordan Morocco Oman Qatar Bahrain Kuwait 2030 2035 2040"
+).split()
+BOILERPLATE = [
+    "This document is provided for information purposes only and does not constitute advice.",
+    "Figures are indicative and subject to revision as new data becomes available.",
+    "Source: AHKStrategies analysis based on national statistics and IMF projections.",
+    "Note: totals may not sum due to rounding.",
+    "See the methodology annex for definitions and data sources.",
+    "Reproduction is permitted with attribution to the MENA Horizon 2030 programme.",
+    "All monetary values are in constant 2023 US dollars unless stated otherwise.",
+    "Projections assume no major change in the regional security environment.",
+]
+HEADER_TEXT = "MENA Horizon 2030 | Synthetic Scaling Report"
+WATERMARK_TEXT = "CONFIDENTIAL"
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4 in points
+MARGIN_X, TOP_Y, LEADING = 56, 770, 16
+BODY_SIZE, HEADING_SIZE = 10, 14
+HEADING_EVERY = 4  # A numbered heading every N pages feeds the section index
+
+
+def _escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def _body_line(rng, duplicate_ratio):
+    if rng.random() < duplicate_ratio:
+        return rng.choice(BOILERPLATE)
+    words = [rng.choice(VOCABULARY) for _ in range(rng.randint(9, 14))]
+    return ' '.join(words).capitalize() + '.'
+
+
+def page_content(number, total, rng, lines, duplicate_ratio, headers, watermark):
+    """PDF content stream (uncompressed) for one synthetic page"""
+    ops = []
+    if watermark:
+        ops.append(f"q 0.88 g BT /F2 72 Tf 0.7071 0.7071 -0.7071 0.7071 140 240 Tm ({WATERMARK_TEXT}) Tj ET Q")
+    if headers:
+        ops.append(f"BT /F1 8 Tf {MARGIN_X} 806 Td ({_escape(HEADER_TEXT)}) Tj ET")
+        ops.append(f"BT /F1 8 Tf {PAGE_WIDTH // 2 - 24} 30 Td (Page {number} of {total}) Tj ET")
+    y = TOP_Y
+    if number % HEADING_EVERY == 1:
+        chapter = number // HEADING_EVERY + 1
+        title = ' '.join(rng.choice(VOCABULARY) for _ in range(3)).title()
+        ops.append(f"BT /F2 {HEADING_SIZE} Tf {MARGIN_X} {y} Td ({chapter}. {_escape(title)}) Tj ET")
+        y -= LEADING * 2
+    body = [f"({_escape(_body_line(rng, duplicate_ratio))}) Tj T*" for _ in range(lines)]
+    ops.append(f"BT /F1 {BODY_SIZE} Tf {LEADING} TL {MARGIN_X} {y} Td " + ' '.join(body) + " ET")
+    return '\n'.join(ops).encode('latin-1')
+
+
+def synthetic_name(pages, lines, duplicate_ratio, headers, watermark, seed=SEED):
+    return (f"synthetic_p{pages}_l{lines}_d{round(duplicate_ratio * 100)}"
+            f"_h{int(headers)}_w{int(watermark)}_s{seed}.pdf")
+
+
+def write_synthetic_pdf(path, pages, lines=DEFAULT_LINES, duplicate_ratio=DEFAULT_DUPLICATE_RATIO, headers=True,
+                        watermark=True, seed=SEED):
+    """Write a seeded synthetic report; objects stream straight to disk (atomic rename at the end)"""
+    rng = random.Random(seed)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(f'.{os.getpid()}.tmp')
+    offsets = {}
+    # 1 catalog, 2 page tree, 3-4 fonts, then (page, content) pairs
+    page_ids = [5 + 2 * i for i in range(pages)]
+    with open(partial, 'wb') as out:
+        def obj(number, body):
+            offsets[number] = out.tell()
+            out.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+
+        out.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        obj(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        kids = ' '.join(f"{i} 0 R" for i in page_ids)
+        obj(2, f"<< /Type /Pages /Count {pages} /Kids [{kids}] >>".encode())
+        obj(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+        obj(4, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+        for index, page_id in enumerate(page_ids):
+            content = zlib.compress(page_content(index + 1, pages, rng, lines, duplicate_ratio, headers, watermark))
+            obj(page_id, (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                          f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {page_id + 1} 0 R >>").encode())
+            obj(page_id + 1, f"<< /Length {len(content)} /Filter /FlateDecode >>\nstream\n".encode()
+                + content + b"\nendstream")
+        xref = out.tell()
+        count = max(offsets) + 1
+        out.write(f"xref\n0 {count}\n0000000000 65535 f \n".encode())
+        out.write(''.join(f"{offsets[n]:010d} 00000 n \n" for n in range(1, count)).encode())
+        out.write(f"trailer\n<< /Size {count} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    os.replace(partial, path)
+    return path
+
+
+def synthetic_pdf(pages, lines, duplicate_ratio, headers, watermark, directory=None):
+    """Cached synthetic report for these parameters"""
+    path = Path(directory or BENCH_DIR / "synthetic") / synthetic_name(pages, lines, duplicate_ratio, headers, watermark)
+    if not path.exists():
+        write_synthetic_pdf(path, pages, lines, duplicate_ratio, headers, watermark)
+    return path
+
+
+# === MEASUREMENT ============================================================
+
+# Runs in a fresh interpreter: ru_maxrss is the peak of that process alone
+PROBE = """
+import json, resource, sys, time
+from pathlib import Path
+args = json.loads(sys.argv[1])
+scale = 1 if sys.platform == 'darwin' else 1024  # ru_maxrss: bytes on macOS, KiB on Linux
+import importlib, extract_pdf, pdf_backends
+importlib.import_module(pdf_backends.BACKENDS[args['backend']].module)
+rss_ready = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+out = Path(args['output'])
+started = time.perf_counter()
+stats = extract_pdf.extract_report(args['pdf'], out, args['segments'], backend=args['backend'], ocr='off')
+elapsed = time.perf_counter() - started
+outputs = [out, extract_pdf.index_path(out)] + (sorted(Path(args['segments']).glob('*')) if args['segments'] else [])
+print(json.dumps({'elapsed_s': elapsed, 'peak_rss_bytes': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+                  'ready_rss_bytes': rss_ready, 'output_bytes': sum(p.stat().st_size for p in outputs if p.is_file()),
+                  'stats': stats}))
+"""
+
+
+def measure(pdf_path, backend, dedupe, work_dir, segments=False):
+    """Extract pdf_path once in a child interpreter; returns the raw measurement"""
+    import shutil
+
+    run_dir = Path(work_dir) / f"{Path(pdf_path).stem}_{backend}_{dedupe}"
+    shutil.rmtree(run_dir, ignore_errors=True)
+    run_dir.mkdir(parents=True)
+    args = {'pdf': str(pdf_path), 'backend': backend, 'output': str(run_dir / 'extracted.md'),
+            'segments': str(run_dir / 'segments') if segments else None}
+    env = dict(os.environ, ERIC_DEDUPE_MODE=dedupe, ERIC_TELEMETRY='', ERIC_OCR='off')
+    result = subprocess.run([sys.executable, '-c', PROBE, json.dumps(args)], cwd=HERE, env=env,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'probe failed')
+    shutil.rmtree(run_dir, ignore_errors=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(page_counts=DEFAULT_PAGES, backends=None, dedupe_modes=('exact',), lines=DEFAULT_LINES,
+                  duplicate_ratio=DEFAULT_DUPLICATE_RATIO, headers=True, watermark=True, segments=False, repeat=1,
+                  output_dir=BENCH_DIR, telemetry=None, progress=print):
+    """Every (pages x backend x dedupe) combination, best of `repeat`; returns the result rows"""
+    from pdf_backends import available_backends
+
+    backends = backends or available_backends()[:1]
+    rows = []
+    for pages in page_counts:
+        started = time.perf_counter()
+        pdf = synthetic_pdf(pages, lines, duplicate_ratio, headers, watermark, Path(output_dir) / "synthetic")
+        progress(f"📄 {pdf.name}: {pdf.stat().st_size / 1024:.0f} KB (ready in {time.perf_counter() - started:.1f} s)")
+        for backend in backends:
+            for dedupe in dedupe_modes:
+                config = f"{backend}/{dedupe}"
+                try:
+                    runs = [measure(pdf, backend, dedupe, Path(output_dir) / "work", segments) for _ in range(repeat)]
+                except RuntimeError as e:
+                    progress(f"   ❌ {config}: {e}")
+                    continue
+                best = min(runs, key=lambda r: r['elapsed_s'])
+                stats = best['stats']
+                row = {
+                    'config': config, 'backend': backend, 'dedupe': dedupe, 'pages': pages, 'lines': lines,
+                    'duplicate_ratio': duplicate_ratio, 'headers': headers, 'watermark': watermark,
+                    'segments': segments, 'elapsed_s': round(best['elapsed_s'], 4),
+                    'pages_per_sec': round(pages / max(best['elapsed_s'], 1e-9), 1),
+                    'peak_rss_mb': round(max(r['peak_rss_bytes'] for r in runs) / 2**20, 1),
+                    'extract_rss_mb': round(max(r['peak_rss_bytes'] - r['ready_rss_bytes'] for r in runs) / 2**20, 1),
+                    'output_kb': round(best['output_bytes'] / 1024, 1),
+                    'unique_lines': stats['unique_lines'], 'words': stats['words'], 'sections': stats['sections'],
+                    'dedupe_kb': round(stats['dedupe_bytes'] / 1024, 1),
+                }
+                rows.append(row)
+                if telemetry:
+                    telemetry.emit('bench_extract', **row)
+                progress(f"   ✅ {config:<26} {row['pages_per_sec']:>9.1f} pages/s  peak {row['peak_rss_mb']:>6.1f} MB "
+                         f"(+{row['extract_rss_mb']:.1f})  out {row['output_kb']:>8.1f} KB  "
+                         f"{row['unique_lines']:,} unique lines")
+    return rows
+
+
+# === RESULTS ================================================================
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE, capture_output=True, text=True,
+                              timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def save_results(rows, output_dir=BENCH_DIR, params=None):
+    """bench_<stamp>.json + latest.json + one history.jsonl line; returns the result file"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    document = {'created': datetime.now().isoformat(timespec='seconds'), 'commit': git_commit(),
+                'python': platform.python_version(), 'platform': platform.platform(), 'params': params or {},
+                'results': rows}
+    path = output_dir / f"bench_{stamp}.json"
+    for target in (path, output_dir / "latest.json"):
+        partial = target.with_suffix(f'.{os.getpid()}.tmp')
+        partial.write_text(json.dumps(document, indent=2), encoding='utf-8')
+        os.replace(partial, target)
+    with open(output_dir / "history.jsonl", 'a', encoding='utf-8') as f:
+        f.write(json.dumps({k: document[k] for k in ('created', 'commit', 'params')}
+                           | {'results': [{k: r[k] for k in ('config', 'pages', 'pages_per_sec', 'peak_rss_mb',
+                                                             'output_kb')} for r in rows]}) + '\n')
+    return path
+
+
+def load_results(path):
+    return json.loads(Path(path).read_text(encoding='utf-8'))['results']
+
+
+def _run_key(row):
+    return tuple(row[k] for k in ('config', 'pages', 'lines', 'duplicate_ratio', 'headers', 'watermark', 'segments'))
+
+
+def compare(rows, previous, tolerance=DEFAULT_TOLERANCE):
+    """Regressions against previous result rows: slower, more memory or bigger output beyond tolerance"""
+    before = {_run_key(r): r for r in previous}
+    regressions = []
+    for row in rows:
+        old = before.get(_run_key(row))
+        if not old:
+            continue
+        checks = [('pages_per_sec', row['pages_per_sec'] < old['pages_per_sec'] * (1 - tolerance)),
+                  ('peak_rss_mb', row['peak_rss_mb'] > old['peak_rss_mb'] * (1 + tolerance)),
+                  ('output_kb', row['output_kb'] > old['output_kb'] * (1 + tolerance))]
+        for metric, regressed in checks:
+            if regressed:
+                regressions.append({'config': row['config'], 'pages': row['pages'], 'metric': metric,
+                                    'before': old[metric], 'after': row[metric]})
+    return regressions
+
+
+def plot(rows, path):
+    """pages/sec, peak RSS and output size against page count, one curve per configuration"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    metrics = (('pages_per_sec', 'pages / sec'), ('peak_rss_mb', 'peak RSS (MB)'), ('output_kb', 'output (KB)'))
+    figure, axes = plt.subplots(1, len(metrics), figsize=(15, 4.5))
+    for config in sorted({r['config'] for r in rows}):
+        series = sorted((r for r in rows if r['config'] == config), key=lambda r: r['pages'])
+        for axis, (metric, _) in zip(axes, metrics):
+            axis.plot([r['pages'] for r in series], [r[metric] for r in series], marker='o', label=config)
+    for axis, (_, label) in zip(axes, metrics):
+        axis.set_xscale('log')
+        axis.set_xlabel('pages')
+        axis.set_ylabel(label)
+        axis.grid(True, which='both', alpha=0.3)
+    axes[0].legend(fontsize=8)
+    figure.suptitle('ERIC PDF extraction scaling (synthetic reports)')
+    figure.tight_layout()
+    figure.savefig(path, dpi=120)
+    plt.close(figure)
+    return path
+
+
+def main(argv=None):
+    import argparse
+
+    from pdf_backends import BACKENDS, available_backends
+
+    parser = argparse.ArgumentParser(description="Benchmark ERIC PDF extraction on synthetic reports")
+    parser.add_argument('--pages', default=','.join(map(str, DEFAULT_PAGES)), help="Comma-separated page counts")
+    parser.add_argument('--backends', help=f"Comma-separated backends or 'all' (default: {available_backends()[:1]})")
+    parser.add_argument('--dedupe', default='exact', help="Comma-separated dedupe modes: exact, probabilistic")
+    parser.add_argument('--lines', type=int, default=DEFAULT_LINES, help="Body lines per page (text density)")
+    parser.add_argument('--duplicate-ratio', type=float, default=DEFAULT_DUPLICATE_RATIO,
+                        help="Share of body lines drawn from repeated boilerplate")
+    parser.add_argument('--no-headers', dest='headers', action='store_false', help="No running header/footer")
+    parser.add_argument('--no-watermark', dest='watermark', action='store_false', help="No CONFIDENTIAL watermark")
+    parser.add_argument('--segments', action='store_true', help="Also write knowledge-base segments")
+    parser.add_argument('--repeat', type=int, default=1, help="Runs per configuration (best time kept)")
+    parser.add_argument('--output', type=Path, default=BENCH_DIR, help="Results, synthetic PDFs and plots")
+    parser.add_argument('--compare', type=Path, metavar='PREVIOUS.json', help="Fail on regressions against this file")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help="Allowed relative regression")
+    parser.add_argument('--no-plot', dest='plot', action='store_false')
+    parser.add_argument('--telemetry', nargs='?', const='1', metavar='PATH',
+                        help="Append JSONL events to PATH ('-' = stdout, default: Reports/pipeline_telemetry.jsonl)")
+    parser.add_argument('--quiet', action='store_true', help="Suppress the console banners")
+    args = parser.parse_args(argv)
+
+    backends = (available_backends() if args.backends == 'all'
+                else [b.strip() for b in args.backends.split(',')] if args.backends else None)
+    unknown = [b for b in backends or () if b not in BACKENDS]
+    if unknown:
+        parser.error(f"unknown backend(s): {', '.join(unknown)}")
+    dedupe_modes = [m.strip() for m in args.dedupe.split(',')]
+    if set(dedupe_modes) - {'exact', 'probabilistic'}:
+        parser.error("dedupe modes are 'exact' and 'probabilistic'")
+    page_counts = [int(p) for p in args.pages.split(',') if p.strip()]
+    params = {'pages': page_counts, 'backends': backends, 'dedupe': dedupe_modes, 'lines': args.lines,
+              'duplicate_ratio': args.duplicate_ratio, 'headers': args.headers, 'watermark': args.watermark,
+              'segments': args.segments, 'repeat': args.repeat}
+
+    baseline = load_results(args.compare) if args.compare else None  # Read now: it may be latest.json
+
+    telemetry = Telemetry.from_env('ERIC', args.telemetry, args.quiet)
+    with telemetry.console():
+        print("🏁 ERIC Extraction Scaling Benchmark")
+        print(f"   {args.lines} lines/page, {args.duplicate_ratio:.0%} repeated, headers {'on' if args.headers else 'off'}, "
+              f"watermark {'on' if args.watermark else 'off'}\n")
+        with telemetry.stage('bench_extract', **params) as stage:
+            rows = run_benchmark(page_counts, backends, dedupe_modes, args.lines, args.duplicate_ratio, args.headers,
+                                 args.watermark, args.segments, args.repeat, args.output, telemetry)
+            stage.update(runs=len(rows))
+        if not rows:
+            print("\n❌ No configuration completed")
+            return 1
+        result_file = save_results(rows, args.output, params)
+        print(f"\n💾 Results: {result_file}")
+        if args.plot:
+            try:
+                print(f"📈 Scaling curves: {plot(rows, Path(args.output) / 'scaling.png')}")
+            except ImportError:
+                print("⚠️  matplotlib not installed: skipped the scaling plot (results JSON has every number)")
+        if args.compare:
+            regressions = compare(rows, baseline, args.tolerance)
+            for r in regressions:
+                print(f"❌ {r['config']} @ {r['pages']} pages: {r['metric']} {r['before']} → {r['after']}")
+            print(f"\n{'❌' if regressions else '✅'} {len(regressions)} regression(s) beyond {args.tolerance:.0%} "
+                  f"against {args.compare.name}")
+            return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""
+Token-Accurate Segment Writer for ERIC Extraction
+Streams cleaned paragraphs into heading-aware Emma_KnowledgeBase segments
+(same segment_NN.md + manifest.json layout as sync_knowledge_base.js)
+"""
+
+import json
+import math
+import re
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+
+MAX_TOKENS_PER_SEGMENT = 1800  # Mirrors sync_knowledge_base.js
+HEADING_BREAK_FILL = 0.5       # Break before a heading once a segment is half full
+SENTENCE_PATTERN = re.compile(r'[^.!?]+(?:[.!?]+|$)')
+SECTION_HEADING = re.compile(r'^(Section|Chapter|Part|Annex|Appendix)\s+[\w.]+\s*[:.\-–]', re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def load_token_counter():
+    """Return (name, count_fn) for the best local tokenizer available
+
+    Uses tiktoken's cl100k_base when installed and its encoding file is cached
+    locally (TIKTOKEN_CACHE_DIR on offline nodes), otherwise falls back to the
+    4-chars-per-token estimate used by sync_knowledge_base.js. Cached, so a
+    warm worker loads the encoding once.
+    """
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding('cl100k_base')
+    except Exception:
+        return 'estimate-4cpt', lambda text: math.ceil(len(text) / 4)
+    return 'tiktoken-cl100k_base', lambda text: len(encoding.encode_ordinary(text))
+
+
+def is_heading(line):
+    """Heuristic heading detection for flattened PDF/DOCX text lines"""
+    if line.startswith('#'):
+        return True
+    if len(line) > 100 or line.endswith(('.', ',', ';')):
+        return False
+    if SECTION_HEADING.match(line):
+        return True
+    return len(line) > 3 and line == line.upper() and any(c.isalpha() for c in line)
+
+
+def utc_timestamp():
+    return datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+class Segmenter:
+    """Packs a stream of paragraphs into heading-aware segments of at most max_tokens
+
+    feed() and finish() return the segments completed by that call, so only the
+    segment currently being filled is held in memory.
+    """
+
+    def __init__(self, max_tokens=MAX_TOKENS_PER_SEGMENT, token_counter=None):
+        self.max_tokens = max_tokens
+        self.tokenizer, self.count_tokens = token_counter or load_token_counter()
+        self._separator_tokens = self.count_tokens('\n\n')
+        self._parts = []
+        self._tokens = 0
+        self._index = 0
+        self._ready = []
+
+    def feed(self, paragraph):
+        """Add one cleaned paragraph (a heading or a block of body text)"""
+        paragraph = paragraph.strip()
+        if paragraph:
+            if is_heading(paragraph) and self._tokens >= self.max_tokens * HEADING_BREAK_FILL:
+                self._complete()
+            tokens = self.count_tokens(paragraph)
+            if tokens > self.max_tokens:
+                self._feed_long(paragraph)
+            else:
+                self._add(paragraph, tokens)
+        return self._take_ready()
+
+    def finish(self):
+        """Complete the pending segment (if any)"""
+        self._complete()
+        return self._take_ready()
+
+    def _feed_long(self, paragraph):
+        """Split an oversized paragraph on sentence boundaries (then words) so no segment exceeds max_tokens"""
+        for sentence in SENTENCE_PATTERN.findall(paragraph):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            tokens = self.count_tokens(sentence)
+            if tokens > self.max_tokens:
+                for piece in self._split_words(sentence):
+                    self._add(piece, self.count_tokens(piece))
+            else:
+                self._add(sentence, tokens)
+
+    def _split_words(self, sentence):
+        """Yield runs of whole words of at most max_tokens (a word that alone exceeds it is cut)"""
+        words, tokens = [], 0
+        for word in sentence.split():
+            word_tokens = self.count_tokens(' ' + word)
+            if words and tokens + word_tokens > self.max_tokens:
+                yield ' '.join(words)
+                words, tokens = [], 0
+            if word_tokens > self.max_tokens:
+                yield from self._split_chars(word)
+                continue
+            words.append(word)
+            tokens += word_tokens
+        if words:
+            yield ' '.join(words)
+
+    def _split_chars(self, word):
+        """Cut one enormous token run (a URL, a base64 blob) into pieces of at most max_tokens"""
+        width = self.max_tokens
+        while word:
+            piece = word[:width]
+            if width > 1 and self.count_tokens(piece) > self.max_tokens:
+                width //= 2
+                continue
+            yield piece
+            word = word[len(piece):]
+
+    def _add(self, text, tokens):
+        if self._parts and self._tokens + self._separator_tokens + tokens > self.max_tokens:
+            self._complete()
+        if self._parts:
+            self._tokens += self._separator_tokens
+        self._parts.append(text)
+        self._tokens += tokens
+
+    def _complete(self):
+        if not self._parts:
+            return
+        content = '\n\n'.join(self._parts)
+        self._index += 1
+        self._ready.append({
+            'index': self._index,
+            'content': content,
+            'size': len(content),
+            'tokens': self.count_tokens(content),
+        })
+        self._parts = []
+        self._tokens = 0
+
+    def _take_ready(self):
+        ready, self._ready = self._ready, []
+        return ready
+
+
+class SegmentWriter:
+    """Writes each segment to disk as soon as the Segmenter completes it"""
+
+    def __init__(self, output_dir, source, source_label='MENA Horizon 2030 Research Document',
+                 max_tokens=MAX_TOKENS_PER_SEGMENT, token_counter=None, on_segment=None):
+        self.output_dir = Path(output_dir)
+        self.source = source
+        self.source_label = source_label
+        self.on_segment = on_segment
+        self.segmenter = Segmenter(max_tokens, token_counter)
+        self.tokenizer = self.segmenter.tokenizer
+        self._segments = []
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        for stale in self.output_dir.glob('segment_*.md'):
+            stale.unlink()
+
+    def feed(self, paragraph):
+        for segment in self.segmenter.feed(paragraph):
+            self._write(segment)
+
+    def _write(self, segment):
+        filename = f"segment_{segment['index']:02d}.md"
+        header = (
+            "---\n"
+            f"segment: {segment['index']}\n"
+            f"source: {self.source_label}\n"
+            f"synced: {utc_timestamp()}\n"
+            f"tokens: ~{segment['tokens']}\n"
+            "---\n\n"
+        )
+        (self.output_dir / filename).write_text(header + segment['content'], encoding='utf-8')
+        self._segments.append({
+            'index': segment['index'],
+            'filename': filename,
+            'size': segment['size'],
+            'tokens': segment['tokens'],
+        })
+        if self.on_segment:
+            self.on_segment(segment)
+
+    def close(self):
+        """Write the last segment and manifest.json; returns the manifest"""
+        for segment in self.segmenter.finish():
+            self._write(segment)
+        manifest = {
+            'source': self.source,
+            'synced_at': utc_timestamp(),
+            'tokenizer': self.tokenizer,
+            'segments': self._segments,
+            'total_segments': len(self._segments),
+            'total_size': sum(seg['size'] for seg in self._segments),
+            'total_tokens': sum(seg['tokens'] for seg in self._segments),
+        }
+        with open(self.output_dir / 'manifest.json', 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
@@ -0,0 +1,270 @@
+"""
+DOCX Text Extraction for the Emma KnowledgeBase
+ERIC - streams word/document.xml paragraph by paragraph (iterparse, processed
+elements cleared) through the same clean → dedupe → markdown + segments stages
+as extract_pdf.py, so very large Word reports extract in flat memory; heading
+styles become the levels of the .sections.json index (see sections.py)
+
+Library:
+    from extract_docx import iter_paragraphs, extract_docx_report
+    for text in iter_paragraphs("mena_horizon_2030.docx"):   # '## Heading', '- item', 'Body text'
+
+CLI (several files are extracted in parallel; batch_extract.py also picks up .docx):
+    python extract_docx.py REPORT.docx [MORE.docx ...] [--output-dir DIR] [--workers N] [--telemetry [PATH|-]] [--quiet]
+"""
+
+import os
+import re
+import sys
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from xml.etree.ElementTree import iterparse
+
+from chunking import SegmentWriter
+from extract_pdf import OUTPUT_DIR, SOURCES_DIR, clean_page, new_deduper
+from sections import SectionIndexBuilder, index_path
+from telemetry import DISABLED, Telemetry
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+BODY_DEPTH = 2  # w:document > w:body
+HEADING_STYLE = re.compile(r'^heading\s*(\d)$', re.IGNORECASE)
+BACKEND_NAME = 'docx-iterparse'
+
+
+def paragraph_styles(archive):
+    """Read word/styles.xml into ({style id: heading level}, {list style ids})
+
+    Style ids are localised ('Heading1', 'Titre1', ...), so levels come
+    from the style name ('heading 1', 'Title') or its outline level.
+    """
+    levels, list_styles = {}, set()
+    try:
+        stream = archive.open('word/styles.xml')
+    except KeyError:
+        return levels, list_styles
+    with stream:
+        for _, style in iterparse(stream):
+            if style.tag != f'{W}style':
+                continue
+            style_id = style.get(f'{W}styleId')
+            name = style.find(f'{W}name')
+            name = name.get(f'{W}val', '') if name is not None else ''
+            outline = style.find(f'{W}pPr/{W}outlineLvl')
+            match = HEADING_STYLE.match(name)
+            if name.lower() == 'title':
+                levels[style_id] = 1
+            elif match:
+                levels[style_id] = min(int(match.group(1)), 6)
+            elif outline is not None and int(outline.get(f'{W}val', 9)) < 6:
+                levels[style_id] = int(outline.get(f'{W}val')) + 1
+            elif style.find(f'{W}pPr/{W}numPr') is not None:
+                list_styles.add(style_id)
+            style.clear()
+    return levels, list_styles
+
+
+def _paragraph_text(paragraph):
+    parts = []
+    for node in paragraph.iter():
+        if node.tag == f'{W}t' and node.text:
+            parts.append(node.text)
+        elif node.tag in (f'{W}tab', f'{W}br', f'{W}cr'):
+            parts.append(' ')
+    return ''.join(parts)
+
+
+def iter_paragraphs(docx_path):
+    """Yield each non-empty paragraph as a markdown line ('#' headings, '- ' list items)
+
+    Table cells and text boxes are yielded as their own paragraphs. Every
+    top-level body element is cleared once parsed, so memory does not grow
+    with the document.
+    """
+    with zipfile.ZipFile(docx_path) as archive:
+        levels, list_styles = paragraph_styles(archive)
+        with archive.open('word/document.xml') as stream:
+            depth = 0
+            body = None
+            for event, element in iterparse(stream, events=('start', 'end')):
+                if event == 'start':
+                    depth += 1
+                    if depth == BODY_DEPTH and element.tag == f'{W}body':
+                        body = element
+                    continue
+                depth -= 1
+                if element.tag == f'{W}p':
+                    text = _paragraph_text(element).strip()
+                    if text:
+                        style = element.find(f'{W}pPr/{W}pStyle')
+                        style = style.get(f'{W}val') if style is not None else None
+                        if levels.get(style):
+                            yield f"{'#' * levels[style]} {text}"
+                        elif style in list_styles or element.find(f'{W}pPr/{W}numPr') is not None:
+                            yield f"- {text}"
+                        else:
+                            yield text
+                    element.clear()  # Nested text-box paragraphs are gone before the outer one is read
+                if depth == BODY_DEPTH and body is not None:
+                    body.clear()
+
+
+def extract_docx_report(docx_path, output_file, segments_dir, title=None, progress=None, index=None,
+                        telemetry=DISABLED, sections=True):
+    """Extract one Word report in a single streaming pass: paragraphs → clean → dedupe → markdown + segments
+
+    Returns the same stats dict as extract_pdf.extract_report (pages are 0
+    for Word input; paragraphs counts the source paragraphs read).
+    sections=False skips the <output>.sections.json heading index.
+    """
+    docx_path = Path(docx_path)
+    output_file = Path(output_file)
+    title = title or docx_path.stem
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    if progress:
+        progress("🧹 Streaming, cleaning and segmenting paragraph by paragraph...")
+
+    seen = new_deduper()
+    stager = None
+    if index:
+        from search_index import PassageStager
+        stager = PassageStager(own_segmenter=segments_dir is None)
+
+    segments = None
+    if segments_dir is not None:
+        segments = SegmentWriter(segments_dir, source=f"ERIC DOCX Extraction: {docx_path.name}",
+                                 source_label=f"{title} Research Document",
+                                 on_segment=stager.on_segment if stager else None)
+    raw_chars = 0
+    paragraphs = 0
+    unique_count = 0
+    word_count = 0
+    outline = SectionIndexBuilder() if sections else None
+    section_list = []
+
+    with telemetry.stage('extract', source=docx_path.name, backend=BACKEND_NAME) as stage, \
+            open(output_file, 'w', encoding='utf-8', newline='\n') as out:
+        stage.add_input(docx_path)
+        header = f"""# {title} - Extracted Text
+**Extracted Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+**Source:** {docx_path.name}
+**Processing:** ERIC - Emma KnowledgeBase Processor
+
+---
+
+"""
+        out.write(header)
+        offset = len(header.encode('utf-8'))
+        for paragraph in iter_paragraphs(docx_path):
+            paragraphs += 1
+            raw_chars += len(paragraph)
+            for line in clean_page(paragraph):
+                trimmed = line.strip()
+                if not trimmed or not seen.add(trimmed):
+                    continue
+                if unique_count:
+                    out.write("\n\n")
+                    offset += 2
+                out.write(trimmed)
+                if outline:
+                    outline.observe(trimmed, offset)
+                    offset += len(trimmed.encode('utf-8'))
+                if stager:
+                    stager.feed(trimmed)
+                if segments:
+                    segments.feed(trimmed)
+                unique_count += 1
+                word_count += len(trimmed.split())
+            if progress and paragraphs % 500 == 0:
+                progress(f"📖 Processing... {paragraphs:,} paragraphs")
+        out.write("""
+
+---
+
+**End of Document**
+""")
+        out.flush()
+        if outline:
+            section_list = outline.write(output_file, offset, source=docx_path.name, backend=BACKEND_NAME)
+        manifest = segments.close() if segments else {'total_segments': 0, 'total_tokens': 0, 'tokenizer': None}
+        stage.update(paragraphs=paragraphs, words=word_count, segments=manifest['total_segments'],
+                     tokens=manifest['total_tokens'], sections=len(section_list))
+        stage.add_output(output_file)
+        if outline:
+            stage.add_output(index_path(output_file))
+        if segments:
+            stage.add_output(*Path(segments_dir).glob('segment_*.md'))
+
+    if stager:
+        with telemetry.stage('index', source=docx_path.name) as stage:
+            stager.write(index, output_file)
+            stage.update(passages=len(stager.rows))
+    return {
+        'pages': 0,
+        'pages_extracted': 0,
+        'paragraphs': paragraphs,
+        'words': word_count,
+        'bytes': output_file.stat().st_size,
+        'raw_chars': raw_chars,
+        'unique_lines': unique_count,
+        'segments': manifest['total_segments'],
+        'tokens': manifest['total_tokens'],
+        'tokenizer': manifest['tokenizer'],
+        'dedupe_bytes': seen.nbytes,
+        'backend': BACKEND_NAME,
+        'sections': len(section_list),
+    }
+
+
+def _extract_to(docx_path, output_dir, segments_root, telemetry=None):
+    docx_path = Path(docx_path)
+    slug = docx_path.stem.lower().replace(' ', '_')
+    telemetry = Telemetry(**telemetry) if telemetry else DISABLED
+    return docx_path, extract_docx_report(docx_path, Path(output_dir) / f"{docx_path.stem}_Extracted.md",
+                                          Path(segments_root) / slug, telemetry=telemetry)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ERIC DOCX extraction")
+    parser.add_argument('docx', nargs='+', type=Path, help="Word reports to extract")
+    parser.add_argument('--output-dir', type=Path, default=OUTPUT_DIR, help="Directory for markdown output")
+    parser.add_argument('--segments', type=Path, default=SOURCES_DIR, help="Root for per-report segment directories")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--telemetry', nargs='?', const='1', metavar='PATH',
+                        help="Append JSONL stage events to PATH ('-' = stdout, default: Reports/pipeline_telemetry.jsonl)")
+    parser.add_argument('--quiet', action='store_true', help="Suppress the console banners")
+    args = parser.parse_args(argv)
+
+    telemetry = Telemetry.from_env('ERIC', args.telemetry, args.quiet)
+    with telemetry.console():
+        return _run(args, telemetry)
+
+
+def _run(args, telemetry):
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    print("🚀 ERIC DOCX Extraction Protocol - INITIATED")
+    print(f"📄 Targets: {len(args.docx)} Word report(s)\n")
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=min(args.workers or os.cpu_count() or 1, len(args.docx))) as pool:
+        futures = {pool.submit(_extract_to, path, args.output_dir, args.segments, telemetry.settings()): path
+                   for path in args.docx}
+        for future in as_completed(futures):
+            try:
+                path, stats = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"❌ {futures[future].name}: {type(e).__name__}: {e}")
+                continue
+            print(f"✅ {path.name}: {stats['paragraphs']:,} paragraphs, {stats['words']:,} words, "
+                  f"{stats['segments']} segments (~{stats['tokens']:,} tokens)")
+
+    print("\n✅ ERIC Protocol Complete" if not failed else f"\n❌ {failed} report(s) failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,115 +1,478 @@
 """
-PDF Text Extraction Script for MENA Horizon 2030
+PDF Text Extraction for MENA Horizon 2030
 ERIC - Emma KnowledgeBase Processor
+
+Library (the PDF backend is imported on first use, so importing this module is
+cheap and a long-running worker can process many PDFs in one process):
+    from extract_pdf import extract
+    for page in extract("report.pdf"):                      # Page(number, lines, raw_chars)
+    for segment in extract("report.pdf", unit="segments"):  # {'index', 'content', 'size', 'tokens'}
+    for page in extract("report.pdf", pages="1-3", every=2):  # quick preview
+
+extract_report() also writes <output>.sections.json, a heading/offset index
+that sections.SectionReader uses to load one section at a time.
+
+Input is memory-mapped and pages are parsed on demand, so a page selection
+only touches the bytes of the pages it reads.
+
+CLI:
+    python extract_pdf.py [PDF] [--output FILE] [--segments DIR] [--backend NAME]
+    python extract_pdf.py [PDF] --pages 1-20,45 [--sample N]   # preview to stdout
+    python extract_pdf.py [PDF] --telemetry [PATH|-] [--quiet]  # JSONL stage events (see telemetry.py)
+    python extract_pdf.py [PDF] --ocr on|off|auto                # OCR text-less pages (see ocr_fallback.py)
 """
 
 import os
 import re
+import sys
+import time
+from collections import deque, namedtuple
 from datetime import datetime
 from pathlib import Path
-from PyPDF2 import PdfReader
+
+from chunking import MAX_TOKENS_PER_SEGMENT, Segmenter, SegmentWriter
+from line_dedupe import LineDeduper
+from pdf_backends import BACKENDS, open_document
+from sections import SectionIndexBuilder, index_path
+from telemetry import DISABLED, Telemetry
 
 # File paths
 PDF_PATH = Path(__file__).parent / "MENA Horizon 2030.pdf"
 OUTPUT_DIR = Path(__file__).parent / "Extracted_Text"
 OUTPUT_FILE = OUTPUT_DIR / "MENA_Horizon_2030_Extracted.md"
+REPO_ROOT = Path(__file__).resolve().parents[4]
+SOURCES_DIR = REPO_ROOT / "server" / "Emma_KnowledgeBase" / "sources"
+SEGMENTS_DIR = Path(os.environ.get("ERIC_SEGMENTS_DIR", SOURCES_DIR / "mena_horizon_2030"))
 
-print("🚀 ERIC PDF Extraction Protocol - INITIATED")
-print(f"📄 Target: {PDF_PATH.name}\n")
-
-# Read PDF
-try:
-    reader = PdfReader(str(PDF_PATH))
-    total_pages = len(reader.pages)
-    print(f"✅ PDF Loaded Successfully")
-    print(f"📊 Total Pages: {total_pages}\n")
-    
-    # Extract text from all pages
-    raw_text = []
-    for page_num, page in enumerate(reader.pages, 1):
-        text = page.extract_text()
-        if text.strip():
-            raw_text.append(text)
-        if page_num % 10 == 0:
-            print(f"📖 Processing... {page_num}/{total_pages} pages")
-    
-    print(f"\n✅ Text Extraction Complete")
-    combined_text = "\n".join(raw_text)
-    print(f"📝 Raw Text Length: {len(combined_text):,} characters")
-    
-    # Clean the text
-    print("\n🧹 Cleaning extracted text...")
-    cleaned_text = combined_text
-    
-    # Remove common header/footer patterns
-    cleaned_text = re.sub(r'Page \d+ of \d+', '', cleaned_text, flags=re.IGNORECASE)
-    cleaned_text = re.sub(r'\d+\s*\|\s*Page', '', cleaned_text, flags=re.IGNORECASE)
-    cleaned_text = re.sub(r'Page\s+\d+', '', cleaned_text, flags=re.IGNORECASE)
-    
-    # Remove watermark patterns
-    cleaned_text = re.sub(r'CONFIDENTIAL|DRAFT|INTERNAL USE ONLY', '', cleaned_text, flags=re.IGNORECASE)
-    
-    # Clean excessive whitespace
-    cleaned_text = re.sub(r'\n{3,}', '\n\n', cleaned_text)
-    cleaned_text = re.sub(r'[ \t]+', ' ', cleaned_text)
-    
-    # Split into lines and remove duplicates while preserving order
-    lines = cleaned_text.split('\n')
-    unique_lines = []
-    seen = set()
-    
-    for line in lines:
-        trimmed = line.strip()
-        if trimmed and trimmed not in seen:
-            unique_lines.append(trimmed)
-            seen.add(trimmed)
-    
-    final_text = '\n\n'.join(unique_lines)
-    
-    # Create markdown document
-    markdown_content = f"""# MENA Horizon 2030 - Extracted Text
+# Line dedupe: 'exact' (64-bit fingerprints) or 'probabilistic' (bloom filter only)
+DEDUPE_MODE = os.environ.get("ERIC_DEDUPE_MODE", "exact")
+LINES_PER_PAGE = 60  # Initial dedupe sizing; the stores grow past it
+
+# Text backend: 'auto' calibrates the installed backends per document
+PDF_BACKEND = os.environ.get("ERIC_PDF_BACKEND", "auto")
+
+# OCR for text-less pages: 'auto' (when tesseract is installed), 'on' (required) or 'off'
+OCR_MODE = os.environ.get("ERIC_OCR", "auto")
+OCR_MIN_CHARS = 16  # Pages with less cleaned text than this are sent to OCR
+
+# Importing this module must stay well under this budget (see test_extract_import_budget.py)
+IMPORT_BUDGET_MS = 100
+
+# Header/footer and watermark patterns, applied page by page
+NOISE_PATTERNS = [
+    re.compile(r'Page \d+ of \d+', re.IGNORECASE),
+    re.compile(r'\d+\s*\|\s*Page', re.IGNORECASE),
+    re.compile(r'Page\s+\d+', re.IGNORECASE),
+    re.compile(r'CONFIDENTIAL|DRAFT|INTERNAL USE ONLY', re.IGNORECASE),
+]
+WHITESPACE = re.compile(r'[ \t]+')
+
+Page = namedtuple('Page', ['number', 'lines', 'raw_chars', 'ocr', 'fonts'], defaults=(False, None))
+PAGE_RANGE = re.compile(r'^\s*(\d+)\s*(?:(-)\s*(\d*)\s*)?$')
+
+
+def parse_page_ranges(spec):
+    """Parse '1-20,45,300-' into 1-based inclusive (start, end) pairs; end None = to the last page"""
+    ranges = []
+    for part in spec.split(','):
+        match = PAGE_RANGE.match(part)
+        if not match or int(match.group(1)) < 1:
+            raise ValueError(f"Invalid page range {part.strip()!r} in {spec!r}")
+        start = int(match.group(1))
+        end = (int(match.group(3)) if match.group(3) else None) if match.group(2) else start
+        if end is not None and end < start:
+            raise ValueError(f"Invalid page range {part.strip()!r} in {spec!r}")
+        ranges.append((start, end))
+    return ranges
+
+
+def select_pages(page_count, pages=None, every=None):
+    """Return the sorted 0-based page indices for a page spec and/or every-Nth sampling"""
+    if pages:
+        chosen = set()
+        for start, end in parse_page_ranges(pages):
+            chosen.update(range(start - 1, min(end or page_count, page_count)))
+        indices = sorted(chosen)
+    else:
+        indices = list(range(page_count))
+    if every:
+        if every < 1:
+            raise ValueError(f"Sampling interval must be >= 1, got {every}")
+        indices = indices[::every]
+    return indices
+
+
+def selection_hint(pages=None, every=None):
+    """0-based indices known before the PDF is opened
+
+    None means the whole document; [] means a partial selection whose pages
+    depend on the page count (open-ended range or sampling only).
+    """
+    if not pages:
+        return [] if every else None
+    ranges = parse_page_ranges(pages)
+    if any(end is None for _, end in ranges):
+        return []
+    return select_pages(max(end for _, end in ranges), pages, every)
+
+
+def clean_page(text):
+    """Strip running headers/footers and watermarks; return the page's lines"""
+    for pattern in NOISE_PATTERNS:
+        text = pattern.sub('', text)
+    return WHITESPACE.sub(' ', text).split('\n')
+
+
+def new_deduper(pages=None):
+    """A LineDeduper sized for `pages` pages (a small, growable table when unknown)"""
+    expected_lines = pages * LINES_PER_PAGE if pages else 4096
+    return LineDeduper(mode=DEDUPE_MODE, expected_lines=expected_lines)
+
+
+def new_ocr(mode=None, workers=None):
+    """An ocr_fallback.OcrFallback for mode 'auto'/'on', or None when OCR is off or unavailable"""
+    mode = mode or OCR_MODE
+    if mode not in ('auto', 'on', 'off'):
+        raise ValueError(f"Unknown OCR mode: {mode!r} (expected 'auto', 'on' or 'off')")
+    if mode == 'off':
+        return None
+    from ocr_fallback import OcrFallback, ocr_available
+    if not ocr_available():
+        if mode == 'on':
+            raise RuntimeError("OCR requested but tesseract, pypdfium2 or Pillow is not installed")
+        return None
+    return OcrFallback(workers)
+
+
+def open_pdf(pdf_path, backend=None, pages=None, every=None):
+    """Open a memory-mapped PDF with the configured text backend (see pdf_backends.py)"""
+    return open_document(pdf_path, backend or PDF_BACKEND, selection_hint(pages, every))
+
+
+def iter_pages(document, deduper, indices=None, ocr=None, fonts=False):
+    """Yield a Page per selected page with cleaned lines not seen earlier by deduper
+
+    With an OcrFallback, text-less pages are OCR'd in its pool while later
+    pages are read; pages are still yielded (and deduped) in page order.
+    fonts=True fills Page.fonts with a (size, bold) per line when the backend
+    reads glyph metadata (pdf_backends page_text_fonts); it stays None otherwise.
+    """
+    for number, text, line_fonts, ocred in _page_texts(document, indices, ocr, fonts):
+        if not text.strip():
+            yield Page(number, [], 0)
+            continue
+        if line_fonts is None:
+            cleaned = ((line, None) for line in clean_page(text))
+        else:  # Clean line by line so each line keeps its font
+            cleaned = ((line, font) for raw, font in zip(text.split('\n'), line_fonts) for line in clean_page(raw))
+        lines, kept_fonts = [], []
+        for line, font in cleaned:
+            trimmed = line.strip()
+            if trimmed and deduper.add(trimmed):
+                lines.append(trimmed)
+                kept_fonts.append(font)
+        yield Page(number, lines, len(text), ocred, kept_fonts if line_fonts is not None else None)
+
+
+def _page_texts(document, indices, ocr, fonts=False):
+    indices = range(document.page_count) if indices is None else indices
+
+    def read(index):
+        return document.page_text(index), None
+
+    if fonts and hasattr(document, 'page_text_fonts'):
+        read = document.page_text_fonts
+    if ocr is None:
+        for index in indices:
+            yield (index + 1, *read(index), False)
+        return
+    pending = deque()
+    for index in indices:
+        text, line_fonts = read(index)
+        textless = len(''.join(clean_page(text)).strip()) < OCR_MIN_CHARS
+        pending.append((index + 1, text, line_fonts, ocr.submit(document.path, index) if textless else None))
+        # Release pages in order: the head once its OCR is done, or when the lookahead window is full
+        while pending and (pending[0][3] is None or pending[0][3].done() or len(pending) > ocr.window):
+            yield _resolve_ocr(*pending.popleft())
+    while pending:
+        yield _resolve_ocr(*pending.popleft())
+
+
+def _resolve_ocr(number, text, line_fonts, future):
+    if future is None:
+        return number, text, line_fonts, False
+    try:
+        recognised = future.result()
+    except Exception as e:
+        print(f"⚠️  OCR failed on page {number}: {e}", file=sys.stderr)
+        return number, text, line_fonts, False
+    return (number, recognised, None, True) if recognised.strip() else (number, text, line_fonts, False)
+
+
+def extract(pdf_path, unit='pages', deduper=None, max_tokens=MAX_TOKENS_PER_SEGMENT, backend=None,
+            pages=None, every=None, ocr=None):
+    """Stream a PDF as Page records (unit='pages') or segment dicts (unit='segments')
+
+    pages ('1-20,45') and every (keep every Nth selected page) restrict which
+    pages are read. Pass a shared deduper to drop lines already seen in
+    earlier reports. ocr is an OCR mode ('auto', 'on', 'off'; default
+    ERIC_OCR) or a shared OcrFallback.
+    """
+    if unit not in ('pages', 'segments'):
+        raise ValueError(f"Unknown unit: {unit!r} (expected 'pages' or 'segments')")
+    owned_ocr = ocr is None or isinstance(ocr, str)
+    ocr = new_ocr(ocr) if owned_ocr else ocr
+    document = open_pdf(pdf_path, backend, pages, every)
+    try:
+        indices = select_pages(document.page_count, pages, every)
+        deduper = deduper if deduper is not None else new_deduper(len(indices))
+        page_stream = iter_pages(document, deduper, indices, ocr)
+        if unit == 'pages':
+            yield from page_stream
+            return
+        segmenter = Segmenter(max_tokens)
+        for page in page_stream:
+            for line in page.lines:
+                yield from segmenter.feed(line)
+        yield from segmenter.finish()
+    finally:
+        document.close()
+        if owned_ocr and ocr:
+            ocr.close()
+
+
+def extract_report(pdf_path, output_file, segments_dir, title=None, progress=None, backend=None,
+                   pages=None, every=None, index=None, telemetry=DISABLED, ocr=None, sections=True):
+    """Extract one PDF in a single streaming pass: extract (+ OCR) → clean → dedupe → markdown + segments
+
+    Returns a stats dict (pages, pages_extracted, ocr_pages, words, bytes,
+    raw_chars, unique_lines, segments, tokens, tokenizer, dedupe_bytes,
+    backend, sections). ocr is as for extract(). sections=False skips the
+    <output>.sections.json heading index (see sections.py).
+    segments_dir=None skips segment output. Pass a search_index.SearchIndex as
+    index to upsert the report's segments into the full-text index.
+    Pass progress=print for console updates and a telemetry.Telemetry to
+    emit open/extract/index stage events.
+    """
+    pdf_path = Path(pdf_path)
+    with telemetry.stage('open', source=pdf_path.name) as stage:
+        stage.add_input(pdf_path)
+        document = open_pdf(pdf_path, backend, pages, every)
+        stage.update(backend=document.backend, page_count=document.page_count)
+    owned_ocr = ocr is None or isinstance(ocr, str)
+    try:
+        ocr = new_ocr(ocr) if owned_ocr else ocr
+        indices = select_pages(document.page_count, pages, every)
+        return _extract_document(document, indices, pdf_path, Path(output_file), segments_dir,
+                                 title or pdf_path.stem, progress, index, telemetry, ocr,
+                                 SectionIndexBuilder() if sections else None)
+    finally:
+        document.close()
+        if owned_ocr and ocr:
+            ocr.close()
+
+
+def _extract_document(document, indices, pdf_path, output_file, segments_dir, title, progress, index, telemetry,
+                      ocr, outline):
+    total_pages = document.page_count
+    partial = len(indices) != total_pages
+    if progress:
+        progress(f"✅ PDF Loaded Successfully ({document.backend} backend)")
+        progress(f"📊 Total Pages: {total_pages}" + (f" ({len(indices)} selected)" if partial else "") + "\n")
+        progress("🧹 Extracting, cleaning and segmenting page by page...")
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    seen = new_deduper(len(indices))
+    stager = None
+    if index:
+        from search_index import PassageStager
+        stager = PassageStager(own_segmenter=segments_dir is None)
+
+    segments = None
+    if segments_dir is not None:
+        segments = SegmentWriter(segments_dir, source=f"ERIC PDF Extraction: {pdf_path.name}",
+                                 source_label=f"{title} Research Document",
+                                 on_segment=stager.on_segment if stager else None)
+    raw_chars = 0
+    unique_count = 0
+    word_count = 0
+    ocr_pages = 0
+    section_list = []
+
+    # newline='\n': the section index stores byte offsets, so no platform newline translation
+    with telemetry.stage('extract', source=pdf_path.name, backend=document.backend) as stage, \
+            open(output_file, 'w', encoding='utf-8', newline='\n') as out:
+        stage.add_input(pdf_path)
+        header = f"""# {title} - Extracted Text
 **Extracted Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-**Source:** MENA Horizon 2030.pdf
+**Source:** {pdf_path.name}
 **Processing:** ERIC - Emma KnowledgeBase Processor
 **Total Pages:** {total_pages}
-
+""" + (f"**Pages Extracted:** {len(indices)}\n" if partial else "") + """
 ---
 
-{final_text}
+"""
+        out.write(header)
+        offset = len(header.encode('utf-8'))
+        for page in iter_pages(document, seen, indices, ocr, fonts=outline is not None):
+            raw_chars += page.raw_chars
+            ocr_pages += page.ocr
+            for position, line in enumerate(page.lines):
+                if unique_count:
+                    out.write("\n\n")
+                    offset += 2
+                out.write(line)
+                if outline:
+                    outline.observe(line, offset, page.number, page.fonts[position] if page.fonts else None)
+                    offset += len(line.encode('utf-8'))
+                if stager:
+                    stager.feed(line, page.number)
+                if segments:
+                    segments.feed(line)
+                unique_count += 1
+                word_count += len(line.split())
+            if progress and page.number % 10 == 0:
+                progress(f"📖 Processing... {page.number}/{total_pages} pages")
+        out.write("""
 
 ---
 
 **End of Document**
-"""
-    
-    # Save to file
-    OUTPUT_DIR.mkdir(exist_ok=True)
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        f.write(markdown_content)
-    
-    # Calculate statistics
-    word_count = len(final_text.split())
-    file_size = OUTPUT_FILE.stat().st_size
-    file_size_kb = file_size / 1024
-    
+""")
+        out.flush()
+        if outline:
+            section_list = outline.write(output_file, offset, source=pdf_path.name, backend=document.backend)
+        manifest = segments.close() if segments else {'total_segments': 0, 'total_tokens': 0, 'tokenizer': None}
+        stage.update(pages=len(indices), ocr_pages=ocr_pages, words=word_count, segments=manifest['total_segments'],
+                     tokens=manifest['total_tokens'], sections=len(section_list))
+        stage.add_output(output_file)
+        if outline:
+            stage.add_output(index_path(output_file))
+        if segments:
+            stage.add_output(*Path(segments_dir).glob('segment_*.md'))
+
+    if stager:
+        with telemetry.stage('index', source=pdf_path.name) as stage:
+            stager.write(index, output_file)
+            stage.update(passages=len(stager.rows))
+    return {
+        'pages': total_pages,
+        'pages_extracted': len(indices),
+        'ocr_pages': ocr_pages,
+        'words': word_count,
+        'bytes': output_file.stat().st_size,
+        'raw_chars': raw_chars,
+        'unique_lines': unique_count,
+        'segments': manifest['total_segments'],
+        'tokens': manifest['total_tokens'],
+        'tokenizer': manifest['tokenizer'],
+        'dedupe_bytes': seen.nbytes,
+        'backend': document.backend,
+        'sections': len(section_list),
+    }
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ERIC PDF extraction")
+    parser.add_argument('pdf', nargs='?', default=PDF_PATH, type=Path, help="PDF to extract")
+    parser.add_argument('--output', type=Path, help="Markdown output file")
+    parser.add_argument('--segments', type=Path, help="Directory for segment_NN.md files")
+    parser.add_argument('--backend', choices=['auto', *BACKENDS], default=PDF_BACKEND,
+                        help="PDF text backend (default: auto-calibrate per document)")
+    parser.add_argument('--pages', help="Page selection, e.g. 1-20,45 or 100-")
+    parser.add_argument('--sample', type=int, metavar='N', help="Quick mode: keep every Nth selected page")
+    parser.add_argument('--index', action='store_true', help="Upsert the report's segments into the FTS5 search index")
+    parser.add_argument('--telemetry', nargs='?', const='1', metavar='PATH',
+                        help="Append JSONL stage events to PATH ('-' = stdout, default: Reports/pipeline_telemetry.jsonl)")
+    parser.add_argument('--quiet', action='store_true', help="Suppress the console banners")
+    parser.add_argument('--ocr', choices=['auto', 'on', 'off'], default=OCR_MODE,
+                        help="OCR text-less pages with tesseract (default: auto, when installed)")
+    args = parser.parse_args(argv)
+
+    telemetry = Telemetry.from_env('ERIC', args.telemetry, args.quiet)
+    with telemetry.console():
+        if (args.pages or args.sample) and not args.output:
+            return preview(args.pdf, args.backend, args.pages, args.sample, args.ocr)
+        return _run(args, telemetry)
+
+
+def _run(args, telemetry):
+    is_default = args.pdf == PDF_PATH
+    output_file = args.output or (OUTPUT_FILE if is_default else OUTPUT_DIR / f"{args.pdf.stem}_Extracted.md")
+    segments_dir = args.segments or (SEGMENTS_DIR if is_default else SOURCES_DIR / args.pdf.stem.lower().replace(' ', '_'))
+
+    print("🚀 ERIC PDF Extraction Protocol - INITIATED")
+    print(f"📄 Target: {args.pdf.name}\n")
+
+    if args.pages or args.sample:
+        segments_dir = args.segments  # Partial extractions never overwrite knowledge-base segments by default
+
+    index = None
+    if args.index:
+        from search_index import SearchIndex
+        index = SearchIndex()
+
+    try:
+        stats = extract_report(args.pdf, output_file, segments_dir, progress=print, backend=args.backend,
+                               pages=args.pages, every=args.sample, index=index, telemetry=telemetry, ocr=args.ocr)
+    except Exception as e:
+        print(f"❌ PDF Extraction Failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    finally:
+        if index:
+            index.close()
+
+    print(f"\n✅ Text Extraction Complete")
+    print(f"📝 Raw Text Length: {stats['raw_chars']:,} characters")
+    if stats['ocr_pages']:
+        print(f"🔍 OCR Fallback: {stats['ocr_pages']} text-less pages recovered")
+
     # Get first 10 lines preview
-    preview_lines = markdown_content.split('\n')[:10]
-    
+    with open(output_file, encoding='utf-8') as f:
+        preview_lines = [line.rstrip('\n') for _, line in zip(range(10), f)]
+
     print("\n" + "="*60)
     print("🎯 EXTRACTION COMPLETE!")
     print("="*60)
-    print(f"📝 Word Count: {word_count:,} words")
-    print(f"💾 File Size: {file_size_kb:.2f} KB")
-    print(f"📍 Saved to: {OUTPUT_FILE}")
+    print(f"📝 Word Count: {stats['words']:,} words")
+    print(f"💾 File Size: {stats['bytes'] / 1024:.2f} KB")
+    print(f"🧬 Dedupe: {DEDUPE_MODE} mode, {stats['unique_lines']:,} unique lines in {stats['dedupe_bytes'] / 1024:.1f} KB")
+    print(f"✂️  Segments: {stats['segments']} (~{stats['tokens']:,} tokens, {stats['tokenizer']})")
+    print(f"📍 Saved to: {output_file}")
+    if stats['sections']:
+        print(f"🗂️  Sections: {stats['sections']} headings indexed in {index_path(output_file).name}")
+    if segments_dir:
+        print(f"📍 Segments: {segments_dir}")
+    if index:
+        print(f"🗂️  Indexed into: {index.db_path}")
     print("\n📋 FIRST 10 LINES PREVIEW:")
     print("="*60)
     for idx, line in enumerate(preview_lines, 1):
         print(f"{idx}. {line}")
     print("="*60)
     print("\n✅ ERIC Protocol Complete - Knowledge Base Updated")
-    
-except Exception as e:
-    print(f"❌ PDF Extraction Failed: {e}")
-    import traceback
-    traceback.print_exc()
-    exit(1)
+    return 0
+
+
+def preview(pdf_path, backend, pages, every, ocr=None):
+    """Print the selected pages' text to stdout without writing any files"""
+    started = time.perf_counter()
+    try:
+        extracted = list(extract(pdf_path, backend=backend, pages=pages, every=every, ocr=ocr))
+    except Exception as e:
+        print(f"❌ PDF Preview Failed: {e}")
+        return 1
+    elapsed = time.perf_counter() - started
+    for page in extracted:
+        print(f"\n--- Page {page.number}{' (OCR)' if page.ocr else ''} ---")
+        print('\n'.join(page.lines))
+    print(f"\n⚡ Preview: {len(extracted)} pages in {elapsed * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Compact Line Dedupe for ERIC Extraction
+Stores fixed-width 64-bit line fingerprints instead of full line strings
+"""
+
+import math
+from array import array
+from hashlib import blake2b
+
+EMPTY = 0
+MAX_LOAD = 0.6
+
+
+def fingerprint(line):
+    """Return the 64-bit fingerprint of a line (never 0, which marks empty slots)"""
+    value = int.from_bytes(blake2b(line.encode('utf-8'), digest_size=8).digest(), 'little')
+    return value or 1
+
+
+class FingerprintSet:
+    """Open-addressing hash set of 64-bit fingerprints backed by array('Q')
+
+    Each slot costs 8 bytes, so at the maximum load factor a unique line costs
+    ~13-27 bytes instead of the ~100+ bytes of a str held in a set().
+    """
+
+    def __init__(self, capacity=1024):
+        size = 1 << max(4, math.ceil(math.log2(max(capacity, 1) / MAX_LOAD)))
+        self._slots = array('Q', bytes(8 * size))
+        self._mask = size - 1
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def _probe(self, fp):
+        """Return the slot index holding fp, or the empty slot where it belongs"""
+        slots, mask = self._slots, self._mask
+        i = fp & mask
+        while True:
+            current = slots[i]
+            if current == fp or current == EMPTY:
+                return i
+            i = (i + 1) & mask
+
+    def __contains__(self, fp):
+        return self._slots[self._probe(fp)] == fp
+
+    def add(self, fp):
+        """Insert fp; return True if it was not already present"""
+        i = self._probe(fp)
+        if self._slots[i] == fp:
+            return False
+        self._slots[i] = fp
+        self._count += 1
+        if self._count > MAX_LOAD * len(self._slots):
+            self._grow()
+        return True
+
+    def _grow(self):
+        old = self._slots
+        size = len(old) * 2
+        self._slots = array('Q', bytes(8 * size))
+        self._mask = size - 1
+        for fp in old:
+            if fp != EMPTY:
+                self._slots[self._probe(fp)] = fp
+
+    @property
+    def nbytes(self):
+        return self._slots.itemsize * len(self._slots)
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over 64-bit fingerprints (double hashing)"""
+
+    def __init__(self, expected_items=100_000, fp_rate=1e-4):
+        expected_items = max(expected_items, 1)
+        bits = math.ceil(-expected_items * math.log(fp_rate) / (math.log(2) ** 2))
+        self.capacity = expected_items
+        self._nbits = max(bits, 64)
+        self._k = max(1, round(self._nbits / expected_items * math.log(2)))
+        self._bits = bytearray((self._nbits + 7) // 8)
+
+    def _positions(self, fp):
+        h1 = fp & 0xFFFFFFFF
+        h2 = (fp >> 32) | 1
+        nbits = self._nbits
+        return [(h1 + i * h2) % nbits for i in range(self._k)]
+
+    def __contains__(self, fp):
+        bits = self._bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(fp))
+
+    def add(self, fp):
+        """Set the bits for fp; return True if at least one bit was newly set"""
+        bits = self._bits
+        added = False
+        for p in self._positions(fp):
+            mask = 1 << (p & 7)
+            if not bits[p >> 3] & mask:
+                bits[p >> 3] |= mask
+                added = True
+        return added
+
+    @property
+    def nbytes(self):
+        return len(self._bits)
+
+
+class ScalableBloomFilter:
+    """Bloom filter that adds a larger, tighter layer whenever the current one fills
+
+    Starts small, so short documents only pay for what they use, and keeps the
+    overall false-positive rate near fp_rate however many items arrive.
+    """
+
+    MIN_LAYER = 1024  # Smaller layers hash poorly and waste their fp budget
+
+    def __init__(self, expected_items=4096, fp_rate=1e-4):
+        self._fp_rate = fp_rate
+        self._layers = [BloomFilter(max(expected_items, self.MIN_LAYER), fp_rate / 2)]
+        self._count = 0
+
+    def __contains__(self, fp):
+        return any(fp in layer for layer in self._layers)
+
+    def add(self, fp):
+        """Set the bits for fp; return True if fp was not (probably) present"""
+        if any(fp in layer for layer in self._layers[:-1]):
+            return False
+        current = self._layers[-1]
+        if not current.add(fp):
+            return False
+        self._count += 1
+        if self._count > current.capacity:
+            self._layers.append(BloomFilter(current.capacity * 2, self._fp_rate / 2 ** (len(self._layers) + 1)))
+            self._count = 0
+        return True
+
+    @property
+    def nbytes(self):
+        return sum(layer.nbytes for layer in self._layers)
+
+
+class LineDeduper:
+    """Order-preserving line dedupe with an exact or probabilistic backing store
+
+    mode='exact'          fingerprints in a FingerprintSet (collisions ~n^2/2^65)
+    mode='probabilistic'  scalable bloom filter only: ~2 bytes per line, may
+                          drop a unique line with probability ~fp_rate
+
+    Both stores start at expected_lines and grow, so size it from the page
+    count rather than for the largest report.
+    """
+
+    MODES = ('exact', 'probabilistic')
+
+    def __init__(self, mode='exact', expected_lines=4096, fp_rate=1e-4):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown dedupe mode: {mode!r} (expected one of {self.MODES})")
+        self.mode = mode
+        self._store = FingerprintSet(expected_lines) if mode == 'exact' else ScalableBloomFilter(expected_lines, fp_rate)
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, line):
+        return fingerprint(line) in self._store
+
+    def add(self, line):
+        """Record line; return True if it has not been seen before"""
+        added = self._store.add(fingerprint(line))
+        self._count += added
+        return added
+
+    @property
+    def nbytes(self):
+        """Bytes held by the backing arrays"""
+        return self._store.nbytes
@@ -0,0 +1,166 @@
+"""
+Selective OCR Fallback for Image-Only PDF Pages
+ERIC - pages whose text layer is empty (scanned charts, annexes) are rasterised
+with pypdfium2 and read by a local tesseract in a process pool; results are
+cached by PDF content digest + page index (+ DPI and language), so each scanned
+page is OCR'd once and a cache hit costs neither a render nor a process hop
+
+Only text-less pages that miss the cache are rendered. Requires pypdfium2 + Pillow and a
+tesseract binary on PATH (or ERIC_TESSERACT); without them the extractor keeps
+its old behaviour and text-less pages stay empty.
+
+    with OcrFallback() as ocr:
+        future = ocr.submit("report.pdf", 41)   # 0-based page index
+        text = future.result()
+"""
+
+import hashlib
+import importlib.util
+import os
+import shutil
+import subprocess
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+OCR_CACHE_DIR = Path(os.environ.get("ERIC_OCR_CACHE", Path(__file__).parent / "Extracted_Text" / "ocr_cache"))
+OCR_DPI = 300
+OCR_LANG = os.environ.get("ERIC_OCR_LANG", "eng")
+OCR_TIMEOUT = 120        # Seconds per page before tesseract is abandoned
+
+
+def tesseract_path():
+    return os.environ.get("ERIC_TESSERACT") or shutil.which('tesseract')
+
+
+def ocr_available():
+    """True when a page can be rasterised and OCR'd on this machine (checked without importing)"""
+    return bool(tesseract_path() and importlib.util.find_spec('pypdfium2') and importlib.util.find_spec('PIL'))
+
+
+_open_document = None  # (path, PdfDocument): each worker keeps the report it is OCR'ing open
+
+
+def _document(pdf_path):
+    global _open_document
+    import pypdfium2
+
+    if _open_document is None or _open_document[0] != pdf_path:
+        close_document()
+        _open_document = (pdf_path, pypdfium2.PdfDocument(pdf_path))
+    return _open_document[1]
+
+
+def close_document():
+    """Close the PDF held open by render_page() in this process"""
+    global _open_document
+    if _open_document is not None:
+        _open_document[1].close()
+        _open_document = None
+
+
+def render_page(pdf_path, index, dpi=OCR_DPI):
+    """Rasterise one page to a greyscale PIL image (the document stays open for the next page)"""
+    page = _document(str(pdf_path))[index]
+    try:
+        return page.render(scale=dpi / 72, grayscale=True).to_pil()
+    finally:
+        page.close()
+
+
+def file_digest(path):
+    """Content digest of a PDF: copies and re-runs of the same file share cache entries"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def page_key(digest, index, dpi=OCR_DPI, lang=OCR_LANG):
+    """Cache key of one page of the PDF with content digest `digest`"""
+    return hashlib.blake2b(f"{digest}:{index}:{dpi}:{lang}".encode(), digest_size=20).hexdigest()
+
+
+def cache_path(key, cache_dir=OCR_CACHE_DIR):
+    return Path(cache_dir) / key[:2] / f"{key}.txt"
+
+
+def ocr_page(pdf_path, index, key, dpi=OCR_DPI, lang=OCR_LANG, cache_dir=OCR_CACHE_DIR):
+    """Worker entry point: render and OCR one page, storing the text under key; returns the text"""
+    from io import BytesIO
+
+    png = BytesIO()
+    render_page(pdf_path, index, dpi).save(png, format='PNG')
+    result = subprocess.run([tesseract_path(), 'stdin', 'stdout', '-l', lang, '--dpi', str(dpi)],
+                            input=png.getvalue(), capture_output=True, timeout=OCR_TIMEOUT)
+    if result.returncode != 0:
+        raise RuntimeError(f"tesseract failed on page {index + 1}: {result.stderr.decode(errors='replace').strip()}")
+    text = result.stdout.decode('utf-8', errors='replace').replace('\x0c', '')
+
+    cached = cache_path(key, cache_dir)
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    partial = cached.with_suffix(f".{os.getpid()}.tmp")
+    partial.write_text(text, encoding='utf-8')
+    os.replace(partial, cached)  # Atomic: concurrent workers never read half an entry
+    return text
+
+
+class OcrFallback:
+    """Runs ocr_page() for text-less pages, in a process pool started on first use
+
+    workers=0 OCRs inline in the calling process (used by batch_extract.py,
+    whose report workers are already one process per CPU).
+    """
+
+    def __init__(self, workers=None, dpi=OCR_DPI, lang=OCR_LANG, cache_dir=OCR_CACHE_DIR):
+        self.workers = workers if workers is not None else max(1, (os.cpu_count() or 2) - 1)
+        self.dpi = dpi
+        self.lang = lang
+        self.cache_dir = cache_dir
+        self.window = max(4, self.workers * 4)  # Pages buffered ahead while OCR is in flight
+        self.pages = 0
+        self.cache_hits = 0
+        self._digests = {}
+        self._pool = None
+
+    def submit(self, pdf_path, index):
+        """Future for the text of page `index`; a cached page resolves immediately"""
+        self.pages += 1
+        pdf_path = str(pdf_path)
+        if pdf_path not in self._digests:
+            self._digests[pdf_path] = file_digest(pdf_path)
+        key = page_key(self._digests[pdf_path], index, self.dpi, self.lang)
+        cached = cache_path(key, self.cache_dir)
+        if cached.exists():
+            self.cache_hits += 1
+            return _resolved(cached.read_text, encoding='utf-8')
+        args = (pdf_path, index, key, self.dpi, self.lang, self.cache_dir)
+        if self.workers == 0:
+            return _resolved(ocr_page, *args)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool.submit(ocr_page, *args)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        if self.workers == 0:
+            close_document()
+        self._digests.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _resolved(fn, *args, **kwargs):
+    """A Future already holding fn's result (or exception)"""
+    future = Future()
+    try:
+        future.set_result(fn(*args, **kwargs))
+    except Exception as e:
+        future.set_exception(e)
+    return future
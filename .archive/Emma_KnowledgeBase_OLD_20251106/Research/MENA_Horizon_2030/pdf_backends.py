@@ -0,0 +1,331 @@
+"""
+Pluggable PDF Text Backends for ERIC Extraction
+PyPDF2 / pypdf / pdfminer.six / pypdfium2 behind one page-text contract,
+with per-document auto-selection by measured throughput
+
+Contract: open(source) takes a read-only buffer (open_document memory-maps
+the PDF) and returns a document with .page_count, .page_text(index) (0-based,
+'\\n' line endings, '' for text-less pages) and .close(); open_with() adds
+.backend and .path. Backends that can read glyph metadata also offer
+.page_text_fonts(index) -> (text, [(font size, bold) or None per line]), used
+to detect headings. Pages are resolved lazily, so a preview only faults in
+the bytes of the pages it reads.
+Each backend imports its library only when a document is opened.
+"""
+
+import importlib
+import importlib.util
+import mmap
+import re
+import time
+
+BACKEND_ORDER = ('pypdfium2', 'pypdf', 'pdfminer', 'pypdf2')
+CALIBRATION_PAGES = 5
+MIN_CHAR_RATIO = 0.85   # Must recover this share of the best backend's characters
+MAX_GARBAGE_RATIO = 0.02
+BOLD_WEIGHT = 600
+BOLD_NAME = re.compile(r'bold|black|heavy|semibold|demi', re.IGNORECASE)
+LINE = re.compile(r'[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+$')
+
+
+def normalize(text):
+    """Unify line endings and drop form feeds so every backend returns the same shape"""
+    return (text or '').replace('\r\n', '\n').replace('\r', '\n').replace('\x0c', '')
+
+
+class _Document:
+    """Shared close(): release the backend, then the mapped source behind it"""
+
+    backend = None
+    _source = ()
+
+    def close(self):
+        self._close()
+        for handle in self._source:
+            handle.close()
+        self._source = ()
+
+    def _close(self):
+        pass
+
+
+class PyPDF2Backend:
+    name = 'pypdf2'
+    module = 'PyPDF2'
+
+    def open(self, source):
+        from PyPDF2 import PdfReader
+        return _ReaderDocument(PdfReader(source))
+
+
+class PypdfBackend:
+    name = 'pypdf'
+    module = 'pypdf'
+
+    def open(self, source):
+        from pypdf import PdfReader
+        return _ReaderDocument(PdfReader(source))
+
+
+class _ReaderDocument(_Document):
+    """PyPDF2 and pypdf share the PdfReader API; page content is parsed on access"""
+
+    def __init__(self, reader):
+        self._reader = reader
+        self.page_count = len(reader.pages)
+
+    def page_text(self, index):
+        return normalize(self._reader.pages[index].extract_text())
+
+    def _close(self):
+        self._reader = None
+
+
+class PdfminerBackend:
+    name = 'pdfminer'
+    module = 'pdfminer'
+
+    def open(self, source):
+        return _PdfminerDocument(source)
+
+
+class _PdfminerDocument(_Document):
+    def __init__(self, source):
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfinterp import PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+        from pdfminer.pdfparser import PDFParser
+        from pdfminer.pdftypes import resolve1
+
+        document = PDFDocument(PDFParser(source))
+        self._page_iter = PDFPage.create_pages(document)
+        self._pages = []
+        self._resources = PDFResourceManager(caching=True)
+        self._laparams = LAParams()
+        self.page_count = resolve1(resolve1(document.catalog['Pages'])['Count'])
+
+    def _page(self, index):
+        """Walk the page tree only as far as the requested page"""
+        while len(self._pages) <= index:
+            self._pages.append(next(self._page_iter))
+        return self._pages[index]
+
+    def page_text(self, index):
+        from io import StringIO
+        from pdfminer.converter import TextConverter
+        from pdfminer.pdfinterp import PDFPageInterpreter
+
+        buffer = StringIO()
+        device = TextConverter(self._resources, buffer, laparams=self._laparams)
+        PDFPageInterpreter(self._resources, device).process_page(self._page(index))
+        device.close()
+        return normalize(buffer.getvalue())
+
+    def _close(self):
+        self._pages = []
+        self._page_iter = None
+
+
+class PdfiumBackend:
+    name = 'pypdfium2'
+    module = 'pypdfium2'
+
+    def open(self, source):
+        return _PdfiumDocument(source)
+
+
+class _MappedStream:
+    """readinto() view over an mmap; pdfium pulls blocks through it on demand"""
+
+    def __init__(self, mapping):
+        self._mapping = mapping
+        self._view = memoryview(mapping)
+
+    def readinto(self, buffer):
+        position = self._mapping.tell()
+        count = min(len(buffer), len(self._view) - position)
+        buffer[:count] = self._view[position:position + count]
+        self._mapping.seek(position + count)
+        return count
+
+    def read(self, size=-1):
+        return self._mapping.read(size)
+
+    def seek(self, offset, whence=0):
+        self._mapping.seek(offset, whence)
+        return self._mapping.tell()
+
+    def tell(self):
+        return self._mapping.tell()
+
+    def release(self):
+        self._view.release()
+
+
+class _PdfiumDocument(_Document):
+    def __init__(self, source):
+        import pypdfium2
+        self._stream = _MappedStream(source)
+        try:
+            self._pdf = pypdfium2.PdfDocument(self._stream)  # Stream input: pdfium reads on demand
+        except Exception:
+            self._stream.release()  # An exported view would make closing the mmap fail and mask this error
+            raise
+        self.page_count = len(self._pdf)
+
+    def page_text(self, index):
+        page = self._pdf[index]
+        textpage = page.get_textpage()
+        try:
+            return normalize(textpage.get_text_range())
+        finally:
+            textpage.close()
+            page.close()
+
+    def page_text_fonts(self, index):
+        """page_text() plus the font size and weight of each line's first glyph"""
+        import ctypes
+        import pypdfium2.raw as pdfium_c
+
+        page = self._pdf[index]
+        textpage = page.get_textpage()
+        try:
+            raw = textpage.get_text_range()
+            name = ctypes.create_string_buffer(128)
+            flags = ctypes.c_int()
+            fonts = []
+            for line in LINE.finditer(raw):
+                text = line.group()
+                if not text.strip():
+                    fonts.append(None)
+                    continue
+                glyph = line.start() + len(text) - len(text.lstrip())
+                size = pdfium_c.FPDFText_GetFontSize(textpage.raw, glyph)
+                weight = pdfium_c.FPDFText_GetFontWeight(textpage.raw, glyph)
+                pdfium_c.FPDFText_GetFontInfo(textpage.raw, glyph, name, len(name), ctypes.byref(flags))
+                fonts.append((round(size, 1), weight >= BOLD_WEIGHT
+                              or bool(BOLD_NAME.search(name.value.decode('latin-1')))))
+            return normalize(raw), fonts
+        finally:
+            textpage.close()
+            page.close()
+
+    def _close(self):
+        self._pdf.close()
+        self._stream.release()
+
+
+BACKENDS = {cls.name: cls for cls in (PdfiumBackend, PypdfBackend, PdfminerBackend, PyPDF2Backend)}
+
+
+def available_backends():
+    """Names of installed backends, checked without importing them"""
+    return [name for name in BACKEND_ORDER if importlib.util.find_spec(BACKENDS[name].module)]
+
+
+def map_file(path):
+    """Memory-map path read-only; returns (file, mapping)"""
+    handle = open(path, 'rb')
+    try:
+        return handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except Exception:
+        handle.close()
+        raise
+
+
+def open_with(name, path):
+    """Open a memory-mapped PDF with one named backend"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown PDF backend: {name!r} (expected 'auto' or one of {sorted(BACKENDS)})")
+    handle, mapping = map_file(path)
+    try:
+        document = BACKENDS[name]().open(mapping)
+    except Exception:
+        mapping.close()
+        handle.close()
+        raise
+    document.backend = name
+    document.path = path
+    document._source = (mapping, handle)
+    return document
+
+
+def sample_indices(indices, count=CALIBRATION_PAGES):
+    """Evenly spread picks from indices so calibration sees cover, body and annex pages"""
+    if len(indices) <= count:
+        return list(indices)
+    step = len(indices) / count
+    return [indices[int(i * step)] for i in range(count)]
+
+
+def garbage_ratio(text):
+    """Share of replacement/control characters, a sign of a broken text layer decode"""
+    if not text:
+        return 0.0
+    bad = sum(1 for c in text if c == '\ufffd' or (ord(c) < 32 and c not in '\n\t'))
+    return bad / len(text)
+
+
+def calibrate(path, candidates=None, sample_pages=CALIBRATION_PAGES, pages=None):
+    """Time each backend over the same sample pages and score its output
+
+    pages restricts the sample to the 0-based indices that will be extracted.
+
+    Returns a list of dicts (name, pages_per_sec, chars, garbage, ok, error)
+    sorted fastest first.
+    """
+    results = []
+    for name in candidates or available_backends():
+        result = {'name': name, 'pages_per_sec': 0.0, 'chars': 0, 'garbage': 0.0, 'ok': False}
+        try:
+            importlib.import_module(BACKENDS[name].module)  # Keep one-off import cost out of the timing
+            started = time.perf_counter()
+            document = open_with(name, path)
+            try:
+                in_range = [i for i in pages if i < document.page_count] if pages else range(document.page_count)
+                indices = sample_indices(in_range, sample_pages)
+                texts = [document.page_text(i) for i in indices]
+            finally:
+                document.close()
+            elapsed = max(time.perf_counter() - started, 1e-6)
+            joined = ''.join(texts)
+            result.update(pages_per_sec=len(indices) / elapsed, chars=len(joined),
+                          garbage=garbage_ratio(joined))
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+        results.append(result)
+
+    best_chars = max((r['chars'] for r in results if 'error' not in r), default=0)
+    for r in results:
+        r['ok'] = ('error' not in r and r['garbage'] <= MAX_GARBAGE_RATIO
+                   and r['chars'] >= best_chars * MIN_CHAR_RATIO)
+    return sorted(results, key=lambda r: r['pages_per_sec'], reverse=True)
+
+
+def select_backend(path, candidates=None, pages=None):
+    """Pick the fastest backend that passes the text-quality check for this document"""
+    results = calibrate(path, candidates, pages=pages)
+    for r in results:
+        if r['ok']:
+            return r['name'], results
+    raise RuntimeError(f"No PDF backend could extract {path}: {results}")
+
+
+def open_document(path, backend='auto', pages=None):
+    """Open path memory-mapped with a named backend, or calibrate and choose one ('auto')
+
+    pages (0-based indices) limits calibration to the pages that will be read.
+    Selections no larger than the calibration sample, or not known before
+    opening (pages=[]), skip calibration and use the preferred installed
+    backend. The document carries its name in .backend.
+    """
+    if backend == 'auto':
+        installed = available_backends()
+        if not installed:
+            raise RuntimeError(f"No PDF backend installed (tried {', '.join(BACKEND_ORDER)})")
+        if len(installed) == 1 or (pages is not None and len(pages) <= CALIBRATION_PAGES):
+            backend = installed[0]
+        else:
+            backend = select_backend(path, installed, pages)[0]
+    return open_with(backend, path)
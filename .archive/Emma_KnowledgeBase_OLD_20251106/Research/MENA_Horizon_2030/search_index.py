@@ -0,0 +1,352 @@
+"""
+Full-Text Search Index for the Emma KnowledgeBase
+ERIC - loads extracted pages and segments into SQLite FTS5 so lookups are an
+index query (BM25-ranked, with snippets) instead of a scan of markdown files
+
+Every report is one source, extracted/<markdown stem>, indexed once at
+segment granularity (segments keep the page they start on), whether it was
+indexed during extraction (--index) or by `build` afterwards.
+
+Usage:
+    python search_index.py build [--db PATH]          # index Extracted_Text + other sources segments
+    python search_index.py query "oil price shock" [--limit 10] [--source NAME]
+"""
+
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from chunking import Segmenter, is_heading
+
+REPO_ROOT = Path(__file__).resolve().parents[4]
+SOURCES_DIR = REPO_ROOT / "server" / "Emma_KnowledgeBase" / "sources"
+EXTRACTED_DIR = Path(__file__).parent / "Extracted_Text"
+# Kept next to emma_memory.db but in its own file so bulk indexing never blocks the chat server
+INDEX_DB = Path(os.environ.get("ERIC_INDEX_DB", REPO_ROOT / "server" / "emma" / "knowledge_index.db"))
+
+FRONTMATTER = re.compile(r'^---\n.*?\n---\n', re.DOTALL)
+REPORT_SOURCE = re.compile(r'^\*\*Source:\*\* (.+)$', re.MULTILINE)
+HEADER_FIELD = re.compile(r'^\*\*(Extracted Date|Source|Processing|Total Pages|Pages Extracted):\*\*')
+EXTRACTION_SOURCE = re.compile(r'^ERIC \w+ Extraction: (.+)$')
+QUERY_TERM = re.compile(r'\w+', re.UNICODE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+  source TEXT PRIMARY KEY,
+  signature TEXT NOT NULL,
+  passages INTEGER NOT NULL,
+  indexed_at INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS passages (
+  id INTEGER PRIMARY KEY,
+  source TEXT NOT NULL,
+  page INTEGER,
+  section TEXT,
+  kind TEXT NOT NULL CHECK(kind IN ('page', 'segment')),
+  text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_passages_source ON passages(source);
+
+-- External-content FTS table: text lives once, in passages
+CREATE VIRTUAL TABLE IF NOT EXISTS passages_fts USING fts5(
+  text, section, content='passages', content_rowid='id', tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS passages_ai AFTER INSERT ON passages BEGIN
+  INSERT INTO passages_fts(rowid, text, section) VALUES (new.id, new.text, new.section);
+END;
+CREATE TRIGGER IF NOT EXISTS passages_ad AFTER DELETE ON passages BEGIN
+  INSERT INTO passages_fts(passages_fts, rowid, text, section) VALUES ('delete', old.id, old.text, old.section);
+END;
+"""
+
+
+def file_signature(path):
+    stat = Path(path).stat()
+    return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def match_query(text):
+    """Quote each word so user input can never be parsed as FTS5 operators"""
+    return ' '.join(f'"{term}"' for term in QUERY_TERM.findall(text))
+
+
+class SearchIndex:
+    """SQLite FTS5 index of extracted passages, one row per page or segment"""
+
+    def __init__(self, db_path=INDEX_DB):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def is_current(self, source, signature):
+        row = self.conn.execute('SELECT signature FROM documents WHERE source = ?', (source,)).fetchone()
+        return row is not None and row['signature'] == signature
+
+    @contextmanager
+    def document(self, source, signature):
+        """Replace every passage of source in one transaction (incremental upsert)
+
+        Yields an add(text, page=None, section=None, kind='page') callable.
+        """
+        count = 0
+
+        def add(text, page=None, section=None, kind='page'):
+            nonlocal count
+            self.conn.execute('INSERT INTO passages (source, page, section, kind, text) VALUES (?, ?, ?, ?, ?)',
+                              (source, page, section, kind, text))
+            count += 1
+
+        with self.conn:
+            self.conn.execute('DELETE FROM passages WHERE source = ?', (source,))
+            yield add
+            self.conn.execute(
+                'INSERT INTO documents (source, signature, passages, indexed_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(source) DO UPDATE SET signature = excluded.signature, '
+                'passages = excluded.passages, indexed_at = excluded.indexed_at',
+                (source, signature, count, int(time.time() * 1000)))
+
+    def remove(self, source):
+        with self.conn:
+            self.conn.execute('DELETE FROM passages WHERE source = ?', (source,))
+            self.conn.execute('DELETE FROM documents WHERE source = ?', (source,))
+
+    def search(self, query, limit=10, source=None, kind=None, raw=False):
+        """BM25-ranked passages matching query (section matches weigh double)
+
+        Returns dicts with source, page, section, kind, score (lower is better)
+        and a snippet with matches wrapped in [ ]. raw=True passes query
+        through as FTS5 syntax.
+        """
+        match = query if raw else match_query(query)
+        if not match:
+            return []
+        sql = ("SELECT p.source, p.page, p.section, p.kind, "
+               "bm25(passages_fts, 1.0, 2.0) AS score, "
+               "snippet(passages_fts, 0, '[', ']', '…', 16) AS snippet "
+               "FROM passages_fts JOIN passages p ON p.id = passages_fts.rowid "
+               "WHERE passages_fts MATCH ?")
+        params = [match]
+        if source:
+            sql += " AND p.source = ?"
+            params.append(source)
+        if kind:
+            sql += " AND p.kind = ?"
+            params.append(kind)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def stats(self):
+        row = self.conn.execute('SELECT COUNT(*) AS documents, COALESCE(SUM(passages), 0) AS passages '
+                                'FROM documents').fetchone()
+        return dict(row)
+
+
+def report_source(md_path):
+    """Index source name of an extracted report (shared by extraction and build)"""
+    return f"extracted/{Path(md_path).stem}"
+
+
+class PassageStager:
+    """Stages a report's segments while it is extracted, for one short write at the end
+
+    Staging means parallel batch workers never hold the index write lock for
+    a whole report. Call feed() for every line before handing it to a
+    SegmentWriter whose on_segment is this stager's on_segment, or pass
+    own_segmenter=True when the report is not being written to segments.
+    """
+
+    def __init__(self, own_segmenter=False):
+        self.rows = []
+        self._segmenter = Segmenter() if own_segmenter else None
+        self._section = None
+        self._page = None
+        self._start_page = None
+
+    def feed(self, line, page=None):
+        self._page = page
+        if self._start_page is None:
+            self._start_page = page
+        if self._segmenter:
+            for segment in self._segmenter.feed(line):
+                self.on_segment(segment)
+
+    def on_segment(self, segment):
+        # A segment completes just before the line that starts the next one is added
+        self._section = _first_heading(segment['content']) or self._section
+        self.rows.append((segment['content'], self._start_page, self._section))
+        self._start_page = self._page
+
+    def write(self, index, md_path):
+        """Replace the report's passages; the markdown's signature lets build() skip it"""
+        if self._segmenter:
+            for segment in self._segmenter.finish():
+                self.on_segment(segment)
+        with index.document(report_source(md_path), file_signature(md_path)) as add:
+            for text, page, section in self.rows:
+                add(text, page=page, section=section, kind='segment')
+
+
+def index_segment_dir(index, segment_dir, force=False):
+    """Index a sources/<name>/segment_NN.md directory as one source; returns True if (re)indexed"""
+    segment_dir = Path(segment_dir)
+    files = sorted(segment_dir.glob('segment_*.md'))
+    source = f"sources/{segment_dir.name}"
+    signature = ';'.join(f"{f.name}={file_signature(f)}" for f in files)
+    if not force and index.is_current(source, signature):
+        return False
+    section = None
+    with index.document(source, signature) as add:
+        for f in files:
+            content = FRONTMATTER.sub('', f.read_text(encoding='utf-8'), count=1).strip()
+            headings = [line for line in content.split('\n') if line.strip() and is_heading(line.strip())]
+            section = headings[0].lstrip('# ').strip() if headings else section
+            add(content, section=section, kind='segment')
+    return True
+
+
+def index_markdown(index, md_path, force=False):
+    """Index a flat extracted markdown file as heading-aware segments; returns True if (re)indexed"""
+    md_path = Path(md_path)
+    source = report_source(md_path)
+    signature = file_signature(md_path)
+    if not force and index.is_current(source, signature):
+        return False
+    segmenter = Segmenter()
+    section = None
+    with index.document(source, signature) as add:
+        with open(md_path, encoding='utf-8') as f:
+            for paragraph in _report_paragraphs(f):
+                for segment in segmenter.feed(paragraph):
+                    section = _first_heading(segment['content']) or section
+                    add(segment['content'], section=section, kind='segment')
+            for segment in segmenter.finish():
+                section = _first_heading(segment['content']) or section
+                add(segment['content'], section=section, kind='segment')
+    return True
+
+
+def _report_paragraphs(lines):
+    """Non-empty lines of an extracted report, minus the extraction header fields and rules
+
+    Only the **Extracted Date/Source/Processing:** block above the first '---'
+    is dropped; bold lead-ins in the body ('**Key finding:** ...') are text.
+    """
+    in_header = True
+    for line in lines:
+        paragraph = line.strip()
+        if not paragraph:
+            continue
+        if paragraph == '---':
+            in_header = False
+            continue
+        if in_header and HEADER_FIELD.match(paragraph):
+            continue
+        yield paragraph
+
+
+def _first_heading(content):
+    for line in content.split('\n\n'):
+        if is_heading(line):
+            return line.lstrip('# ').strip()
+    return None
+
+
+def extracted_report_name(md_path):
+    """The original file name from an extracted markdown header ('**Source:** report.pdf')"""
+    with open(md_path, encoding='utf-8') as f:
+        match = REPORT_SOURCE.search(f.read(1024))
+    return match.group(1).strip() if match else None
+
+
+def segment_report_name(segment_dir):
+    """The report a segment directory was extracted from, per its manifest.json (None if not an extraction)"""
+    try:
+        with open(Path(segment_dir) / 'manifest.json', encoding='utf-8') as f:
+            match = EXTRACTION_SOURCE.match(json.load(f).get('source', ''))
+    except (OSError, ValueError):
+        return None
+    return match.group(1).strip() if match else None
+
+
+def build(index, force=False):
+    """Incrementally index every extracted markdown file and the remaining segment directories
+
+    A segment directory written by the extraction of a report that is already
+    indexed from Extracted_Text is the same text again, so it is skipped (and
+    any earlier sources/<name> entry for it removed).
+    """
+    indexed = skipped = 0
+    reports = set()
+    for md_path in sorted(EXTRACTED_DIR.rglob('*.md')):
+        reports.add(extracted_report_name(md_path))
+        if index_markdown(index, md_path, force):
+            indexed += 1
+            print(f"✅ Indexed: {md_path.name}")
+        else:
+            skipped += 1
+    segment_dirs = sorted(d for d in SOURCES_DIR.iterdir() if d.is_dir()) if SOURCES_DIR.exists() else []
+    for segment_dir in segment_dirs:
+        if segment_report_name(segment_dir) in reports - {None}:
+            index.remove(f"sources/{segment_dir.name}")
+            skipped += 1
+        elif index_segment_dir(index, segment_dir, force):
+            indexed += 1
+            print(f"✅ Indexed: {segment_dir.name}")
+        else:
+            skipped += 1
+    return indexed, skipped
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ERIC knowledge-base full-text index")
+    parser.add_argument('--db', type=Path, default=INDEX_DB, help="SQLite index file")
+    sub = parser.add_subparsers(dest='command', required=True)
+    build_cmd = sub.add_parser('build', help="Index extracted markdown and segment directories")
+    build_cmd.add_argument('--force', action='store_true', help="Re-index even unchanged sources")
+    query_cmd = sub.add_parser('query', help="Search the index")
+    query_cmd.add_argument('text')
+    query_cmd.add_argument('--limit', type=int, default=10)
+    query_cmd.add_argument('--source')
+    args = parser.parse_args(argv)
+
+    index = SearchIndex(args.db)
+    try:
+        if args.command == 'build':
+            print(f"🗂️  Building index: {args.db}\n")
+            started = time.perf_counter()
+            indexed, skipped = build(index, args.force)
+            stats = index.stats()
+            print(f"\n✅ Index ready in {time.perf_counter() - started:.2f}s: {indexed} updated, {skipped} unchanged")
+            print(f"📚 {stats['documents']} sources, {stats['passages']:,} passages")
+        else:
+            started = time.perf_counter()
+            results = index.search(args.text, limit=args.limit, source=args.source)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            print(f"🔎 {len(results)} results for {args.text!r} in {elapsed_ms:.1f} ms\n")
+            for rank, r in enumerate(results, 1):
+                where = r['source'] + (f" p.{r['page']}" if r['page'] else '')
+                print(f"{rank}. {where} — {r['section'] or 'untitled section'} (bm25 {r['score']:.2f})")
+                print(f"   {r['snippet']}\n")
+    finally:
+        index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""
+Section Index for Extracted Reports
+ERIC - turns the heading candidates seen while a report's markdown is written
+into a heading hierarchy and a <name>.sections.json index (titles, levels,
+byte offsets, page spans), so consumers memory-map the markdown and load one
+section at a time instead of the whole document
+
+Levels come from the PDF text layer where the backend exposes it (font sizes
+above the body size rank as levels 1, 2, ...; bold body-size lines come
+next) and from the is_heading() heuristic everywhere else ('#' headings from
+DOCX keep their level).
+
+    with SectionReader("Extracted_Text/MENA_Horizon_2030_Extracted.md") as report:
+        for section in report.sections:   # id, title, level, parent, start, body_end, end, page_start, page_end
+            ...
+        text = report.text(report.find("Strategic Outlook"))
+
+Usage:
+    python sections.py Extracted_Text/MENA_Horizon_2030_Extracted.md               # table of contents
+    python sections.py Extracted_Text/MENA_Horizon_2030_Extracted.md --section "Outlook" [--own]
+"""
+
+import json
+import mmap
+import sys
+from bisect import bisect_right
+from collections import Counter
+from pathlib import Path
+
+from chunking import SECTION_HEADING, is_heading
+
+INDEX_VERSION = 1
+HEADING_SIZE_RATIO = 1.15  # Lines this much larger than the body font are headings
+MAX_HEADING_CHARS = 100
+MAX_LEVEL = 6
+
+
+def index_path(text_path):
+    """'X_Extracted.md' → 'X_Extracted.sections.json'"""
+    return Path(text_path).with_suffix('.sections.json')
+
+
+def heuristic_level(line):
+    """Level for a line without font metadata, or None when it is not a heading"""
+    if line.startswith('#'):
+        return min(len(line) - len(line.lstrip('#')), MAX_LEVEL)
+    if not is_heading(line):
+        return None
+    return 1 if SECTION_HEADING.match(line) else 2
+
+
+def _title(line):
+    return line.lstrip('#').strip()
+
+
+class SectionIndexBuilder:
+    """Collects heading candidates and page offsets during the single extraction pass
+
+    Only short lines are kept as candidates, so memory grows with the number
+    of headings, not the document; levels are assigned in headings(), once the
+    body font size is known.
+    """
+
+    def __init__(self):
+        self._sizes = Counter()  # Font size → characters set in it
+        self._candidates = []    # (offset, line, page, font)
+        self._pages = []         # (offset of the page's first line, page number)
+        self.content_start = None
+
+    def observe(self, line, offset, page=None, font=None):
+        """Record one written line; offset is the byte offset where it starts in the text file"""
+        if self.content_start is None:
+            self.content_start = offset
+        if page is not None and (not self._pages or self._pages[-1][1] != page):
+            self._pages.append((offset, page))
+        if font:
+            self._sizes[font[0]] += len(line)
+        if len(line) <= MAX_HEADING_CHARS and not line.endswith(('.', ',', ';')):
+            self._candidates.append((offset, line, page, font))
+
+    def body_size(self):
+        """The font size most characters are set in, or None without font metadata"""
+        return self._sizes.most_common(1)[0][0] if self._sizes else None
+
+    def headings(self):
+        """[(offset, title, level, page)] in document order"""
+        body = self.body_size()
+        tiers = sorted({font[0] for _, _, _, font in self._candidates
+                        if font and body and font[0] >= body * HEADING_SIZE_RATIO}, reverse=True)
+        levels = {size: min(rank, MAX_LEVEL) for rank, size in enumerate(tiers, 1)}
+        bold_level = min(len(tiers) + 1, MAX_LEVEL)
+
+        headings = []
+        for offset, line, page, font in self._candidates:
+            if line.startswith('#') or not font:
+                level = heuristic_level(line)
+            elif font[0] in levels:
+                level = levels[font[0]]
+            elif font[1] and font[0] >= body and any(c.isalpha() for c in line):
+                level = bold_level
+            else:
+                level = None
+            if level:
+                headings.append((offset, _title(line), level, page))
+        return headings
+
+    def sections(self, content_end):
+        """Section dicts with nested (end) and own-text-only (body_end) spans"""
+        headings = self.headings()
+        sections = []
+        for i, (offset, title, level, page) in enumerate(headings):
+            end = next((h[0] for h in headings[i + 1:] if h[2] <= level), content_end)
+            sections.append({
+                'id': i,
+                'title': title,
+                'level': level,
+                'parent': None,
+                'start': offset,
+                'body_end': headings[i + 1][0] if i + 1 < len(headings) else content_end,
+                'end': end,
+                'page_start': page,
+                'page_end': self._page_at(end - 1) if page is not None else None,
+            })
+        stack = []
+        for section in sections:
+            while stack and stack[-1]['level'] >= section['level']:
+                stack.pop()
+            section['parent'] = stack[-1]['id'] if stack else None
+            stack.append(section)
+        return sections
+
+    def _page_at(self, offset):
+        position = bisect_right(self._pages, (offset, float('inf'))) - 1
+        return self._pages[max(position, 0)][1] if self._pages else None
+
+    def write(self, text_path, content_end, **meta):
+        """Write the index next to text_path; returns the section list"""
+        sections = self.sections(content_end)
+        body = self.body_size()
+        index = {
+            'version': INDEX_VERSION,
+            'text_file': Path(text_path).name,
+            'text_bytes': Path(text_path).stat().st_size,
+            'content_start': self.content_start if self.content_start is not None else content_end,
+            'content_end': content_end,
+            'body_font_size': body,
+            'heading_source': 'font' if body else 'heuristic',
+            **meta,
+            'sections': sections,
+        }
+        partial = index_path(text_path).with_suffix('.tmp')
+        with open(partial, 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=1)
+        partial.replace(index_path(text_path))
+        return sections
+
+
+class SectionReader:
+    """Memory-mapped view of an extracted report; sections are decoded only when read"""
+
+    def __init__(self, text_path, index_file=None):
+        self.text_path = Path(text_path)
+        with open(index_file or index_path(text_path), encoding='utf-8') as f:
+            self.index = json.load(f)
+        self.sections = self.index['sections']
+        self._handle = open(self.text_path, 'rb')
+        try:
+            self._map = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._handle.close()
+            raise
+        if len(self._map) != self.index['text_bytes']:
+            self.close()
+            raise ValueError(f"{self.text_path.name} changed since its section index was written; re-extract it")
+
+    def find(self, title):
+        """First section whose title contains title (case-insensitive), or None"""
+        needle = title.lower()
+        return next((s for s in self.sections if needle in s['title'].lower()), None)
+
+    def children(self, section):
+        return [s for s in self.sections if s['parent'] == section['id']]
+
+    def text(self, section, nested=True):
+        """The section's markdown, including its subsections unless nested=False"""
+        end = section['end'] if nested else section['body_end']
+        return self._map[section['start']:end].decode('utf-8').strip()
+
+    def toc(self):
+        """Indented 'title (pp. a-b)' lines"""
+        lines = []
+        for s in self.sections:
+            pages = f" (pp. {s['page_start']}-{s['page_end']})" if s['page_start'] else ''
+            lines.append(f"{'  ' * (s['level'] - 1)}{s['title']}{pages}")
+        return lines
+
+    def close(self):
+        self._map.close()
+        self._handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ERIC section index reader")
+    parser.add_argument('text', type=Path, help="Extracted markdown with a .sections.json index beside it")
+    parser.add_argument('--section', help="Print the first section whose title contains this text")
+    parser.add_argument('--own', action='store_true', help="Leave out the section's subsections")
+    args = parser.parse_args(argv)
+
+    with SectionReader(args.text) as report:
+        if not args.section:
+            print('\n'.join(report.toc()))
+            return 0
+        section = report.find(args.section)
+        if section is None:
+            print(f"❌ No section matching {args.section!r}")
+            return 1
+        print(report.text(section, nested=not args.own))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
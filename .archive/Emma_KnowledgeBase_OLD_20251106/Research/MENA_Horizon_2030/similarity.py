@@ -0,0 +1,216 @@
+"""
+Local TF-IDF Similarity Engine for the Emma KnowledgeBase
+ERIC - offline vectorizer over indexed passages: top-k related sections and
+near-duplicate reports, with the sparse matrix memory-mapped from disk
+
+Usage:
+    python similarity.py build                      # vectorize passages from knowledge_index.db
+    python similarity.py query "water security desalination" [-k 5]
+    python similarity.py duplicates [--threshold 0.9] [--report FILE]
+"""
+
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+
+from search_index import INDEX_DB, REPO_ROOT
+
+MODEL_DIR = Path(os.environ.get("ERIC_TFIDF_DIR", REPO_ROOT / "server" / "emma" / "knowledge_tfidf"))
+TOKEN = re.compile(r'[^\W\d_]{2,}', re.UNICODE)
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further had
+has have having he her here hers him his how i if in into is it its itself just me more most my
+no nor not now of off on once only or other our ours out over own same she should so some such
+than that the their theirs them then there these they this those through to too under until up
+very was we were what when where which while who whom why will with would you your yours
+""".split())
+DUPLICATE_BLOCK_ROWS = 1024
+
+
+def tokenize(text):
+    return [t for t in (m.lower() for m in TOKEN.findall(text)) if t not in STOPWORDS]
+
+
+class TfidfModel:
+    """L2-normalised sublinear TF-IDF rows in a CSR matrix, plus per-row metadata"""
+
+    def __init__(self, matrix, vocabulary, idf, rows):
+        self.matrix = matrix
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.rows = rows
+
+    @classmethod
+    def fit(cls, documents, min_df=1):
+        """Vectorize an iterable of (text, metadata dict) pairs"""
+        rows, counts, df = [], [], Counter()
+        for text, meta in documents:
+            tf = Counter(tokenize(text))
+            counts.append(tf)
+            rows.append(meta)
+            df.update(tf.keys())
+
+        terms = sorted(t for t, n in df.items() if n >= min_df)
+        vocabulary = {t: i for i, t in enumerate(terms)}
+        n_docs = len(rows)
+        idf = np.array([math.log((1 + n_docs) / (1 + df[t])) + 1 for t in terms], dtype=np.float32)
+
+        indptr = [0]
+        indices, data = [], []
+        for tf in counts:
+            cols = [(vocabulary[t], 1 + math.log(n)) for t, n in tf.items() if t in vocabulary]
+            cols.sort()
+            indices.extend(c for c, _ in cols)
+            data.extend(w for _, w in cols)
+            indptr.append(len(indices))
+        matrix = sparse.csr_matrix(
+            (np.array(data, dtype=np.float32), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+            shape=(n_docs, len(terms)))
+        matrix = matrix.multiply(idf).tocsr()
+        return cls(_l2_normalize(matrix), vocabulary, idf, rows)
+
+    def save(self, model_dir=MODEL_DIR):
+        """Persist as raw .npy arrays so load() can memory-map them"""
+        model_dir = Path(model_dir)
+        model_dir.mkdir(parents=True, exist_ok=True)
+        np.save(model_dir / 'data.npy', self.matrix.data.astype(np.float32, copy=False))
+        # Index arrays keep scipy's own dtype, otherwise csr_matrix would copy them on load
+        np.save(model_dir / 'indices.npy', self.matrix.indices)
+        np.save(model_dir / 'indptr.npy', self.matrix.indptr)
+        np.save(model_dir / 'idf.npy', self.idf)
+        with open(model_dir / 'model.json', 'w', encoding='utf-8') as f:
+            json.dump({'shape': list(self.matrix.shape), 'vocabulary': self.vocabulary, 'rows': self.rows}, f)
+
+    @classmethod
+    def load(cls, model_dir=MODEL_DIR):
+        """Open a saved model with its arrays memory-mapped (no copy, pages load on first touch)"""
+        model_dir = Path(model_dir)
+        with open(model_dir / 'model.json', encoding='utf-8') as f:
+            meta = json.load(f)
+        arrays = [np.load(model_dir / name, mmap_mode='r') for name in ('data.npy', 'indices.npy', 'indptr.npy')]
+        matrix = sparse.csr_matrix(tuple(arrays), shape=tuple(meta['shape']), copy=False)
+        return cls(matrix, meta['vocabulary'], np.load(model_dir / 'idf.npy', mmap_mode='r'), meta['rows'])
+
+    def vectorize(self, text):
+        tf = Counter(t for t in tokenize(text) if t in self.vocabulary)
+        cols = sorted(self.vocabulary[t] for t in tf)
+        terms = {self.vocabulary[t]: t for t in tf}
+        data = np.array([(1 + math.log(tf[terms[c]])) * self.idf[c] for c in cols], dtype=np.float32)
+        vector = sparse.csr_matrix((data, np.array(cols, dtype=np.int32), np.array([0, len(cols)])),
+                                   shape=(1, self.matrix.shape[1]))
+        return _l2_normalize(vector)
+
+    def top_k(self, vector, k=5, exclude=None):
+        """Rows with the highest cosine similarity to a normalised query vector"""
+        scores = (self.matrix @ vector.T).toarray().ravel()
+        if exclude is not None:
+            scores[exclude] = -1.0
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [dict(self.rows[i], row=int(i), score=float(scores[i])) for i in best if scores[i] > 0]
+
+    def similar(self, text, k=5):
+        """Passages most similar to free text"""
+        return self.top_k(self.vectorize(text), k)
+
+    def related(self, row, k=5):
+        """Passages most similar to an indexed passage (the passage itself excluded)"""
+        return self.top_k(self.matrix[row], k, exclude=row)
+
+    def near_duplicates(self, threshold=0.9):
+        """All passage pairs with cosine >= threshold, computed in row blocks to bound memory"""
+        pairs = []
+        transposed = self.matrix.T.tocsc()
+        for start in range(0, self.matrix.shape[0], DUPLICATE_BLOCK_ROWS):
+            block = (self.matrix[start:start + DUPLICATE_BLOCK_ROWS] @ transposed).tocoo()
+            rows = block.row + start
+            keep = (block.data >= threshold) & (rows < block.col)
+            for i, j, score in zip(rows[keep], block.col[keep], block.data[keep]):
+                pairs.append((int(i), int(j), float(score)))
+        pairs.sort(key=lambda p: -p[2])
+        return pairs
+
+
+def _l2_normalize(matrix):
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.csr_matrix(sparse.diags((1.0 / norms).astype(np.float32)) @ matrix)
+
+
+def passages_from_index(db_path=INDEX_DB):
+    """Stream (text, metadata) pairs from the FTS5 index's passages table (one row per segment)"""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        for pid, source, page, section, text in conn.execute(
+                'SELECT id, source, page, section, text FROM passages ORDER BY id'):
+            yield text, {'id': pid, 'source': source, 'page': page, 'section': section}
+    finally:
+        conn.close()
+
+
+def describe(row):
+    return row['source'] + (f" p.{row['page']}" if row.get('page') else '') + f" — {row.get('section') or 'untitled section'}"
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ERIC TF-IDF similarity engine")
+    parser.add_argument('--model', type=Path, default=MODEL_DIR, help="Directory holding the saved matrix")
+    sub = parser.add_subparsers(dest='command', required=True)
+    build_cmd = sub.add_parser('build', help="Vectorize passages from the search index")
+    build_cmd.add_argument('--db', type=Path, default=INDEX_DB)
+    query_cmd = sub.add_parser('query', help="Top-k passages similar to TEXT")
+    query_cmd.add_argument('text')
+    query_cmd.add_argument('-k', type=int, default=5)
+    dup_cmd = sub.add_parser('duplicates', help="Report near-duplicate passage pairs")
+    dup_cmd.add_argument('--threshold', type=float, default=0.9)
+    dup_cmd.add_argument('--report', type=Path, help="Write the pairs as JSON")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.command == 'build':
+        model = TfidfModel.fit(passages_from_index(args.db))
+        if not model.rows:
+            print(f"❌ No passages in {args.db}; index the reports first (python search_index.py build)")
+            return 1
+        model.save(args.model)
+        print(f"✅ TF-IDF model built in {time.perf_counter() - started:.2f}s")
+        print(f"📐 {model.matrix.shape[0]:,} passages × {model.matrix.shape[1]:,} terms, {model.matrix.nnz:,} non-zeros")
+        print(f"📍 Saved to: {args.model}")
+        return 0
+
+    model = TfidfModel.load(args.model)
+    if args.command == 'query':
+        results = model.similar(args.text, args.k)
+        print(f"🔎 {len(results)} related passages in {(time.perf_counter() - started) * 1000:.1f} ms\n")
+        for rank, r in enumerate(results, 1):
+            print(f"{rank}. {describe(r)} (cosine {r['score']:.3f})")
+        return 0
+
+    pairs = model.near_duplicates(args.threshold)
+    print(f"🧬 {len(pairs)} near-duplicate pairs (cosine ≥ {args.threshold}) in {time.perf_counter() - started:.2f}s\n")
+    for i, j, score in pairs[:20]:
+        print(f"  {score:.3f}  {describe(model.rows[i])}  ⇄  {describe(model.rows[j])}")
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump([{'a': model.rows[i], 'b': model.rows[j], 'score': score} for i, j, score in pairs], f, indent=2)
+        print(f"\n📍 Report: {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""
+Structured JSONL Telemetry for ERIC Runs
+The repository's shared pipeline_telemetry.py with ERIC_* defaults; stage
+events land in the file telemetry_collector.js folds into the daily report
+
+    telemetry = Telemetry.from_env('ERIC')   # ERIC_TELEMETRY=1|PATH|-  ERIC_QUIET=1
+    with telemetry.console(), telemetry.stage('extract', bytes_in=size) as stage:
+        ...
+        stage.update(pages=n)
+        stage.add_output(output_file)
+
+ERIC_TELEMETRY_MEMORY=1 adds a per-stage tracemalloc peak; opt-in, as tracing
+slows pure-Python PDF backends ~10x and would skew every timing.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[4]
+_MODULE = 'pipeline_telemetry'
+
+
+def _load_shared():
+    if _MODULE in sys.modules:
+        return sys.modules[_MODULE]
+    spec = importlib.util.spec_from_file_location(_MODULE, REPO_ROOT / f"{_MODULE}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[_MODULE] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+_shared = _load_shared()
+Stage = _shared.Stage
+TELEMETRY_FILE = _shared.TELEMETRY_FILE
+
+
+class Telemetry(_shared.Telemetry):
+    """JSONL stage events to a file ('-' for stdout); sink=None disables everything but quiet"""
+
+    @classmethod
+    def from_env(cls, prefix='ERIC', sink=None, quiet=False, default_file=None):
+        return super().from_env(prefix, sink, quiet, default_file)
+
+
+DISABLED = Telemetry()
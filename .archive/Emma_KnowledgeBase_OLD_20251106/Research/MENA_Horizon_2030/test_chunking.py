@@ -0,0 +1,71 @@
+"""
+Segmenter tests for the ERIC knowledge-base chunker
+Run: python test_chunking.py  (or collect with pytest)
+"""
+
+import math
+import sys
+
+from chunking import Segmenter
+
+ESTIMATE = ('estimate-4cpt', lambda text: math.ceil(len(text) / 4))
+
+
+def segment(paragraphs, max_tokens):
+    segmenter = Segmenter(max_tokens, ESTIMATE)
+    segments = []
+    for paragraph in paragraphs:
+        segments.extend(segmenter.feed(paragraph))
+    segments.extend(segmenter.finish())
+    return segments
+
+
+def words(text):
+    return text.split()
+
+
+def test_long_paragraph_keeps_trailing_fragment():
+    paragraph = ' '.join(['The regional energy demand exceeds.'] * 20) + ' trailing words without end'
+    segments = segment([paragraph], max_tokens=40)
+    joined = ' '.join(s['content'] for s in segments)
+    assert joined.endswith('trailing words without end'), joined[-80:]
+    assert words(joined) == words(paragraph)
+
+
+def test_oversized_sentence_is_hard_split():
+    sentence = ' '.join(f'word{i}' for i in range(400)) + '.'
+    segments = segment([sentence], max_tokens=50)
+    assert len(segments) > 1
+    assert all(s['tokens'] <= 50 for s in segments), [s['tokens'] for s in segments]
+    assert words(' '.join(s['content'] for s in segments)) == words(sentence)
+
+
+def test_oversized_word_is_cut():
+    blob = 'x' * 1000
+    segments = segment([f'See {blob} for details.'], max_tokens=30)
+    assert all(s['tokens'] <= 30 for s in segments), [s['tokens'] for s in segments]
+    assert ''.join(s['content'] for s in segments).replace('\n', '').replace(' ', '') == f'See{blob}fordetails.'
+
+
+def test_short_paragraphs_are_packed_unchanged():
+    paragraphs = ['First paragraph.', 'Second one', 'Third!']
+    segments = segment(paragraphs, max_tokens=1800)
+    assert [s['content'] for s in segments] == ['\n\n'.join(paragraphs)]
+
+
+TESTS = (test_long_paragraph_keeps_trailing_fragment, test_oversized_sentence_is_hard_split,
+         test_oversized_word_is_cut, test_short_paragraphs_are_packed_unchanged)
+
+
+if __name__ == "__main__":
+    print('🧪 Testing the knowledge-base segmenter\n')
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+    print('\n✅ Segmenter tests passed!' if not failed else f'\n❌ {failed} segmenter test(s) FAILED')
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,51 @@
+"""
+Import-time budget test for the ERIC extractor library
+Run: python test_extract_import_budget.py  (or collect with pytest)
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).parent
+HEAVY_MODULES = ('PyPDF2', 'pypdf', 'pdfminer', 'pypdfium2', 'tiktoken')
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import extract_pdf
+elapsed_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({
+    'elapsed_ms': elapsed_ms,
+    'budget_ms': extract_pdf.IMPORT_BUDGET_MS,
+    'heavy': [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def measure_import():
+    """Import extract_pdf in a fresh interpreter and report the cost"""
+    result = subprocess.run([sys.executable, '-c', PROBE], cwd=HERE, capture_output=True,
+                            text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_is_within_budget():
+    report = measure_import()
+    assert report['elapsed_ms'] < report['budget_ms'], report
+
+
+def test_import_defers_heavy_dependencies():
+    report = measure_import()
+    assert report['heavy'] == [], report
+
+
+if __name__ == "__main__":
+    print('🧪 Testing extract_pdf import budget\n')
+    report = measure_import()
+    print(f"⏱️  Import time: {report['elapsed_ms']:.1f} ms (budget {report['budget_ms']} ms)")
+    print(f"📦 Heavy modules loaded at import: {report['heavy'] or 'none'}")
+    ok = report['elapsed_ms'] < report['budget_ms'] and not report['heavy']
+    print('\n✅ Import budget test passed!' if ok else '\n❌ Import budget test FAILED')
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,97 @@
+"""
+FingerprintSet and LineDeduper tests for ERIC extraction
+Run: python test_line_dedupe.py  (or collect with pytest)
+"""
+
+import sys
+
+from line_dedupe import EMPTY, MAX_LOAD, FingerprintSet, LineDeduper, fingerprint
+
+
+def test_fingerprint_is_stable_and_never_empty():
+    assert fingerprint('Regional outlook') == fingerprint('Regional outlook')
+    assert fingerprint('Regional outlook') != fingerprint('Regional outlook.')
+    assert all(fingerprint(f'line {i}') != EMPTY for i in range(1000))
+
+
+def test_membership():
+    fps = FingerprintSet(16)
+    assert fps.add(42) is True
+    assert fps.add(42) is False
+    assert 42 in fps and 43 not in fps
+    assert len(fps) == 1
+
+
+def test_colliding_slots_probe_linearly():
+    fps = FingerprintSet(16)
+    size = fps.nbytes // 8
+    colliding = [7 + size * i for i in range(5)]  # Same home slot
+    assert all(fps.add(fp) for fp in colliding)
+    assert all(fp in fps for fp in colliding)
+    assert 7 + size * 5 not in fps
+
+
+def test_growth_keeps_every_member():
+    fps = FingerprintSet(16)
+    start = fps.nbytes
+    values = [fingerprint(f'line {i}') for i in range(5000)]
+    for fp in values:
+        fps.add(fp)
+    assert len(fps) == 5000
+    assert all(fp in fps for fp in values)
+    assert fps.nbytes > start
+    assert len(fps) <= MAX_LOAD * (fps.nbytes // 8)
+
+
+def test_nbytes_tracks_slot_count():
+    fps = FingerprintSet(1024)
+    slots = fps.nbytes // 8
+    assert fps.nbytes == 8 * slots
+    assert slots & (slots - 1) == 0 and slots >= 1024 / MAX_LOAD
+    while len(fps) <= MAX_LOAD * slots:
+        fps.add(len(fps) + 1)
+    assert fps.nbytes == 16 * slots
+
+
+def test_exact_deduper_preserves_first_occurrence():
+    deduper = LineDeduper('exact', expected_lines=16)
+    lines = ['Header', 'Body one', 'Header', 'Body two', 'Body one']
+    assert [line for line in lines if deduper.add(line)] == ['Header', 'Body one', 'Body two']
+    assert len(deduper) == 3 and 'Header' in deduper
+
+
+def test_probabilistic_deduper_grows_from_small_start():
+    deduper = LineDeduper('probabilistic', expected_lines=16)
+    start = deduper.nbytes
+    kept = sum(deduper.add(f'unique line {i}') for i in range(20_000))
+    assert kept >= 20_000 * 0.999, kept
+    assert deduper.nbytes > start
+    assert not deduper.add('unique line 7')
+
+
+def test_unknown_mode_is_rejected():
+    try:
+        LineDeduper('bloom')
+    except ValueError:
+        return
+    raise AssertionError('LineDeduper accepted an unknown mode')
+
+
+TESTS = (test_fingerprint_is_stable_and_never_empty, test_membership, test_colliding_slots_probe_linearly,
+         test_growth_keeps_every_member, test_nbytes_tracks_slot_count,
+         test_exact_deduper_preserves_first_occurrence, test_probabilistic_deduper_grows_from_small_start,
+         test_unknown_mode_is_rejected)
+
+
+if __name__ == "__main__":
+    print('🧪 Testing the line deduper\n')
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+    print('\n✅ Line dedupe tests passed!' if not failed else f'\n❌ {failed} line dedupe test(s) FAILED')
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,110 @@
+"""
+Section index tests for ERIC extraction
+Run: python test_sections.py  (or collect with pytest)
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+from sections import SectionIndexBuilder, SectionReader, heuristic_level
+
+BODY = (10.0, False)
+
+
+def build(lines):
+    """Feed (line, page, font) triples as extract_pdf does; returns (builder, text, content_end)"""
+    builder = SectionIndexBuilder()
+    text = b''
+    for line, page, font in lines:
+        builder.observe(line, len(text), page, font)
+        text += line.encode('utf-8') + b'\n\n'
+    return builder, text, len(text)
+
+
+def test_heuristic_levels():
+    assert heuristic_level('## Energy') == 2
+    assert heuristic_level('####### Deep') == 6
+    assert heuristic_level('Section 3: Outlook') == 1
+    assert heuristic_level('STRATEGIC PRIORITIES') == 2
+    assert heuristic_level('An ordinary sentence.') is None
+
+
+def test_font_sizes_rank_levels():
+    builder, _, _ = build([
+        ('Regional Outlook', 1, (18.0, True)),
+        ('Body text about demand growth across the region', 1, BODY),
+        ('Energy', 1, (14.0, False)),
+        ('Key Drivers', 2, (10.0, True)),
+        ('More body text that is set in the body size', 2, BODY),
+        ('Water', 2, (14.0, False)),
+    ])
+    assert builder.body_size() == 10.0
+    assert [(title, level) for _, title, level, _ in builder.headings()] == [
+        ('Regional Outlook', 1), ('Energy', 2), ('Key Drivers', 3), ('Water', 2)]
+
+
+def test_offsets_nesting_and_pages():
+    builder, text, end = build([
+        ('Regional Outlook', 1, (18.0, True)),
+        ('Intro body.', 1, BODY),
+        ('Energy', 2, (14.0, False)),
+        ('Energy body.', 3, BODY),
+        ('Water', 4, (14.0, False)),
+        ('Water body.', 4, BODY),
+    ])
+    outlook, energy, water = builder.sections(end)
+    assert text[outlook['start']:].startswith(b'Regional Outlook')
+    assert text[energy['start']:energy['end']].strip() == b'Energy\n\nEnergy body.'
+    assert outlook['body_end'] == energy['start'] and outlook['end'] == end
+    assert energy['end'] == water['start']
+    assert (energy['parent'], water['parent'], outlook['parent']) == (0, 0, None)
+    assert (energy['page_start'], energy['page_end']) == (2, 3)
+    assert (outlook['page_start'], outlook['page_end']) == (1, 4)
+
+
+def test_without_fonts_uses_heuristics():
+    builder, _, end = build([('# Summary', None, None), ('Plain text.', None, None),
+                             ('## Findings', None, None), ('SECTION 2: RISKS', None, None)])
+    assert builder.body_size() is None
+    assert [(s['title'], s['level'], s['parent']) for s in builder.sections(end)] == [
+        ('Summary', 1, None), ('Findings', 2, 0), ('SECTION 2: RISKS', 1, None)]
+
+
+def test_reader_round_trip():
+    builder, text, end = build([('# Summary', None, None), ('Summary body.', None, None),
+                                ('## Détails', None, None), ('Détails body.', None, None)])
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'Report_Extracted.md'
+        path.write_bytes(text)
+        builder.write(path, end, source='Report.pdf')
+        with SectionReader(path) as report:
+            assert report.index['source'] == 'Report.pdf'
+            details = report.find('détails')
+            assert report.text(details) == '## Détails\n\nDétails body.'
+            assert report.text(report.find('summary'), nested=False) == '# Summary\n\nSummary body.'
+            assert report.children(report.sections[0]) == [details]
+        path.write_bytes(text + b'appended')
+        try:
+            SectionReader(path)
+        except ValueError:
+            return
+    raise AssertionError('SectionReader accepted a text file that changed after indexing')
+
+
+TESTS = (test_heuristic_levels, test_font_sizes_rank_levels, test_offsets_nesting_and_pages,
+         test_without_fonts_uses_heuristics, test_reader_round_trip)
+
+
+if __name__ == "__main__":
+    print('🧪 Testing the section index\n')
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+    print('\n✅ Section index tests passed!' if not failed else f'\n❌ {failed} section index test(s) FAILED')
+    sys.exit(1 if failed else 0)
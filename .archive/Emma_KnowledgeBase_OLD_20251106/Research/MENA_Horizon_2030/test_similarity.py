@@ -0,0 +1,104 @@
+"""
+TF-IDF similarity engine tests for the Emma KnowledgeBase
+Run: python test_similarity.py  (or collect with pytest)
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from search_index import SearchIndex
+from similarity import TfidfModel, main, passages_from_index
+
+PASSAGES = [
+    ('Desalination plants secure water supply for coastal cities.', {'source': 'water', 'section': 'Supply'}),
+    ('Solar power capacity grows quickly across the Gulf region.', {'source': 'energy', 'section': 'Solar'}),
+    ('Desalination plants secure the water supply for coastal cities.', {'source': 'water-copy', 'section': 'Supply'}),
+    ('Sovereign funds diversify into technology and logistics.', {'source': 'finance', 'section': 'Funds'}),
+]
+
+
+def mapped(array):
+    """True when array is a view onto a np.memmap (no copy was made on load)"""
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+def test_fit_normalises_rows():
+    model = TfidfModel.fit(PASSAGES)
+    assert model.matrix.shape == (len(PASSAGES), len(model.vocabulary))
+    norms = np.sqrt(np.asarray(model.matrix.multiply(model.matrix).sum(axis=1)).ravel())
+    assert np.allclose(norms, 1.0)
+    assert 'the' not in model.vocabulary and 'desalination' in model.vocabulary
+
+
+def test_query_ranks_matching_passage_first():
+    model = TfidfModel.fit(PASSAGES)
+    results = model.similar('solar capacity in the gulf', k=2)
+    assert results[0]['source'] == 'energy', results
+    assert all(r['score'] > 0 for r in results)
+    assert model.similar('zzz unrelated vocabulary') == []
+
+
+def test_related_and_near_duplicates():
+    model = TfidfModel.fit(PASSAGES)
+    assert model.related(0, k=1)[0]['source'] == 'water-copy'
+    assert all(r['row'] != 0 for r in model.related(0, k=4))
+    pairs = model.near_duplicates(threshold=0.9)
+    assert [(i, j) for i, j, _ in pairs] == [(0, 2)], pairs
+
+
+def test_save_and_mmap_load_round_trip():
+    model = TfidfModel.fit(PASSAGES)
+    with tempfile.TemporaryDirectory() as tmp:
+        model.save(tmp)
+        loaded = TfidfModel.load(tmp)
+        assert all(mapped(a) for a in (loaded.matrix.data, loaded.matrix.indices, loaded.matrix.indptr))
+        assert (loaded.matrix != model.matrix).nnz == 0
+        assert loaded.rows == model.rows and loaded.vocabulary == model.vocabulary
+        assert loaded.similar('water desalination', k=2) == model.similar('water desalination', k=2)
+        del loaded  # Release the maps before the directory is removed (Windows)
+
+
+def test_build_from_search_index():
+    with tempfile.TemporaryDirectory() as tmp:
+        db, model_dir = Path(tmp) / 'index.db', Path(tmp) / 'model'
+        index = SearchIndex(db)
+        with index.document('water', 'sig') as add:
+            for text, meta in PASSAGES:
+                add(text, section=meta['section'], kind='segment')
+        index.close()
+        assert len(list(passages_from_index(db))) == len(PASSAGES)
+        assert main(['--model', str(model_dir), 'build', '--db', str(db)]) == 0
+        assert TfidfModel.load(model_dir).matrix.shape[0] == len(PASSAGES)
+
+
+def test_build_fails_on_empty_index():
+    with tempfile.TemporaryDirectory() as tmp:
+        db, model_dir = Path(tmp) / 'index.db', Path(tmp) / 'model'
+        SearchIndex(db).close()
+        assert main(['--model', str(model_dir), 'build', '--db', str(db)]) == 1
+        assert not model_dir.exists()
+
+
+TESTS = (test_fit_normalises_rows, test_query_ranks_matching_passage_first, test_related_and_near_duplicates,
+         test_save_and_mmap_load_round_trip, test_build_from_search_index, test_build_fails_on_empty_index)
+
+
+if __name__ == "__main__":
+    print('🧪 Testing the TF-IDF similarity engine\n')
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+    print('\n✅ Similarity tests passed!' if not failed else f'\n❌ {failed} similarity test(s) FAILED')
+    sys.exit(1 if failed else 0)
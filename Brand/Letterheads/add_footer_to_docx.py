@@ -8,6 +8,10 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 
+from brand_paths import LEGENDARY_DOCX
+from font_embed import embed_document_fonts
+from telemetry import Telemetry
+
 def add_footer_border(section):
     """Add a golden border line above the footer"""
     # Get the footer
@@ -33,11 +37,12 @@ def add_footer_border(section):
     pBdr.append(top_border)
     pPr.append(pBdr)
 
-def add_footer_to_letterhead():
+def add_footer_to_letterhead(docx_path=None):
     """Add professional footer to the letterhead DOCX"""
     
     # Open the document
-    doc = Document('AHKStrategies_Letterhead_LEGENDARY.docx')
+    docx_path = docx_path or LEGENDARY_DOCX
+    doc = Document(docx_path)
     
     # Access the default section
     section = doc.sections[0]
@@ -120,10 +125,15 @@ def add_footer_to_letterhead():
     p2.paragraph_format.space_before = Pt(0)
     p2.paragraph_format.space_after = Pt(8)
     
-    # Save the document
-    doc.save('AHKStrategies_Letterhead_LEGENDARY.docx')
+    # Save the document (re-embedding, so the footer's glyphs are in the font subsets)
+    embed_document_fonts(doc)
+    doc.save(docx_path)
     print("✅ Footer added successfully to DOCX!")
-    print("📄 File: AHKStrategies_Letterhead_LEGENDARY.docx")
+    print(f"📄 File: {docx_path}")
+    return docx_path
 
 if __name__ == "__main__":
-    add_footer_to_letterhead()
+    telemetry = Telemetry.from_env()
+    with telemetry.console(), telemetry.stage('add_footer_to_docx') as stage:
+        stage.add_input(LEGENDARY_DOCX)
+        stage.add_output(add_footer_to_letterhead())
@@ -0,0 +1,317 @@
+"""
+AHKStrategies Generated-Artifact Registry
+SQLite index of every generated document (content hash, template + version,
+recipient or memo id, size, path) over a content-addressed store sharded by
+hash prefix (Generated/ab/cd/<sha256>.docx), so finding or deduplicating an
+output is an index lookup instead of a directory listing
+
+Identical bytes are stored once however many times they are generated;
+each template/subject that produced them still gets its own registry row.
+
+    with ArtifactRegistry() as registry:
+        record = registry.store("AHKStrategies_Letterhead_v1.docx", "letterhead", "v1")
+        latest = registry.latest("Memo_2025-11-09", template="memo")
+
+Usage:
+    python artifact_registry.py add FILE --template NAME --version V [--subject ID] [--move]
+    python artifact_registry.py latest SUBJECT [--template NAME]
+    python artifact_registry.py find HASH_OR_NAME
+    python artifact_registry.py import DIR [--move]     # register a flat folder of old outputs
+    python artifact_registry.py stats | verify
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+ARTIFACT_ROOT = Path(os.environ.get("AHK_ARTIFACT_DIR", Path(__file__).parent / "Generated"))
+REGISTRY_DB = Path(os.environ.get("AHK_REGISTRY_DB", ARTIFACT_ROOT / "registry.db"))
+HASH_CHUNK = 1 << 20
+
+# 'AHKStrategies_Letterhead_v1_20251109_142233.docx', 'AHKStrategies_Letterhead_Master_FIXED_142233.docx'
+GENERATED_NAME = re.compile(r'^(?P<template>.+?)(?:_(?P<version>v\d+))?(?:_FIXED)?(?:_(?P<stamp>(?:\d{8}_)?\d{6}))?$')
+
+SCHEMA = """
+-- One row per distinct content; path is relative to the store root
+CREATE TABLE IF NOT EXISTS blobs (
+  hash TEXT PRIMARY KEY,
+  size INTEGER NOT NULL,
+  path TEXT NOT NULL,
+  stored_at INTEGER NOT NULL
+) WITHOUT ROWID;
+
+-- One row per generation of a template for a subject (recipient or memo id, '' for none)
+CREATE TABLE IF NOT EXISTS artifacts (
+  id INTEGER PRIMARY KEY,
+  hash TEXT NOT NULL REFERENCES blobs(hash),
+  template TEXT NOT NULL,
+  template_version TEXT NOT NULL,
+  subject TEXT NOT NULL DEFAULT '',
+  name TEXT NOT NULL,
+  kind TEXT NOT NULL,
+  source_signature TEXT,
+  created_at INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_artifacts_identity
+  ON artifacts(subject, template, template_version, kind, hash);
+CREATE INDEX IF NOT EXISTS idx_artifacts_latest ON artifacts(subject, template, created_at);
+CREATE INDEX IF NOT EXISTS idx_artifacts_hash ON artifacts(hash);
+CREATE INDEX IF NOT EXISTS idx_artifacts_name ON artifacts(name);
+"""
+
+
+def content_hash(source):
+    """sha256 of a file path or bytes, read in 1 MiB chunks"""
+    digest = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        digest.update(source)
+        return digest.hexdigest()
+    with open(source, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def shard_path(digest, suffix):
+    """'ab/cd/abcd….docx': two 256-way levels keep every directory small"""
+    return Path(digest[:2]) / digest[2:4] / f"{digest}{suffix}"
+
+
+def source_signature(path):
+    """Size + mtime fingerprint of a generator input (memo, template), as in batch_extract.py"""
+    stat = Path(path).stat()
+    return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+
+class ArtifactRegistry:
+    """Content-addressed artifact store with a SQLite index"""
+
+    def __init__(self, db_path=REGISTRY_DB, root=ARTIFACT_ROOT):
+        self.root = Path(root)
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def store(self, source, template, template_version, subject='', name=None, kind=None,
+              signature=None, move=False):
+        """Add a file path (or bytes, with name) to the store and register it; returns the artifact record
+
+        Content already in the store is not written again (record['deduped']
+        is True). move=True removes the source file once it is stored.
+        Registering the same content for the same subject/template/version
+        again only refreshes its timestamp.
+        """
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            if not name:
+                raise ValueError("name is required when storing bytes")
+            data, size = bytes(source), len(source)
+        else:
+            source = Path(source)
+            data, size = None, source.stat().st_size
+            name = name or source.name
+        suffix = Path(name).suffix.lower()
+        kind = kind or suffix.lstrip('.') or 'bin'
+        digest = content_hash(data if data is not None else source)
+        relative = shard_path(digest, suffix)
+
+        blob = self.conn.execute('SELECT path FROM blobs WHERE hash = ?', (digest,)).fetchone()
+        deduped = blob is not None and (self.root / blob['path']).exists()
+        if not deduped:
+            target = self.root / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            partial = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+            if data is not None:
+                partial.write_bytes(data)
+            elif move:
+                shutil.move(str(source), partial)
+            else:
+                shutil.copyfile(source, partial)
+            os.replace(partial, target)  # Atomic: a blob path never points at half a file
+        if move and data is None and source.exists():
+            source.unlink()
+
+        now = int(time.time() * 1000)
+        with self.conn:
+            self.conn.execute('INSERT INTO blobs (hash, size, path, stored_at) VALUES (?, ?, ?, ?) '
+                              'ON CONFLICT(hash) DO UPDATE SET path = excluded.path',
+                              (digest, size, relative.as_posix(), now))
+            self.conn.execute(
+                'INSERT INTO artifacts (hash, template, template_version, subject, name, kind, source_signature, '
+                'created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(subject, template, template_version, kind, hash) DO UPDATE SET '
+                'name = excluded.name, source_signature = excluded.source_signature, created_at = excluded.created_at',
+                (digest, template, template_version, subject or '', name, kind, signature, now))
+        record = self._one('WHERE a.subject = ? AND a.template = ? AND a.template_version = ? AND a.kind = ? '
+                           'AND a.hash = ?', (subject or '', template, template_version, kind, digest))
+        record['deduped'] = deduped
+        return record
+
+    def _one(self, where, params):
+        rows = self._select(where + ' LIMIT 1', params)
+        return rows[0] if rows else None
+
+    def _select(self, where, params):
+        rows = self.conn.execute(
+            'SELECT a.id, a.hash, a.template, a.template_version, a.subject, a.name, a.kind, a.source_signature, '
+            f'a.created_at, b.size, b.path FROM artifacts a JOIN blobs b ON b.hash = a.hash {where}', params)
+        records = []
+        for row in rows:
+            record = dict(row)
+            record['path'] = str(self.root / record['path'])
+            records.append(record)
+        return records
+
+    def path_for(self, digest):
+        """Absolute path of stored content, or None"""
+        row = self.conn.execute('SELECT path FROM blobs WHERE hash = ?', (digest,)).fetchone()
+        return self.root / row['path'] if row else None
+
+    def find(self, digest=None, name=None):
+        """Every registration of a content hash or of a generated file name, newest first"""
+        if digest:
+            return self._select('WHERE a.hash = ? ORDER BY a.created_at DESC', (digest,))
+        return self._select('WHERE a.name = ? ORDER BY a.created_at DESC', (name,))
+
+    def latest(self, subject='', template=None, kind=None):
+        """Newest artifact for a subject (optionally of one template/kind), or None"""
+        where, params = 'WHERE a.subject = ?', [subject or '']
+        if template:
+            where, params = where + ' AND a.template = ?', params + [template]
+        if kind:
+            where, params = where + ' AND a.kind = ?', params + [kind]
+        return self._one(where + ' ORDER BY a.created_at DESC', params)
+
+    def history(self, subject='', template=None, limit=50):
+        where, params = 'WHERE a.subject = ?', [subject or '']
+        if template:
+            where, params = where + ' AND a.template = ?', params + [template]
+        return self._select(where + ' ORDER BY a.created_at DESC LIMIT ?', params + [limit])
+
+    def is_current(self, subject, template, template_version, signature, kinds=('docx',)):
+        """True when the newest artifact of every kind came from this exact input and template version"""
+        for kind in kinds:
+            record = self.latest(subject, template, kind)
+            if (record is None or record['template_version'] != template_version
+                    or record['source_signature'] != signature or not Path(record['path']).exists()):
+                return False
+        return True
+
+    def stats(self):
+        row = self.conn.execute(
+            'SELECT (SELECT COUNT(*) FROM artifacts) AS artifacts, (SELECT COUNT(*) FROM blobs) AS blobs, '
+            '(SELECT COALESCE(SUM(size), 0) FROM blobs) AS stored_bytes, '
+            '(SELECT COALESCE(SUM(b.size), 0) FROM artifacts a JOIN blobs b ON b.hash = a.hash) AS logical_bytes'
+        ).fetchone()
+        stats = dict(row)
+        stats['saved_bytes'] = stats['logical_bytes'] - stats['stored_bytes']
+        return stats
+
+    def verify(self):
+        """(hash, problem) for every blob whose file is missing or has the wrong size"""
+        problems = []
+        for row in self.conn.execute('SELECT hash, size, path FROM blobs'):
+            path = self.root / row['path']
+            if not path.exists():
+                problems.append((row['hash'], 'missing'))
+            elif path.stat().st_size != row['size']:
+                problems.append((row['hash'], f"size {path.stat().st_size} != {row['size']}"))
+        return problems
+
+    def import_directory(self, directory, move=False, suffixes=('.docx', '.pdf', '.html', '.png')):
+        """Register the outputs of a flat generator folder, parsing template and version from the file names"""
+        records = []
+        for path in sorted(Path(directory).iterdir()):
+            if not path.is_file() or path.suffix.lower() not in suffixes or path.name.startswith('~$'):
+                continue
+            match = GENERATED_NAME.match(path.stem)
+            template = match.group('template') if match else path.stem
+            records.append(self.store(path, template, (match and match.group('version')) or 'v1',
+                                      signature=source_signature(path), move=move))
+        return records
+
+
+def register_output(path, template, template_version, subject=''):
+    """Register a generator's output when AHK_REGISTRY=1 (or a DB path) is set; no-op otherwise"""
+    setting = os.environ.get("AHK_REGISTRY")
+    if not setting or not path or not Path(path).exists():
+        return None
+    with ArtifactRegistry(REGISTRY_DB if setting == '1' else Path(setting)) as registry:
+        return registry.store(path, template, template_version, subject)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="AHKStrategies generated-artifact registry")
+    parser.add_argument('--db', type=Path, default=REGISTRY_DB, help="Registry database")
+    parser.add_argument('--root', type=Path, default=ARTIFACT_ROOT, help="Content-addressed store root")
+    commands = parser.add_subparsers(dest='command', required=True)
+    add = commands.add_parser('add', help="Store and register a generated file")
+    add.add_argument('file', type=Path)
+    add.add_argument('--template', required=True)
+    add.add_argument('--version', default='v1')
+    add.add_argument('--subject', default='', help="Recipient or memo id")
+    add.add_argument('--move', action='store_true', help="Remove the file once stored")
+    latest = commands.add_parser('latest', help="Newest artifact for a recipient/memo id")
+    latest.add_argument('subject')
+    latest.add_argument('--template')
+    find = commands.add_parser('find', help="Registrations of a content hash or file name")
+    find.add_argument('key')
+    migrate = commands.add_parser('import', help="Register every output in a flat folder")
+    migrate.add_argument('directory', type=Path)
+    migrate.add_argument('--move', action='store_true', help="Move the files into the store")
+    commands.add_parser('stats', help="Artifact, blob and dedupe totals")
+    commands.add_parser('verify', help="Check that every stored blob exists with its recorded size")
+    args = parser.parse_args(argv)
+
+    with ArtifactRegistry(args.db, args.root) as registry:
+        started = time.perf_counter()
+        if args.command == 'add':
+            records = [registry.store(args.file, args.template, args.version, args.subject, move=args.move)]
+        elif args.command == 'latest':
+            records = [r for r in [registry.latest(args.subject, args.template)] if r]
+        elif args.command == 'find':
+            key = args.key.lower()
+            records = registry.find(digest=key) if re.fullmatch(r'[0-9a-f]{64}', key) else registry.find(name=args.key)
+        elif args.command == 'import':
+            records = registry.import_directory(args.directory, args.move)
+            print(f"📥 Registered {len(records)} files ({sum(r['deduped'] for r in records)} duplicates stored once)")
+        elif args.command == 'stats':
+            stats = registry.stats()
+            print(f"🗂️  {stats['artifacts']:,} artifacts in {stats['blobs']:,} blobs")
+            print(f"💾 Stored: {stats['stored_bytes'] / 1024:.1f} KB  |  ♻️  Saved by dedupe: {stats['saved_bytes'] / 1024:.1f} KB")
+            return 0
+        else:
+            problems = registry.verify()
+            for digest, problem in problems:
+                print(f"❌ {digest[:12]}: {problem}")
+            print("✅ All blobs present" if not problems else f"❌ {len(problems)} blob(s) damaged")
+            return 1 if problems else 0
+        elapsed = (time.perf_counter() - started) * 1000
+        for r in records:
+            print(f"📄 {r['name']}  [{r['template']} {r['template_version']}{' • ' + r['subject'] if r['subject'] else ''}]"
+                  f"  {r['size'] / 1024:.1f} KB  {r['hash'][:12]}\n   ↳ {r['path']}")
+        if args.command in ('latest', 'find'):
+            print(f"⚡ {len(records)} result(s) in {elapsed:.2f} ms")
+        return 0 if records or args.command == 'import' else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
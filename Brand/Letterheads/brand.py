@@ -0,0 +1,405 @@
+"""
+AHKStrategies Brand CLI
+One entry point for the Brand/Letterheads tools. Each subcommand imports only
+what it uses (python-docx, Pillow, Playwright, docx2pdf/LibreOffice), inside
+its handler, so `brand.py verify` never loads Chromium bindings and
+`brand.py --help` loads none of them. Paths default to brand_paths.py
+(AHK_* environment variables).
+
+Every command has a cold-start budget (COLD_START_BUDGET_MS): the time a
+fresh interpreter needs to load this CLI plus every module a default run of
+the command imports, including the lazy ones (bundling, font embedding,
+previews; pikepdf when AHK_PDF_OPTIMIZE=1). `extract` has none: it runs the
+extractor in its own interpreter, whose test_extract_import_budget.py covers it.
+`brand.py budget` measures it per command and fails when a command is over
+budget or could not be measured (a dependency missing here) unless
+--skip-missing says to leave those out; test_brand_cold_start.py runs it.
+
+Usage:
+    python brand.py generate {letterhead,master,clean,masterpiece,legendary} [--output PATH]
+    python brand.py remove-bg [INPUT] [OUTPUT]
+    python brand.py banner [--output PNG]
+    python brand.py render-pdf [HTML] [PDF]
+    python brand.py bundle HTML [HTML ...] [--offline] [--force]
+    python brand.py capture-logo [--sizes 160,320] [--fps 30] [--seconds 3] [--format webp|mp4] [--parallel]
+    python brand.py convert DOCX [PDF]
+    python brand.py optimize-pdf PDF [PDF ...] [--no-linearize]
+    python brand.py verify [DOCX]
+    python brand.py fonts [DOCX ...] [--warm]
+    python brand.py visual [OUTPUT ...] [--approve] [--force] [--dpi 96]
+    python brand.py extract REPORT.pdf|REPORT.docx [extractor options...]
+    python brand.py budget [COMMAND ...] [--runs N] [--skip-missing]
+    Global: [--telemetry [PATH|-]] [--quiet] before the command
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import brand_paths
+from telemetry import Telemetry
+
+# Modules a default run of each command imports (lazy imports included: media recompression and font
+# subsetting on a cold cache, eager previews), and the cold-start budget for loading them.
+# Budgets are for a warm OS file cache; `brand.py budget` reports commands whose dependency is not installed.
+PREVIEW_IMPORTS = ('pypdfium2', 'PIL.Image')  # eager_previews() after every PDF (AHK_PREVIEWS=0 turns it off)
+COMMAND_IMPORTS = {
+    'generate': ('create_master_letterhead', 'create_letterhead', 'artifact_registry', 'PIL.Image',
+                 'fontTools.subset'),
+    # `generate legendary`: bundle HTML → PDF → DOCX with embedded fonts
+    'generate-legendary': ('generate_ultimate', 'playwright.async_api', 'docx', 'fontTools.subset') + PREVIEW_IMPORTS,
+    'remove-bg': ('remove_background',),
+    'banner': ('create_ultimate_masterpiece',),
+    'render-pdf': ('generate_ultimate', 'playwright.async_api', 'fontTools.subset') + PREVIEW_IMPORTS,
+    'capture-logo': ('capture_logo', 'playwright.async_api', 'PIL.Image'),
+    'bundle': ('bundle_html', 'fontTools.subset'),
+    'convert': ('render_memos',) + PREVIEW_IMPORTS,
+    'optimize-pdf': ('pdf_postprocess', 'pikepdf'),
+    'verify': ('verify_docx', 'docx'),
+    'fonts': ('font_embed', 'fontTools.subset', 'docx'),
+    'visual': ('visual_regression', 'numpy') + PREVIEW_IMPORTS,
+}
+PDF_WRITERS = ('generate-legendary', 'render-pdf', 'convert')  # Also load pikepdf when AHK_PDF_OPTIMIZE=1
+COLD_START_BUDGET_MS = {
+    'generate': 250,
+    'generate-legendary': 400,
+    'remove-bg': 120,
+    'banner': 250,
+    'render-pdf': 400,
+    'capture-logo': 300,
+    'bundle': 200,
+    'convert': 150,
+    'optimize-pdf': 200,
+    'verify': 200,
+    'fonts': 250,
+    'visual': 200,
+}
+GENERATORS = {
+    # kind: (module, function, registry template name or None)
+    'letterhead': ('create_letterhead', 'create_letterhead', 'AHKStrategies_Letterhead'),
+    'master': ('create_master_letterhead', 'create_master_letterhead', 'AHKStrategies_Letterhead_Master'),
+    'clean': ('create_clean_letterhead', 'create_letterhead', None),
+    'masterpiece': ('create_ultimate_masterpiece', 'create_ultimate_letterhead', None),
+    'legendary': ('generate_ultimate', 'html_to_pdf_to_docx', None),
+}
+
+
+# === COMMANDS ===============================================================
+# Each returns (exit code, [output paths]); imports stay inside the handler.
+
+def cmd_generate(args, telemetry):
+    import importlib
+
+    module, function, template = GENERATORS[args.kind]
+    generate = getattr(importlib.import_module(module), function)
+    if args.kind == 'legendary':
+        import asyncio
+        kwargs = {'docx_path': args.output} if args.output else {}
+        asyncio.run(generate(**kwargs))
+        return 0, [args.output or brand_paths.LEGENDARY_DOCX, brand_paths.LEGENDARY_PDF]
+    output = generate(args.output) if args.output else generate()
+    if template:
+        from artifact_registry import register_output
+        register_output(output, template, 'v1')  # AHK_REGISTRY=1: index in the artifact registry
+    return 0, [output]
+
+
+def cmd_remove_bg(args, telemetry):
+    from remove_background import remove_gray_background
+
+    return 0, [remove_gray_background(args.input, args.output)]
+
+
+def cmd_banner(args, telemetry):
+    from create_ultimate_masterpiece import create_elegant_banner
+
+    return 0, [create_elegant_banner(args.output)]
+
+
+def cmd_render_pdf(args, telemetry):
+    import asyncio
+    from bundle_html import bundle_for_render
+    from generate_ultimate import _render_pdf
+
+    pdf = args.pdf or Path(args.html).with_suffix('.pdf')
+    asyncio.run(_render_pdf(bundle_for_render(args.html, telemetry), pdf))
+    print(f"✅ PDF: {pdf}")
+    from pdf_postprocess import postprocess_pdf
+    from previews import eager_previews
+    postprocess_pdf(pdf, telemetry)
+    eager_previews(pdf, telemetry)
+    return 0, [pdf]
+
+
+def cmd_bundle(args, telemetry):
+    from bundle_html import bundle_html, print_report
+
+    bundles = []
+    for html in args.html:
+        bundle, report = bundle_html(html, offline=args.offline, force=args.force)
+        print_report(html, bundle, report)
+        bundles.append(bundle)
+    return 0, bundles
+
+
+def cmd_capture_logo(args, telemetry):
+    import asyncio
+    from capture_logo import capture_logo, print_report
+
+    sizes = [int(w) for w in args.sizes.split(',') if w.strip()]
+    reports = asyncio.run(capture_logo(sizes=sizes, fps=args.fps, seconds=args.seconds, fmt=args.format,
+                                       output_dir=args.output_dir, parallel=args.parallel, channel=args.channel,
+                                       telemetry=telemetry))
+    print_report(reports, args.fps)
+    return 0, [r['output'] for r in reports]
+
+
+def cmd_convert(args, telemetry):
+    from render_memos import convert_docx_to_pdf
+
+    pdf = args.pdf or Path(args.docx).with_suffix('.pdf')
+    convert_docx_to_pdf(args.docx, pdf)
+    print(f"✅ PDF: {pdf}")
+    from pdf_postprocess import postprocess_pdf
+    from previews import eager_previews
+    postprocess_pdf(pdf, telemetry)
+    eager_previews(pdf, telemetry)
+    return 0, [pdf]
+
+
+def cmd_optimize_pdf(args, telemetry):
+    from pdf_postprocess import describe, optimize_pdf
+
+    for pdf in args.pdfs:
+        report = optimize_pdf(pdf, linearize=args.linearize)
+        print(f"✅ {Path(pdf).name}: {describe(report)}")
+    return 0, args.pdfs
+
+
+def cmd_verify(args, telemetry):
+    from verify_docx import verify_docx
+
+    verify_docx(args.docx)
+    return 0, []
+
+
+def cmd_fonts(args, telemetry):
+    from font_embed import describe, embed_used_fonts, print_warm_report, warm_fonts
+
+    if args.warm or not args.docx:
+        print_warm_report(warm_fonts(telemetry=telemetry))
+    if args.docx:
+        from docx import Document
+    for path in args.docx:
+        doc = Document(path)
+        report = embed_used_fonts(doc)
+        partial = path.with_suffix(f'.{os.getpid()}.tmp.docx')
+        doc.save(partial)
+        os.replace(partial, path)
+        print(f"✅ {path.name}: {describe(report)}")
+    return 0, args.docx
+
+
+def cmd_visual(args, telemetry):
+    from visual_regression import approve_outputs, check_outputs, golden_dir, print_report
+
+    if args.approve:
+        manifests = approve_outputs(args.outputs, args.dpi)
+        for manifest in manifests:
+            print(f"✅ {manifest['source']}: {len(manifest['pages'])} golden pages → {golden_dir(manifest['source'])}")
+        return 0, [golden_dir(m['source']) for m in manifests]
+    reports = check_outputs(args.outputs, args.dpi, force=args.force, telemetry=telemetry)
+    failed = print_report(reports)
+    print(f"\n{'❌' if failed else '✅'} {len(reports) - failed}/{len(reports)} outputs match their goldens")
+    return (1 if failed else 0), []
+
+
+def cmd_extract(args, telemetry):
+    script = 'extract_docx.py' if Path(args.report).suffix.lower() == '.docx' else 'extract_pdf.py'
+    extractor = brand_paths.EXTRACTOR_DIR / script
+    if not extractor.exists():
+        print(f"❌ Extractor not found: {extractor} (set AHK_EXTRACTOR_DIR)")
+        return 1, []
+    # Separate interpreter: the extractor has its own telemetry module and ERIC_* settings
+    env = dict(os.environ, ERIC_RUN_ID=telemetry.run) if telemetry.enabled else None
+    result = subprocess.run([sys.executable, str(extractor), str(Path(args.report).resolve()), *args.extractor_args],
+                            cwd=extractor.parent, env=env)
+    return result.returncode, []
+
+
+# === COLD-START BUDGET ======================================================
+
+def command_imports(command):
+    """COMMAND_IMPORTS[command], plus pikepdf for PDF writers when post-processing is on"""
+    modules = COMMAND_IMPORTS[command]
+    if command in PDF_WRITERS and os.environ.get("AHK_PDF_OPTIMIZE") == "1":
+        modules += ('pikepdf',)
+    return modules
+
+
+PROBE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+sys.argv = ['brand.py']
+import brand
+missing = None
+for module in brand.command_imports(%r):
+    try:
+        importlib.import_module(module)
+    except ImportError as e:
+        missing = str(e)
+        break
+print(json.dumps({'elapsed_ms': (time.perf_counter() - start) * 1000, 'missing': missing}))
+"""
+
+
+def measure_cold_start(command, runs=3):
+    """Best of `runs` fresh interpreters importing the CLI plus the command's dependencies"""
+    reports = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', PROBE % command], cwd=Path(__file__).parent,
+                                capture_output=True, text=True, check=True)
+        reports.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return min(reports, key=lambda r: r['elapsed_ms'])
+
+
+def cmd_budget(args, telemetry):
+    commands = args.commands or list(COMMAND_IMPORTS)
+    unknown = [c for c in commands if c not in COMMAND_IMPORTS]
+    if unknown:
+        print(f"❌ Unknown command(s): {', '.join(unknown)}")
+        return 2, []
+
+    print(f"⏱️  Cold start per command (best of {args.runs} fresh interpreters)\n")
+    over, unmeasured = [], []
+    for command in commands:
+        with telemetry.stage('brand_cold_start', command=command) as stage:
+            report = measure_cold_start(command, args.runs)
+            budget = COLD_START_BUDGET_MS[command]
+            stage.update(elapsed_ms=round(report['elapsed_ms'], 1), budget_ms=budget, missing=report['missing'])
+        if report['missing']:
+            unmeasured.append(command)
+            print(f"{'⏭️ ' if args.skip_missing else '⚠️ '} {command:<18} not measured: {report['missing']}")
+            continue
+        if report['elapsed_ms'] > budget:
+            over.append(command)
+        print(f"{'❌' if command in over else '✅'} {command:<18} {report['elapsed_ms']:7.1f} ms  (budget {budget} ms)")
+
+    measured = len(commands) - len(unmeasured)
+    print(f"\n📏 Measured {measured}/{len(commands)} commands")
+    if over:
+        print(f"❌ Over budget: {', '.join(over)}")
+    if unmeasured:
+        print(f"{'⏭️  Skipped' if args.skip_missing else '❌ Not measured'} (dependency missing): {', '.join(unmeasured)}")
+    failed = over or (unmeasured and not args.skip_missing)
+    if not failed:
+        print(f"✅ All {measured} measured commands within budget")
+    return (1 if failed else 0), []
+
+
+# === CLI ====================================================================
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='brand.py', description="AHKStrategies brand asset tools")
+    parser.add_argument('--telemetry', nargs='?', const='1', metavar='PATH',
+                        help="Append JSONL stage events to PATH ('-' = stdout, default: Reports/pipeline_telemetry.jsonl)")
+    parser.add_argument('--quiet', action='store_true', help="Suppress the console banners")
+    commands = parser.add_subparsers(dest='command', required=True, metavar='COMMAND')
+
+    generate = commands.add_parser('generate', help="Build a letterhead DOCX (legendary: HTML → PDF + DOCX)")
+    generate.add_argument('kind', choices=list(GENERATORS))
+    generate.add_argument('--output', type=Path, help="Output DOCX (default: next to the scripts)")
+    generate.set_defaults(handler=cmd_generate)
+
+    remove_bg = commands.add_parser('remove-bg', help="Make the banner's light background transparent")
+    remove_bg.add_argument('input', nargs='?', type=Path, default=brand_paths.BANNER_SOURCE)
+    remove_bg.add_argument('output', nargs='?', type=Path, default=brand_paths.BANNER_TRANSPARENT)
+    remove_bg.set_defaults(handler=cmd_remove_bg)
+
+    banner = commands.add_parser('banner', help="Draw the transparent brain-circuit banner")
+    banner.add_argument('--output', type=Path, default=brand_paths.BANNER_MASTERPIECE)
+    banner.set_defaults(handler=cmd_banner)
+
+    render_pdf = commands.add_parser('render-pdf', help="Print an HTML letterhead to PDF with Chromium")
+    render_pdf.add_argument('html', nargs='?', type=Path, default=brand_paths.LEGENDARY_HTML)
+    render_pdf.add_argument('pdf', nargs='?', type=Path)
+    render_pdf.set_defaults(handler=cmd_render_pdf)
+
+    bundle = commands.add_parser('bundle', help="Inline subsetted fonts, images and CSS into one HTML file")
+    bundle.add_argument('html', nargs='+', type=Path, metavar='HTML')
+    bundle.add_argument('--offline', action='store_true', help="Read remote fonts/CSS only from the font cache")
+    bundle.add_argument('--force', action='store_true', help="Rebuild even when the source is unchanged")
+    bundle.set_defaults(handler=cmd_bundle)
+
+    capture = commands.add_parser('capture-logo', help="Record the animated logo to WebP/MP4 via screencast")
+    capture.add_argument('--sizes', default='320', help="Comma-separated output widths")
+    capture.add_argument('--fps', type=int, default=30)
+    capture.add_argument('--seconds', type=float, default=3.0)
+    capture.add_argument('--format', choices=['webp', 'mp4'], default='webp')
+    capture.add_argument('--parallel', action='store_true', help="Capture all sizes at once, one page each")
+    capture.add_argument('--channel', help="Browser channel, e.g. chrome (needed for the MP4 logo to play)")
+    capture.add_argument('--output-dir', type=Path, default=brand_paths.ANIMATED_LOGO_DIR)
+    capture.set_defaults(handler=cmd_capture_logo)
+
+    convert = commands.add_parser('convert', help="DOCX → PDF (Word via docx2pdf, else LibreOffice)")
+    convert.add_argument('docx', type=Path)
+    convert.add_argument('pdf', nargs='?', type=Path)
+    convert.set_defaults(handler=cmd_convert)
+
+    optimize = commands.add_parser('optimize-pdf', help="Dedupe resources, recompress and linearise PDFs in place")
+    optimize.add_argument('pdfs', nargs='+', type=Path, metavar='PDF')
+    optimize.add_argument('--no-linearize', dest='linearize', action='store_false', help="Skip fast web view")
+    optimize.set_defaults(handler=cmd_optimize_pdf)
+
+    verify = commands.add_parser('verify', help="Print a DOCX's sections, first paragraphs and footer")
+    verify.add_argument('docx', nargs='?', type=Path, default=brand_paths.LEGENDARY_DOCX)
+    verify.set_defaults(handler=cmd_verify)
+
+    fonts = commands.add_parser('fonts', help="Embed subsetted brand fonts into DOCX files / warm the font caches")
+    fonts.add_argument('docx', nargs='*', type=Path, metavar='DOCX')
+    fonts.add_argument('--warm', action='store_true', help="Refresh fontconfig and the subset cache (default without DOCX)")
+    fonts.set_defaults(handler=cmd_fonts)
+
+    visual = commands.add_parser('visual', help="Check the letterhead editions against approved page renders")
+    visual.add_argument('outputs', nargs='*', type=Path, metavar='OUTPUT', help="Default: every edition that exists")
+    visual.add_argument('--approve', action='store_true', help="Store the current renders as the goldens")
+    visual.add_argument('--force', action='store_true', help="Render even when the source signature is unchanged")
+    visual.add_argument('--dpi', type=int, default=96)
+    visual.set_defaults(handler=cmd_visual)
+
+    extract = commands.add_parser('extract', help="Extract a PDF/DOCX report with the ERIC extractor")
+    extract.add_argument('report', type=Path)
+    extract.add_argument('extractor_args', nargs=argparse.REMAINDER, help="Passed through, e.g. --pages 1-20")
+    extract.set_defaults(handler=cmd_extract)
+
+    budget = commands.add_parser('budget', help="Measure each command's cold start against its budget")
+    budget.add_argument('commands', nargs='*', metavar='COMMAND')
+    budget.add_argument('--runs', type=int, default=3)
+    budget.add_argument('--skip-missing', action='store_true',
+                        help="Leave out commands whose dependencies are not installed instead of failing")
+    budget.set_defaults(handler=cmd_budget)
+    return parser
+
+
+def main(argv=None):
+    started = time.perf_counter()
+    args = build_parser().parse_args(argv)
+    telemetry = Telemetry.from_env('AHK', args.telemetry, args.quiet)
+    try:
+        with telemetry.console(), telemetry.stage(f"brand_{args.command.replace('-', '_')}") as stage:
+            stage.update(cli_ms=round((time.perf_counter() - started) * 1000, 2))
+            code, outputs = args.handler(args, telemetry)
+            stage.add_output(*[o for o in outputs if o and Path(o).exists()])
+            stage.update(exit_code=code)
+    except (OSError, RuntimeError, ValueError) as e:  # Missing files or converters: no traceback
+        print(f"❌ {type(e).__name__}: {e}", file=sys.stderr)
+        return 1
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
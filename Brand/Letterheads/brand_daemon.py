@@ -0,0 +1,511 @@
+"""
+AHKStrategies Brand Generation Daemon
+Long-running service that keeps python-docx, the compiled memo letterhead, the
+brand fonts (fontconfig and the subset cache, see font_embed.py) and (when
+Playwright is installed) a Chromium instance warm, so server/index.js gets
+branded documents without paying a cold Python start per request
+
+Jobs run on a fixed pool of worker threads fed by a bounded queue. When the
+queue is full a request is refused at once (503 + Retry-After) instead of
+piling up behind slow conversions.
+
+Endpoints (JSON in, JSON out):
+    POST /generate  {"markdown": "..."} | {"memo": ID}, "title"?, "subject"?, "pdf"?  → {"docx", "pdf"?, "hash"?, "previews"?}
+    POST /convert   {"docx": REF} | {"html": REF}                                   → {"pdf", "previews"}
+    POST /verify    {"docx": REF}                                                   → {"sections", "paragraphs", "footer", ...}
+    GET  /health
+    GET  /stats     queue depth, counts and p50/p95/p99 latency (queue wait + service) per endpoint
+
+Requests never name arbitrary server paths: ID is a memo file name under
+AHK_MEMOS_DIR, REF an artifact hash (with --registry) or a file inside the
+output directory, LETTERHEADS_DIR or the artifact store. Every reference is
+resolved (symlinks included) and refused outside those roots, and outputs
+are always written to the output directory.
+
+Every PDF gets its preview images built before the response (previews.py);
+server/routes/brand.js serves them from the cache without calling the daemon.
+
+Usage:
+    python brand_daemon.py [--host 127.0.0.1] [--port 8765] [--socket PATH] [--workers N] [--queue N]
+                           [--browser] [--registry [DB]] [--telemetry [PATH|-]] [--quiet]
+"""
+
+import json
+import os
+import queue
+import re
+import signal
+import socketserver
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from brand_paths import LETTERHEADS_DIR
+from telemetry import DISABLED, Telemetry
+
+HOST = os.environ.get("AHK_BRAND_HOST", "127.0.0.1")
+PORT = int(os.environ.get("AHK_BRAND_PORT", "8765"))
+SOCKET_PATH = os.environ.get("AHK_BRAND_SOCKET")
+WORKERS = 2
+QUEUE_SIZE = 32
+JOB_TIMEOUT = 120            # Seconds a request waits for its job before 504
+MAX_BODY_BYTES = 16 << 20
+LATENCY_WINDOW = 2048        # Most recent jobs per endpoint used for percentiles
+ACTIONS = ('generate', 'convert', 'verify')
+ARTIFACT_HASH = re.compile(r'^[0-9a-f]{64}$')
+
+
+class LatencyStats:
+    """Rolling latency window and counters for one endpoint"""
+
+    def __init__(self):
+        self.total = deque(maxlen=LATENCY_WINDOW)
+        self.wait = deque(maxlen=LATENCY_WINDOW)
+        self.ok = 0
+        self.errors = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def record(self, wait_ms, total_ms, ok):
+        with self._lock:
+            self.wait.append(wait_ms)
+            self.total.append(total_ms)
+            if ok:
+                self.ok += 1
+            else:
+                self.errors += 1
+
+    def reject(self):
+        with self._lock:
+            self.rejected += 1
+
+    def snapshot(self):
+        with self._lock:
+            total, wait = sorted(self.total), sorted(self.wait)
+        return {'ok': self.ok, 'errors': self.errors, 'rejected': self.rejected, 'window': len(total),
+                **{f'p{p}_ms': percentile(total, p) for p in (50, 95, 99)},
+                'p95_queue_ms': percentile(wait, 95)}
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of an already sorted list (None when empty)"""
+    if not values:
+        return None
+    return round(values[min(len(values) - 1, max(0, int(round(p / 100 * len(values) + 0.5)) - 1))], 2)
+
+
+class Job:
+    def __init__(self, action, payload):
+        self.action = action
+        self.payload = payload
+        self.enqueued = time.perf_counter()
+        self.started = None
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class BrowserRenderer:
+    """One Chromium kept open on a private event loop thread; each job gets a fresh page"""
+
+    def __init__(self):
+        import asyncio
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='chromium', daemon=True)
+        self._thread.start()
+        self._playwright = None
+        self._browser = None
+
+    def _run(self, coroutine):
+        import asyncio
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(JOB_TIMEOUT)
+
+    async def _start(self):
+        if self._browser is None:
+            from playwright.async_api import async_playwright
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch()
+
+    async def _render(self, html_path, pdf_path):
+        await self._start()
+        page = await self._browser.new_page()
+        try:
+            from bundle_html import load_for_print
+            await load_for_print(page, html_path)  # Fonts decoded, entrance animations finished
+            await page.pdf(path=str(pdf_path), format='A4', print_background=True, prefer_css_page_size=True,
+                           margin={'top': '0mm', 'right': '0mm', 'bottom': '0mm', 'left': '0mm'})
+        finally:
+            await page.close()
+
+    def warm(self):
+        self._run(self._start())
+
+    def render(self, html_path, pdf_path):
+        self._run(self._render(html_path, pdf_path))
+        return pdf_path
+
+    def close(self):
+        async def stop():
+            if self._browser:
+                await self._browser.close()
+                await self._playwright.stop()
+        try:
+            self._run(stop())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+class BrandService:
+    """Warm state plus the bounded job queue shared by every connection"""
+
+    def __init__(self, workers=WORKERS, queue_size=QUEUE_SIZE, output_dir=None, registry_db=None, browser=False,
+                 telemetry=DISABLED):
+        import render_memos
+
+        self.render_memos = render_memos
+        self.output_dir = Path(output_dir or render_memos.OUTPUT_DIR)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.registry_db = registry_db
+        self.jobs = queue.Queue(maxsize=queue_size)
+        self.stats = {action: LatencyStats() for action in ACTIONS}
+        self.started_at = time.time()
+        self.telemetry = telemetry
+        self._local = threading.local()
+        self._browser = None
+        self._browser_lock = threading.Lock()
+
+        started = time.perf_counter()
+        render_memos.letterhead_template()  # Imports python-docx and compiles the letterhead once
+        from font_embed import embedding_enabled, warm_fonts
+        self.fonts = warm_fonts(telemetry=telemetry) if embedding_enabled() else None  # fontconfig + subset cache
+        if browser:
+            self.browser().warm()
+        self.warmup_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        self._workers = [threading.Thread(target=self._work, name=f'brand-worker-{i}', daemon=True)
+                         for i in range(workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, action, payload):
+        """Queue a job; raises queue.Full when the service is saturated"""
+        job = Job(action, payload)
+        try:
+            self.jobs.put_nowait(job)
+        except queue.Full:
+            self.stats[action].reject()
+            raise
+        return job
+
+    def _work(self):
+        # Memory-trace stage stacks are per thread
+        telemetry = self._local.telemetry = Telemetry(**self.telemetry.settings())
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            job.started = time.perf_counter()
+            try:
+                with telemetry.stage(f'daemon_{job.action}',
+                                          queue_ms=round((job.started - job.enqueued) * 1000, 2)):
+                    job.result = getattr(self, f'do_{job.action}')(job.payload)
+            except Exception as e:
+                job.error = e
+            finally:
+                finished = time.perf_counter()
+                self.stats[job.action].record((job.started - job.enqueued) * 1000,
+                                              (finished - job.enqueued) * 1000, job.error is None)
+                job.done.set()
+
+    def registry(self):
+        """Per-thread ArtifactRegistry (SQLite connections stay on the thread that opened them)"""
+        if not self.registry_db:
+            return None
+        if getattr(self._local, 'registry', None) is None:
+            from artifact_registry import ArtifactRegistry
+            self._local.registry = ArtifactRegistry(self.registry_db)
+        return self._local.registry
+
+    def browser(self):
+        with self._browser_lock:
+            if self._browser is None:
+                self._browser = BrowserRenderer()
+            return self._browser
+
+    def document_roots(self):
+        """Directories a client reference may resolve into"""
+        roots = [self.output_dir, LETTERHEADS_DIR]
+        if self.registry_db:
+            from artifact_registry import ARTIFACT_ROOT
+            roots.append(ARTIFACT_ROOT)
+        return roots
+
+    def resolve(self, ref, suffixes):
+        """A client document reference (artifact hash or file in document_roots()) → an existing path"""
+        if not isinstance(ref, str) or not ref:
+            raise ValueError("Document reference must be a non-empty string")
+        if ARTIFACT_HASH.match(ref) and self.registry():
+            path = self.registry().path_for(ref)
+            if path is None:
+                raise FileNotFoundError(f"No artifact {ref}")
+            return confined(path, [path.parent], suffixes)
+        return confined(ref, self.document_roots(), suffixes)
+
+    # === ACTIONS ============================================================
+
+    def do_generate(self, payload):
+        if 'markdown' in payload:
+            title, blocks = self.render_memos.split_title(self.render_memos.parse_markdown(payload['markdown']), 'Memo')
+            title = payload.get('title') or title
+        elif 'memo' in payload:
+            memo = confined(payload['memo'], [self.render_memos.MEMOS_DIR], self.render_memos.MEMO_SUFFIXES)
+            title, blocks = self.render_memos.load_memo(memo)
+            title = payload.get('title') or title
+        else:
+            raise ValueError("generate needs 'markdown' or 'memo'")
+
+        # The subject names the output file, so it is always reduced to a safe file-name stem
+        subject = re.sub(r'[^A-Za-z0-9]+', '_', str(payload.get('subject') or title)).strip('_')[:80] or 'memo'
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        docx_path = self.output_dir / f"{subject}_{stamp}.docx"
+        self.render_memos.build_memo_docx(title, blocks, payload.get('subtitle')).save(docx_path)
+        outputs = [docx_path]
+        extra = {}
+        if payload.get('pdf'):
+            outputs.append(self.render_memos.convert_docx_to_pdf(docx_path, docx_path.with_suffix('.pdf')))
+            extra = self.previews(outputs[1])
+
+        registry = self.registry()
+        if registry:
+            records = [registry.store(path, self.render_memos.TEMPLATE_NAME, self.render_memos.TEMPLATE_VERSION,
+                                      subject=subject, name=Path(path).name.replace(f'_{stamp}', ''), move=True)
+                       for path in outputs]
+            result = {'docx': records[0]['path'], 'hash': records[0]['hash'], 'deduped': records[0]['deduped']}
+            if len(records) > 1:
+                result['pdf'] = records[1]['path']
+            return {**result, **extra}
+        result = {'docx': str(docx_path)}
+        if len(outputs) > 1:
+            result['pdf'] = str(outputs[1])
+        return {**result, **extra}
+
+    def do_convert(self, payload):
+        if 'html' in payload:
+            html_path = self.resolve(payload['html'], ('.html', '.htm'))
+            pdf_path = self.output_dir / f"{html_path.stem}.pdf"
+            from bundle_html import bundle_for_render
+            render_html = bundle_for_render(html_path, self._local.telemetry)
+            return {'pdf': str(self.browser().render(render_html, pdf_path)), **self.previews(pdf_path)}
+        if 'docx' in payload:
+            docx_path = self.resolve(payload['docx'], ('.docx',))
+            pdf_path = self.output_dir / f"{docx_path.stem}.pdf"
+            self.render_memos.convert_docx_to_pdf(docx_path, pdf_path)
+            return {'pdf': str(pdf_path), **self.previews(pdf_path)}
+        raise ValueError("convert needs 'docx' or 'html'")
+
+    def previews(self, pdf_path):
+        """{'previews': {...}} for a result, so the dashboard can show the PDF straight away
+
+        AHK_PDF_OPTIMIZE=1 post-processes the PDF first, so the previews hash the final bytes.
+        """
+        from pdf_postprocess import postprocess_pdf
+        from previews import eager_previews
+
+        postprocess_pdf(pdf_path, self._local.telemetry)
+        manifest = eager_previews(pdf_path, self._local.telemetry)
+        if not manifest:
+            return {}
+        return {'previews': {'hash': manifest['hash'], 'format': manifest['format'],
+                             'images': [{k: image[k] for k in ('page', 'width', 'height', 'file')}
+                                        for image in manifest['images']]}}
+
+    def do_verify(self, payload):
+        if 'docx' not in payload:
+            raise ValueError("verify needs 'docx'")
+        from verify_docx import summarize_docx
+        return summarize_docx(self.resolve(payload['docx'], ('.docx',)))
+
+    def snapshot(self):
+        return {
+            'uptime_s': round(time.time() - self.started_at, 1),
+            'warmup_ms': self.warmup_ms,
+            'workers': len(self._workers),
+            'queue': {'depth': self.jobs.qsize(), 'capacity': self.jobs.maxsize},
+            'browser': self._browser is not None,
+            'fonts': self.fonts and {k: self.fonts[k] for k in ('found', 'missing', 'subsets', 'ms')},
+            'endpoints': {action: stats.snapshot() for action, stats in self.stats.items()},
+        }
+
+    def close(self):
+        for _ in self._workers:
+            self.jobs.put(None)
+        if self._browser:
+            self._browser.close()
+
+
+def confined(ref, roots, suffixes):
+    """Resolve ref (relative to a root, or absolute) to an existing file inside one of roots
+
+    Symlinks and '..' are resolved before the check, so nothing outside the
+    roots can be read or used as a source; the error never says whether such
+    a file exists.
+    """
+    if not isinstance(ref, (str, os.PathLike)) or not str(ref):
+        raise ValueError("File reference must be a non-empty string")
+    for root in roots:
+        root = Path(root).resolve()
+        candidate = (root / ref).resolve()
+        if candidate.is_relative_to(root) and candidate.is_file():
+            if candidate.suffix.lower() not in suffixes:
+                raise ValueError(f"Expected a {'/'.join(suffixes)} file, got {candidate.name}")
+            return candidate
+    raise FileNotFoundError(f"No such file in the brand directories: {ref}")
+
+
+class BrandRequestHandler(BaseHTTPRequestHandler):
+    server_version = 'AHKBrandDaemon/1.0'
+    protocol_version = 'HTTP/1.1'  # Keep-alive: the Node proxy reuses its connection
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send(200, {'ok': True, 'queue': self.service.jobs.qsize()})
+        elif self.path == '/stats':
+            self._send(200, self.service.snapshot())
+        else:
+            self._send(404, {'error': f"Unknown endpoint {self.path}"})
+
+    def do_POST(self):
+        action = self.path.strip('/')
+        if action not in ACTIONS:
+            self._send(404, {'error': f"Unknown endpoint {self.path}"})
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            self._send(413, {'error': f"Body larger than {MAX_BODY_BYTES} bytes"})
+            return
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except json.JSONDecodeError as e:
+            self._send(400, {'error': f"Invalid JSON: {e}"})
+            return
+
+        try:
+            job = self.service.submit(action, payload)
+        except queue.Full:
+            self._send(503, {'error': 'Brand daemon is at capacity, retry shortly'}, {'Retry-After': '1'})
+            return
+        if not job.done.wait(JOB_TIMEOUT):
+            self._send(504, {'error': f"Job did not finish within {JOB_TIMEOUT}s"})
+            return
+        if job.error is not None:
+            status = 400 if isinstance(job.error, (ValueError, FileNotFoundError, KeyError)) else 500
+            self._send(status, {'error': f"{type(job.error).__name__}: {job.error}"})
+            return
+        elapsed = (time.perf_counter() - job.enqueued) * 1000
+        self._send(200, {**job.result, 'ms': round(elapsed, 2)})
+
+    def _send(self, status, body, headers=None):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self):
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)  # Stale socket from a previous run
+        super().server_bind()
+        self.server_name, self.server_port = 'localhost', 0
+
+
+def make_server(service, host=HOST, port=PORT, socket_path=None, verbose=False):
+    if socket_path:
+        server = UnixHTTPServer(socket_path, BrandRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), BrandRequestHandler)
+        server.daemon_threads = True
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="AHKStrategies warm brand generation daemon")
+    parser.add_argument('--host', default=HOST, help="TCP bind address (default: localhost only)")
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--socket', default=SOCKET_PATH, help="Serve on this Unix socket instead of TCP")
+    parser.add_argument('--workers', type=int, default=WORKERS, help="Job worker threads")
+    parser.add_argument('--queue', type=int, default=QUEUE_SIZE, help="Queued jobs before requests get 503")
+    parser.add_argument('--output', type=Path, help="Directory for generated documents")
+    parser.add_argument('--browser', action='store_true', help="Launch Chromium at start-up instead of on first HTML job")
+    parser.add_argument('--registry', nargs='?', const='default', metavar='DB',
+                        help="Store generated documents in the artifact registry (optionally at DB)")
+    parser.add_argument('--verbose', action='store_true', help="Log every request")
+    parser.add_argument('--telemetry', nargs='?', const='1', metavar='PATH',
+                        help="Append JSONL stage events to PATH ('-' = stdout, default: Reports/pipeline_telemetry.jsonl)")
+    parser.add_argument('--quiet', action='store_true', help="Suppress the console banners")
+    args = parser.parse_args(argv)
+
+    registry_db = None
+    if args.registry:
+        from artifact_registry import REGISTRY_DB
+        registry_db = REGISTRY_DB if args.registry == 'default' else Path(args.registry)
+
+    telemetry = Telemetry.from_env('AHK', args.telemetry, args.quiet)
+    with telemetry.console():
+        service = BrandService(args.workers, args.queue, args.output, registry_db, args.browser, telemetry)
+        server = make_server(service, args.host, args.port, args.socket, args.verbose)
+        where = args.socket or f"http://{args.host}:{args.port}"
+        print("=" * 70)
+        print("🔥 AHK BRAND DAEMON - WARM AND READY")
+        print("=" * 70)
+        print(f"📡 Listening: {where}")
+        print(f"⚡ Warm-up: {service.warmup_ms} ms  |  👷 Workers: {args.workers}  |  📥 Queue: {args.queue}")
+        if service.fonts:
+            from font_embed import print_warm_report
+            print_warm_report(service.fonts)
+        print("=" * 70, flush=True)
+
+        def stop(*_):
+            threading.Thread(target=server.shutdown, daemon=True).start()
+        signal.signal(signal.SIGTERM, stop)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            service.close()
+            if args.socket and os.path.exists(args.socket):
+                os.unlink(args.socket)
+        print("🛑 Brand daemon stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""
+AHKStrategies Brand Asset Locations
+Every input and output path the Brand/Letterheads scripts use, in one place and
+overridable from the environment instead of hard-coded C:\\Users\\... strings
+
+    AHK_LETTERHEADS_DIR   where letterheads, banners and the LEGENDARY HTML live (default: this folder)
+    AHK_BRAND_DIR         brand source assets, e.g. banner_cropped.png (default: Brand/)
+    AHK_LOGO              logo embedded by create_letterhead.py
+    AHK_EXTRACTOR_DIR     the ERIC PDF/DOCX extractor used by `brand.py extract`
+    AHK_PREVIEW_DIR       content-hash cache of PDF preview images (see previews.py)
+    AHK_MEDIA_CACHE       losslessly recompressed brand images embedded in DOCX files (see media_cache.py)
+    AHK_FONT_CACHE        web fonts and stylesheets fetched by bundle_html.py (copy it to air-gapped nodes)
+    AHK_LOGO_VIDEO        the 3D animated logo the AnimatedLogo letterhead plays (see capture_logo.py)
+    AHK_FONT_DIRS         extra folders (os.pathsep-separated) searched for brand TTF/OTF files before fontconfig
+    AHK_FONT_SUBSETS      font subsets embedded in generated DOCX files, by font and glyph set (see font_embed.py)
+    AHK_GOLDEN_DIR        approved page renders the visual regression check compares against (see visual_regression.py)
+
+Standard library only: brand.py imports this before any subcommand runs.
+"""
+
+import os
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+REPO_ROOT = HERE.parents[1]
+
+LETTERHEADS_DIR = Path(os.environ.get("AHK_LETTERHEADS_DIR", HERE))
+BRAND_DIR = Path(os.environ.get("AHK_BRAND_DIR", HERE.parent))
+LOGO_PATH = Path(os.environ.get(
+    "AHK_LOGO", Path.home() / "OneDrive" / "Desktop" / "AHK Profile" / "AHK-Digital-ID-Kit" / "ahkstrategies-logo.png"))
+EXTRACTOR_DIR = Path(os.environ.get(
+    "AHK_EXTRACTOR_DIR", REPO_ROOT / ".archive" / "Emma_KnowledgeBase_OLD_20251106" / "Research" / "MENA_Horizon_2030"))
+PREVIEW_DIR = Path(os.environ.get("AHK_PREVIEW_DIR", LETTERHEADS_DIR / "Previews"))
+MEDIA_CACHE_DIR = Path(os.environ.get("AHK_MEDIA_CACHE", LETTERHEADS_DIR / "MediaCache"))
+FONT_CACHE_DIR = Path(os.environ.get("AHK_FONT_CACHE", BRAND_DIR / "Fonts" / "cache"))
+FONTS_DIR = BRAND_DIR / "Fonts"
+FONT_DIRS = [FONTS_DIR] + [Path(p) for p in os.environ.get("AHK_FONT_DIRS", "").split(os.pathsep) if p]
+FONT_SUBSET_DIR = Path(os.environ.get("AHK_FONT_SUBSETS", LETTERHEADS_DIR / "FontSubsets"))
+GOLDEN_DIR = Path(os.environ.get("AHK_GOLDEN_DIR", LETTERHEADS_DIR / "Goldens"))
+LOGO_VIDEO = Path(os.environ.get("AHK_LOGO_VIDEO", REPO_ROOT / "public" / "assets" / "3D-animated-logo.mp4"))
+
+BANNER_SOURCE = BRAND_DIR / "banner_cropped.png"
+BANNER_TRANSPARENT = LETTERHEADS_DIR / "banner_transparent.png"
+BANNER_MASTERPIECE = LETTERHEADS_DIR / "banner_masterpiece.png"
+ANIMATED_LOGO_HTML = LETTERHEADS_DIR / "AHKStrategies_Letterhead_AnimatedLogo.html"
+ANIMATED_LOGO_DIR = LETTERHEADS_DIR / "AnimatedLogo"
+VISUAL_DIFF_DIR = LETTERHEADS_DIR / "VisualDiffs"
+LEGENDARY_HTML = LETTERHEADS_DIR / "letterhead_legendary.html"
+LEGENDARY_PDF = LETTERHEADS_DIR / "AHKStrategies_Letterhead_LEGENDARY.pdf"
+LEGENDARY_DOCX = LETTERHEADS_DIR / "AHKStrategies_Letterhead_LEGENDARY.docx"
+LETTERHEAD_DOCX = LETTERHEADS_DIR / "AHKStrategies_Letterhead_v1.docx"
+MASTER_DOCX = LETTERHEADS_DIR / "AHKStrategies_Letterhead_Master_v1.docx"
+MASTERPIECE_DOCX = LETTERHEADS_DIR / "AHKStrategies_Letterhead_MASTERPIECE.docx"
@@ -0,0 +1,585 @@
+"""
+AHKStrategies HTML Bundler
+Turns a letterhead HTML page into one self-contained file: web fonts subsetted
+to the characters the page uses and embedded as data: URIs, images and
+stylesheets inlined, CSS and markup minified. Chromium renders the bundle with
+no network and no side-file reads, so the fixed 3 s font wait goes away and
+renders are the same on air-gapped nodes.
+
+Remote stylesheets and fonts (fonts.googleapis.com / fonts.gstatic.com) are
+fetched once into the font cache (AHK_FONT_CACHE, default Brand/Fonts/cache);
+with --offline, or on a node without network, only that cache is read, so a
+cache copied from a connected machine is enough. References that cannot be
+resolved (e.g. C:\\Users\\... images) are left as they are and reported.
+
+The bundle carries <meta name="ahk-bundle" content="<key>">, a hash of the
+source HTML, the bytes of every stylesheet, font and image it resolved, and the
+bundling options; the refs behind it sit in <name>.bundle.json. It is rebuilt
+when any of them changes (or with --force), and renderers use the marker to
+skip network waits. A bundle that still links a remote stylesheet or font it
+could not fetch gets no marker: it is not complete, so it is never reused or
+treated as network-free.
+
+    bundle, report = bundle_html("AHKStrategies_Letterhead_PrintEdition.html")
+
+Usage:
+    python bundle_html.py HTML [HTML ...] [--output PATH] [--offline] [--no-minify] [--force]
+"""
+
+import base64
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import sys
+import time
+from html import unescape
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import unquote, urljoin, urlparse
+
+from brand_paths import FONT_CACHE_DIR
+from telemetry import DISABLED, Telemetry
+
+BUNDLE_META = 'ahk-bundle'
+BUNDLE_SUFFIX = '.bundle.html'
+BUNDLE_FORMAT = 2  # Bump when the bundler's output changes, so existing bundles are rebuilt
+MAX_INLINE_BYTES = int(os.environ.get("AHK_BUNDLE_MAX_INLINE", 4 * 1024 * 1024))  # Larger assets (videos) stay linked
+FETCH_TIMEOUT = 20
+# Without a browser User-Agent, Google Fonts serves plain TrueType, which subsets best
+FETCH_HEADERS = {'User-Agent': 'ahk-bundle/1.0'}
+FONT_MIME = {'woff2': 'font/woff2', 'woff': 'font/woff', 'ttf': 'font/ttf', 'otf': 'font/otf'}
+
+# Inter-tag whitespace next to these tags never renders, so it is dropped entirely
+BLOCK_TAGS = frozenset((
+    'html head body title meta link style script base div p header footer section article aside nav main '
+    'h1 h2 h3 h4 h5 h6 ul ol li table thead tbody tfoot tr td th figure figcaption blockquote hr br form '
+    'video source picture').split())
+PRESERVE_TAGS = ('pre', 'textarea', 'script', 'style')
+# Word's round-trip side files (AHKStrategies_Letterhead_WordEdition_files/): browsers never need them
+DROP_LINK_RELS = frozenset(('preconnect', 'dns-prefetch', 'preload', 'prefetch', 'file-list', 'edit-time-data',
+                            'themedata', 'colorschememapping'))
+
+_LINK = re.compile(r'<link\b[^>]*>', re.I)
+_ATTR = re.compile(r'''([\w:-]+)\s*=\s*("[^"]*"|'[^']*'|[^\s>]+)''')
+_STYLE_BLOCK = re.compile(r'(<style\b[^>]*>)(.*?)(</style\s*>)', re.I | re.S)
+_SRC_ATTR = re.compile(r'''(<(?:img|source|video|input)\b[^>]*?\s(?:src|poster)\s*=\s*)("[^"]*"|'[^']*')''', re.I)
+_STYLE_ATTR = re.compile(r'''(\sstyle\s*=\s*)("[^"]*"|'[^']*')''', re.I)
+_CHARSET = re.compile(r'''(<meta\b[^>]*?charset\s*=\s*["']?)([\w-]+)''', re.I)
+_HEAD = re.compile(r'<head\b[^>]*>', re.I)
+_META = re.compile(r'<meta\s+name="%s"\s+content="([0-9a-f]{64})"' % BUNDLE_META)
+_CSS_IMPORT = re.compile(r'''@import\s+(?:url\(\s*)?["']?([^"')\s;]+)["']?\s*\)?[^;]*;''', re.I)
+_CSS_URL = re.compile(r'''url\(\s*(["']?)([^"')]+)\1\s*\)''', re.I)
+_FONT_FACE = re.compile(r'@font-face\s*{[^}]*}', re.I)
+_CSS_CONTENT = re.compile(r'''content\s*:\s*(["'])(.*?)\1''', re.I | re.S)
+_CSS_STRING = re.compile(r'''("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')''')
+
+
+# === RESOURCES ==============================================================
+
+def fetch(url, offline=False):
+    """Bytes of a remote resource through the font cache"""
+    cached = Path(FONT_CACHE_DIR) / hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+    if cached.exists():
+        return cached.read_bytes()
+    if offline:
+        raise RuntimeError(f"{url} is not in the font cache ({FONT_CACHE_DIR}) and --offline is set")
+    from urllib.request import Request, urlopen
+
+    with urlopen(Request(url, headers=FETCH_HEADERS), timeout=FETCH_TIMEOUT) as response:
+        data = response.read()
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    partial = cached.with_suffix(f'.{os.getpid()}.tmp')
+    partial.write_bytes(data)
+    os.replace(partial, cached)
+    return data
+
+
+def resolve(ref, base, offline=False):
+    """(bytes, absolute reference) for a URL or path relative to base; (None, ref) when unavailable"""
+    ref = unescape(ref.strip())
+    if not ref or ref.startswith(('data:', '#', 'about:', 'javascript:')):
+        return None, ref
+    if re.match(r'^[A-Za-z]:[\\/]', ref):  # Windows path from the design machine
+        return None, ref
+    absolute = urljoin(base, ref)
+    parsed = urlparse(absolute)
+    if parsed.scheme in ('http', 'https'):
+        try:
+            return fetch(absolute, offline), absolute
+        except (OSError, RuntimeError):
+            return None, absolute
+    path = Path(unquote(parsed.path)) if parsed.scheme == 'file' else Path(ref)
+    return (path.read_bytes(), absolute) if path.is_file() else (None, absolute)
+
+
+def _resolve(ref, base, report, offline=False):
+    """resolve(), recording the digest of every input the bundle is built from in report['inputs']
+
+    Remote references that could not be fetched go to report['remote_missing'].
+    """
+    data, absolute = resolve(ref, base, offline)
+    if data is not None:
+        report['inputs'][absolute] = hashlib.sha256(data).hexdigest()
+    elif urlparse(absolute).scheme in ('http', 'https'):
+        report['remote_missing'].append(absolute)
+    return data, absolute
+
+
+def data_uri(data, ref, mime=None):
+    mime = mime or mimetypes.guess_type(urlparse(ref).path)[0] or 'application/octet-stream'
+    return f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+# === GLYPHS =================================================================
+
+class _TextCollector(HTMLParser):
+    """Every character the page can render as text"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.chars = set()
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('script', 'style'):
+            self._skip += 1
+        for name, value in attrs:
+            if name in ('value', 'placeholder') and value:
+                self.chars.update(value)
+
+    def handle_endtag(self, tag):
+        if tag in ('script', 'style') and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.chars.update(data)
+
+
+def used_characters(html, stylesheets):
+    """Characters in the text and in CSS content: strings, in both cases (text-transform)"""
+    collector = _TextCollector()
+    collector.feed(html)
+    chars = set(collector.chars)
+    for css in stylesheets:
+        for _, text in _CSS_CONTENT.findall(css):
+            chars.update(re.sub(r'\\([0-9a-fA-F]{1,6})\s?', lambda m: chr(int(m.group(1), 16)), text))
+    chars |= {c.upper() for c in chars} | {c.lower() for c in chars}
+    chars.add(' ')
+    return {c for c in chars if c.isprintable() or c == '\u00a0'}
+
+
+def _in_unicode_range(block, chars):
+    """A @font-face without unicode-range covers everything"""
+    match = re.search(r'unicode-range\s*:\s*([^;}]+)', block, re.I)
+    if not match:
+        return True
+    codepoints = {ord(c) for c in chars}
+    for part in match.group(1).split(','):
+        part = part.strip().upper().removeprefix('U+')
+        if '?' in part:
+            low, high = int(part.replace('?', '0'), 16), int(part.replace('?', 'F'), 16)
+        elif '-' in part:
+            low, high = (int(p, 16) for p in part.split('-'))
+        else:
+            low = high = int(part, 16)
+        if any(low <= cp <= high for cp in codepoints):
+            return True
+    return False
+
+
+def subset_font(data, chars):
+    """(font bytes, flavor) keeping only `chars`; WOFF2 when brotli is installed, else WOFF"""
+    from io import BytesIO
+
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+
+    try:
+        import brotli  # noqa: F401  (WOFF2 compression)
+        flavor = 'woff2'
+    except ImportError:
+        flavor = 'woff'
+    options = subset.Options()
+    options.flavor = flavor
+    options.layout_features = ['*']  # Keep kerning and ligatures
+    options.hinting = False          # Print and screen render unhinted in Chromium anyway
+    options.desubroutinize = True
+    font = TTFont(BytesIO(data), lazy=False)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=[ord(c) for c in chars])
+    subsetter.subset(font)
+    out = BytesIO()
+    font.flavor = flavor
+    font.save(out)
+    return out.getvalue(), flavor
+
+
+# === CSS ====================================================================
+
+def inline_css(css, base, chars, report, offline=False, depth=0):
+    """Resolve @import, subset and embed @font-face sources, inline url() assets"""
+    def expand_import(match):
+        data, absolute = _resolve(match.group(1), base, report, offline)
+        if data is None or depth > 4:
+            report['unresolved'].append(match.group(1))
+            return match.group(0)
+        return inline_css(data.decode('utf-8', 'replace'), absolute, chars, report, offline, depth + 1)
+
+    def embed_font(match):
+        block = match.group(0)
+        if not _in_unicode_range(block, chars):
+            report['font_faces_dropped'] += 1  # e.g. the cyrillic/vietnamese slices Google Fonts sends
+            return ''
+        for _, ref in _CSS_URL.findall(block):
+            data, absolute = _resolve(ref, base, report, offline)
+            if data is None:
+                continue
+            subset, flavor = subset_font(data, chars)
+            report['fonts'].append({'source': absolute, 'bytes': len(data), 'subset_bytes': len(subset)})
+            src = f"src:url({data_uri(subset, absolute, FONT_MIME[flavor])}) format('{flavor}')"
+            block = re.sub(r'unicode-range\s*:[^;}]+;?', '', block, flags=re.I)
+            return re.sub(r'src\s*:[^;}]+', src, block, count=1, flags=re.I)
+        report['unresolved'].extend(ref for _, ref in _CSS_URL.findall(block))
+        return block
+
+    def embed_url(match):
+        ref = match.group(2)
+        data, absolute = _resolve(ref, base, report, offline)
+        if data is None:
+            if not ref.startswith(('data:', '#')):
+                report['unresolved'].append(ref)
+            return match.group(0)
+        if len(data) > MAX_INLINE_BYTES:
+            report['too_large'].append(ref)
+            return match.group(0)
+        report['assets'] += 1
+        return f'url({data_uri(data, absolute)})'
+
+    css = _CSS_IMPORT.sub(expand_import, css)
+    css = _FONT_FACE.sub(embed_font, css)
+    # Font data URIs are already in place; only the remaining url()s are assets
+    parts = re.split(r'(url\(data:[^)]*\))', css)
+    return ''.join(part if part.startswith('url(data:') else _CSS_URL.sub(embed_url, part) for part in parts)
+
+
+def minify_css(css):
+    """Drop comments and insignificant whitespace; strings (content:, data: URIs) are left alone"""
+    out = []
+    for i, part in enumerate(_CSS_STRING.split(css)):
+        if i % 2:
+            out.append(part)
+            continue
+        part = re.sub(r'/\*.*?\*/', '', part, flags=re.S)
+        part = re.sub(r'\s+', ' ', part)
+        part = re.sub(r'\s*([{};,])\s*', r'\1', part)
+        part = re.sub(r'\s*:\s+', ':', part)  # Only declarations have space after a colon
+        out.append(part.replace(';}', '}'))
+    return ''.join(out).strip()
+
+
+# === HTML ===================================================================
+
+def _attrs(tag):
+    return {name.lower(): value.strip('"\'') for name, value in _ATTR.findall(tag)}
+
+
+def minify_html(html):
+    """Strip comments and collapse whitespace, leaving <pre>, <textarea>, <script> and <style> verbatim"""
+    preserved = []
+
+    def keep(match):
+        preserved.append(match.group(0))
+        return f'\x00{len(preserved) - 1}\x00'
+
+    html = re.sub(r'<(%s)\b.*?</\1\s*>' % '|'.join(PRESERVE_TAGS), keep, html, flags=re.S | re.I)
+    # Conditional comments too: they only matter to Word/IE, the bundle is for Chromium
+    html = re.sub(r'<!--.*?-->', '', html, flags=re.S)
+    tokens = re.split(r'(<[^>]+>|\x00\d+\x00)', html)
+    out = []
+    for i, token in enumerate(tokens):
+        if i % 2:
+            out.append(token)
+            continue
+        if token.strip():
+            out.append(re.sub(r'\s+', ' ', token))
+            continue
+        names = [re.match(r'</?([a-zA-Z0-9]+)', t or '') for t in (tokens[i - 1] if i else '',
+                                                                     tokens[i + 1] if i + 1 < len(tokens) else '')]
+        beside_block = any(m and m.group(1).lower() in BLOCK_TAGS for m in names)
+        beside_preserved = any(t.startswith('\x00') for t in (tokens[i - 1:i] + tokens[i + 1:i + 2]))
+        if token and not (beside_block or beside_preserved or i in (0, len(tokens) - 1)):
+            out.append(' ')
+    return re.sub(r'\x00(\d+)\x00', lambda m: preserved[int(m.group(1))], ''.join(out))
+
+
+def read_html(html_path):
+    """Source text; Word's 'Save as Web Page' writes UTF-16 with a BOM"""
+    data = Path(html_path).read_bytes()
+    if data.startswith((b'\xff\xfe', b'\xfe\xff')):
+        return data.decode('utf-16')
+    try:
+        return data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return data.decode('cp1252')
+
+
+def source_hash(html_path):
+    return hashlib.sha256(Path(html_path).read_bytes()).hexdigest()
+
+
+def bundle_key(digest, inputs, offline, minify):
+    """The ahk-bundle marker: source digest, every resolved input's digest and the options"""
+    material = json.dumps({'format': BUNDLE_FORMAT, 'source': digest, 'inputs': sorted(inputs.items()),
+                           'offline': offline, 'minify': minify})
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+def manifest_path(bundle):
+    """'X.bundle.html' → 'X.bundle.json': the inputs behind the bundle's marker"""
+    return Path(bundle).with_suffix('.json')
+
+
+def bundle_inputs(bundle):
+    """{resolved ref: sha256} the bundle was built from, or None for a bundle without a manifest"""
+    try:
+        return json.loads(manifest_path(bundle).read_text(encoding='utf-8'))['inputs']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _is_current(output, digest, offline, minify):
+    """The bundle at output carries the key its recorded inputs have now"""
+    marker = bundle_marker(output)
+    inputs = bundle_inputs(output)
+    if marker is None or inputs is None:
+        return False
+    current = {}
+    for ref in inputs:
+        data, _ = resolve(ref, ref, offline)
+        if data is None:
+            return False
+        current[ref] = hashlib.sha256(data).hexdigest()
+    return bundle_key(digest, current, offline, minify) == marker
+
+def bundle_marker(html_path):
+    """The ahk-bundle key of a complete bundle built by this module (only its head is read), else None"""
+    try:
+        with open(html_path, 'r', encoding='utf-8', errors='replace') as f:
+            match = _META.search(f.read(4096))
+    except OSError:
+        return None
+    return match.group(1) if match else None
+
+
+def is_bundled(html_path):
+    """The file is a complete bundle built by this module"""
+    return bundle_marker(html_path) is not None
+
+
+# Chromium prints the frame it is on. Finish the entrance animations (fadeInDown/fadeInUp start
+# at opacity 0) and hold looping ones and videos at their first frame, so every render of the
+# same HTML prints the same page (visual_regression.py compares them pixel by pixel).
+SETTLE_ANIMATIONS = """async () => {
+  for (const animation of document.getAnimations()) {
+    if (animation.effect && animation.effect.getTiming().iterations === Infinity) {
+      animation.pause();
+      animation.currentTime = 0;
+    } else {
+      animation.finish();
+    }
+  }
+  await Promise.all([...document.querySelectorAll('video')].map((video) => new Promise((resolve) => {
+    video.pause();
+    if (video.readyState === 0 || video.currentTime === 0) return resolve();
+    video.addEventListener('seeked', resolve, { once: true });
+    video.currentTime = 0;
+  })));
+}"""
+
+
+async def load_for_print(page, html_path):
+    """Open html_path in a Playwright page and bring it to a settled, printable state
+
+    A bundle has nothing to fetch, so 'load' is enough; anything else may
+    still be loading web fonts. Then wait for font decoding and settle the
+    animations instead of sleeping a fixed time.
+    """
+    await page.goto(Path(html_path).resolve().as_uri(), wait_until='load' if is_bundled(html_path) else 'networkidle')
+    await page.evaluate('document.fonts.ready.then(() => true)')
+    await page.evaluate(SETTLE_ANIMATIONS)
+
+
+def bundle_output(html_path):
+    return Path(html_path).with_name(Path(html_path).name.removesuffix('.html') + BUNDLE_SUFFIX)
+
+
+def bundle_html(html_path, output=None, offline=False, minify=True, force=False):
+    """Write the self-contained bundle; returns (bundle path, report)"""
+    html_path = Path(html_path).resolve()
+    output = Path(output or bundle_output(html_path))
+    digest = source_hash(html_path)
+    if not force and output.exists() and _is_current(output, digest, offline, minify):
+        return output, {'cached': True, 'bytes': output.stat().st_size}
+
+    started = time.perf_counter()
+    html = _CHARSET.sub(lambda m: m.group(1) + 'utf-8', read_html(html_path))  # The bundle is written as UTF-8
+    base = html_path.as_uri()
+    report = {'cached': False, 'source_bytes': html_path.stat().st_size, 'fonts': [], 'font_faces_dropped': 0,
+              'assets': 0, 'stylesheets': 0, 'unresolved': [], 'too_large': [], 'inputs': {},
+              'remote_missing': []}
+
+    # Stylesheets first: their content: strings count towards the glyph set
+    linked = {}
+    for tag in _LINK.findall(html):
+        attrs = _attrs(tag)
+        rel = attrs.get('rel', '').lower()
+        if 'stylesheet' in rel:
+            data, absolute = _resolve(attrs.get('href', ''), base, report, offline)
+            if data is None:
+                report['unresolved'].append(attrs.get('href', ''))
+            else:
+                linked[tag] = (data.decode('utf-8', 'replace'), absolute)
+    chars = used_characters(html, [css for css, _ in linked.values()] + [m.group(2) for m in _STYLE_BLOCK.finditer(html)])
+    report['glyphs'] = len(chars)
+
+    def css_block(css, css_base):
+        css = inline_css(css, css_base, chars, report, offline)
+        return minify_css(css) if minify else css
+
+    def replace_link(match):
+        tag = match.group(0)
+        if tag in linked:
+            report['stylesheets'] += 1
+            return f"<style>{css_block(*linked[tag])}</style>"
+        if _attrs(tag).get('rel', '').lower() in DROP_LINK_RELS:
+            return ''  # Network hints for fonts that are now inline, Word side files
+        return tag
+
+    def replace_style(match):
+        return match.group(1) + css_block(match.group(2), base) + match.group(3)
+
+    def replace_src(match):
+        quote, ref = match.group(2)[0], match.group(2)[1:-1]
+        data, absolute = _resolve(ref, base, report, offline)
+        if data is None:
+            report['unresolved'].append(ref)
+            return match.group(0)
+        if len(data) > MAX_INLINE_BYTES:
+            report['too_large'].append(ref)
+            return match.group(0)
+        report['assets'] += 1
+        return f"{match.group(1)}{quote}{data_uri(data, absolute)}{quote}"
+
+    def replace_style_attr(match):
+        quote, css = match.group(2)[0], match.group(2)[1:-1]
+        css = inline_css(unescape(css), base, chars, report, offline).replace(quote, '&quot;' if quote == '"' else '&#39;')
+        return f"{match.group(1)}{quote}{css}{quote}"
+
+    html = _STYLE_BLOCK.sub(replace_style, html)
+    html = _LINK.sub(replace_link, html)
+    html = _SRC_ATTR.sub(replace_src, html)
+    html = _STYLE_ATTR.sub(replace_style_attr, html)
+    if minify:
+        html = minify_html(html)
+    # Still linked to a remote stylesheet or font: no marker, so it is rebuilt and never printed as network-free
+    report['complete'] = not report['remote_missing']
+    if report['complete']:
+        meta = f'<meta name="{BUNDLE_META}" content="{bundle_key(digest, report["inputs"], offline, minify)}">'
+        html, found = _HEAD.subn(lambda m: m.group(0) + meta, html, count=1)
+        if not found:
+            html = meta + html
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    manifest = manifest_path(output)
+    if report['complete']:
+        partial = manifest.with_name(f'{manifest.name}.{os.getpid()}.tmp')
+        partial.write_text(json.dumps({'source': str(html_path), 'inputs': report['inputs']}, indent=1),
+                           encoding='utf-8')
+        os.replace(partial, manifest)
+    elif manifest.exists():
+        manifest.unlink()
+    partial = output.with_suffix(f'.{os.getpid()}.tmp')
+    partial.write_text(html, encoding='utf-8')
+    os.replace(partial, output)
+    report.update(bytes=output.stat().st_size, bundle_ms=round((time.perf_counter() - started) * 1000, 1))
+    return output, report
+
+
+def bundle_for_render(html_path, telemetry=DISABLED):
+    """Render hook: the bundle to print instead of html_path, or html_path when bundling is off or fails"""
+    if os.environ.get("AHK_BUNDLE", "1") == "0" or is_bundled(html_path):
+        return html_path
+    try:
+        with telemetry.stage('bundle_html', source=Path(html_path).name) as stage:
+            bundle, report = bundle_html(html_path, offline=os.environ.get("AHK_BUNDLE_OFFLINE") == "1")
+            stage.update(cached=report['cached'], bytes=report['bytes'], unresolved=len(report.get('unresolved', ())))
+            stage.add_output(bundle)
+    except ImportError as e:
+        print(f"⚠️  Bundling skipped ({e.name} not installed)")
+        return html_path
+    except Exception as e:
+        print(f"⚠️  Bundling failed for {Path(html_path).name}: {type(e).__name__}: {e}")
+        return html_path
+    return bundle
+
+
+def print_report(html_path, bundle, report):
+    if report['cached']:
+        print(f"✅ {Path(html_path).name}: up to date → {bundle.name} ({report['bytes'] / 1024:.1f} KB)")
+        return
+    fonts = report['fonts']
+    print(f"✅ {Path(html_path).name} → {bundle.name}: {report['source_bytes'] / 1024:.1f} KB source, "
+          f"{report['bytes'] / 1024:.1f} KB bundle in {report['bundle_ms']:.0f} ms")
+    if fonts:
+        print(f"   🔤 {len(fonts)} font faces subsetted to {report['glyphs']} glyphs: "
+              f"{sum(f['bytes'] for f in fonts) / 1024:.0f} KB → {sum(f['subset_bytes'] for f in fonts) / 1024:.0f} KB"
+              + (f" ({report['font_faces_dropped']} unused unicode-range faces dropped)"
+                 if report['font_faces_dropped'] else ''))
+    print(f"   🖼️  {report['assets']} assets, {report['stylesheets']} stylesheets inlined")
+    for ref in report['too_large']:
+        print(f"   ⚠️  Left linked (over {MAX_INLINE_BYTES // 1024} KB): {ref}")
+    for ref in report['unresolved']:
+        print(f"   ⚠️  Unresolved, left as is: {ref}")
+    if not report['complete']:
+        print("   ⚠️  Remote resources missing: not marked as a bundle, rebuilt on the next run")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bundle letterhead HTML into one self-contained file")
+    parser.add_argument('html', nargs='+', type=Path, metavar='HTML')
+    parser.add_argument('--output', type=Path, help=f"Bundle path (one HTML only; default: NAME{BUNDLE_SUFFIX})")
+    parser.add_argument('--offline', action='store_true', help=f"Read remote fonts/CSS only from {FONT_CACHE_DIR}")
+    parser.add_argument('--no-minify', dest='minify', action='store_false')
+    parser.add_argument('--force', action='store_true', help="Rebuild even when the source is unchanged")
+    parser.add_argument('--telemetry', nargs='?', const='1', metavar='PATH',
+                        help="Append JSONL stage events to PATH ('-' = stdout, default: Reports/pipeline_telemetry.jsonl)")
+    parser.add_argument('--quiet', action='store_true', help="Suppress the console banners")
+    args = parser.parse_args(argv)
+    if args.output and len(args.html) > 1:
+        parser.error("--output needs a single HTML")
+
+    telemetry = Telemetry.from_env('AHK', args.telemetry, args.quiet)
+    failed = 0
+    with telemetry.console():
+        for html in args.html:
+            try:
+                with telemetry.stage('bundle_html', source=html.name) as stage:
+                    bundle, report = bundle_html(html, args.output, args.offline, args.minify, args.force)
+                    stage.update(cached=report['cached'], bytes=report['bytes'],
+                                 unresolved=len(report.get('unresolved', ())))
+                    stage.add_output(bundle)
+            except Exception as e:
+                failed += 1
+                print(f"❌ {html.name}: {type(e).__name__}: {e}")
+                continue
+            print_report(html, bundle, report)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+"""
+AHKStrategies Animated Logo Capture
+Records the animated brand mark from AHKStrategies_Letterhead_AnimatedLogo.html
+into an animated WebP or an MP4 at a fixed FPS, for email signatures, decks
+and the dashboard
+
+Frames come from the Chrome DevTools screencast (Page.startScreencast), not from
+page.screenshot() in a loop: the compositor pushes each frame as it paints, so
+one capture costs a JPEG decode instead of a full screenshot round trip. The
+element is pinned to the top-left of a viewport sized to it, with a device scale
+factor that makes the frames exactly the requested width. Frames arrive at the
+compositor's own pace (none while nothing moves), so they are resampled onto a
+fixed FPS timeline before encoding; repeated frames become longer WebP frame
+durations.
+
+    result = asyncio.run(capture_logo(sizes=(160, 320), fps=30, seconds=3))
+    result[0]['capture_fps'], result[0]['output']
+
+Playwright's bundled Chromium has no H.264 decoder, so the logo video inside the
+page only plays with --channel chrome (or msedge); the CSS animations play either
+way. MP4 output needs ffmpeg on PATH (or AHK_FFMPEG).
+
+Usage:
+    python capture_logo.py [HTML] [--sizes 160,320,640] [--fps 30] [--seconds 3] [--format webp|mp4]
+                           [--parallel] [--selector .logo-icon] [--channel chrome] [--output-dir DIR]
+"""
+
+import asyncio
+import base64
+import bisect
+import io
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from brand_paths import ANIMATED_LOGO_DIR, ANIMATED_LOGO_HTML, LOGO_VIDEO
+from telemetry import DISABLED, Telemetry
+
+CAPTURE_SELECTOR = '.logo-icon'
+CAPTURE_SIZES = (320,)
+CAPTURE_FPS = 30
+CAPTURE_SECONDS = 3.0  # One logoPulse cycle
+CAPTURE_PADDING = 8    # CSS px around the element, so the pulse scale and glow are not clipped
+FRAME_FORMAT = 'jpeg'  # Screencast frame encoding: jpeg is several times cheaper than png per frame
+FRAME_QUALITY = 92
+WEBP_QUALITY = 85
+VIDEO_WAIT_MS = 5000
+
+# Pins the element to the viewport's top-left corner on the page background
+PIN_STYLE = """
+%(selector)s {
+    position: fixed !important; left: %(padding)dpx !important; top: %(padding)dpx !important;
+    margin: 0 !important; z-index: 2147483647 !important;
+}
+"""
+
+# Points the logo <video> at a local file (the page ships a C:\\Users\\... source) and waits until it plays
+USE_VIDEO = """async ([selector, src, waitMs]) => {
+    const video = document.querySelector(`${selector} video`);
+    if (!video) return 'no video';
+    if (src) { video.src = src; video.load(); }
+    video.muted = true;
+    try { await video.play(); } catch (e) { return e.message; }
+    const deadline = performance.now() + waitMs;
+    while (video.readyState < 3 && performance.now() < deadline) await new Promise(r => setTimeout(r, 50));
+    return video.readyState >= 3 ? null : 'video did not start';
+}"""
+
+# Rewinds every CSS animation and the video, so each capture starts at t=0
+REWIND = """(selector) => {
+    document.getAnimations().forEach(a => { a.currentTime = 0; });
+    const video = document.querySelector(`${selector} video`);
+    if (video) video.currentTime = 0;
+}"""
+
+
+def resample(timestamps, fps, seconds):
+    """Frame index shown at each tick of a fixed-FPS timeline (the latest frame at or before the tick)"""
+    if not timestamps:
+        return []
+    start = timestamps[0]
+    ticks = max(1, round(seconds * fps))
+    return [max(0, bisect.bisect_right(timestamps, start + i / fps) - 1) for i in range(ticks)]
+
+
+def _decode(data, width):
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(base64.b64decode(data))).convert('RGB')
+    if image.width != width:  # Device-pixel rounding can be off by one
+        image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+    return image
+
+
+def encode_webp(frames, timeline, fps, width, output):
+    """Animated WebP; a frame repeated on consecutive ticks is stored once with a longer duration"""
+    runs = []
+    for index in timeline:
+        if runs and runs[-1][0] == index:
+            runs[-1][1] += 1
+        else:
+            runs.append([index, 1])
+    decoded = {}
+    for index, _ in runs:
+        if index not in decoded:
+            decoded[index] = _decode(frames[index][1], width)
+    images = [decoded[index] for index, _ in runs]
+    durations = [round(count * 1000 / fps) for _, count in runs]
+    partial = output.with_suffix(f'.{os.getpid()}.tmp')
+    images[0].save(partial, 'WEBP', save_all=True, append_images=images[1:], duration=durations, loop=0,
+                   quality=WEBP_QUALITY, method=4)
+    os.replace(partial, output)
+    return len(runs)
+
+
+def encode_mp4(frames, timeline, fps, width, output):
+    """H.264 MP4 (yuv420p, faststart) through an ffmpeg rawvideo pipe; every tick is a frame"""
+    ffmpeg = shutil.which(os.environ.get('AHK_FFMPEG', 'ffmpeg'))
+    if not ffmpeg:
+        raise RuntimeError("ffmpeg not found (install it or set AHK_FFMPEG)")
+    first = _decode(frames[timeline[0]][1], width)
+    size = (first.width // 2 * 2, first.height // 2 * 2)  # yuv420p needs even dimensions
+    partial = output.with_suffix(f'.{os.getpid()}.tmp.mp4')
+    process = subprocess.Popen(
+        [ffmpeg, '-loglevel', 'error', '-y', '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{size[0]}x{size[1]}',
+         '-r', str(fps), '-i', '-', '-c:v', 'libx264', '-preset', 'slow', '-crf', '18', '-pix_fmt', 'yuv420p',
+         '-movflags', '+faststart', str(partial)],
+        stdin=subprocess.PIPE)
+    cached = (None, None)
+    try:
+        for index in timeline:
+            if cached[0] != index:  # Held frames are written again without decoding again
+                cached = (index, _decode(frames[index][1], width).crop((0, 0, *size)).tobytes())
+            process.stdin.write(cached[1])
+    finally:
+        process.stdin.close()
+    if process.wait() != 0:
+        partial.unlink(missing_ok=True)
+        raise RuntimeError(f"ffmpeg exited with {process.returncode}")
+    os.replace(partial, output)
+    return len(timeline)
+
+
+async def screencast(browser, html_path, width, seconds, selector=CAPTURE_SELECTOR, padding=CAPTURE_PADDING,
+                     video=LOGO_VIDEO):
+    """Screencast frames [(timestamp, base64 data)] of one element at `width` device pixels"""
+    context = await browser.new_context()
+    try:
+        page = await context.new_page()
+        await page.goto(Path(html_path).resolve().as_uri())
+        await page.evaluate('document.fonts.ready.then(() => true)')
+        src = Path(video).resolve().as_uri() if video and Path(video).exists() else None
+        problem = await page.evaluate(USE_VIDEO, [selector, src, VIDEO_WAIT_MS])
+        if problem and problem != 'no video':
+            print(f"⚠️  Logo video not playing ({problem}); capturing the CSS animation only")
+        await page.add_style_tag(content=PIN_STYLE % {'selector': selector, 'padding': padding})
+        box = await page.eval_on_selector(selector, 'e => [e.offsetWidth, e.offsetHeight]')
+        viewport = (box[0] + 2 * padding, box[1] + 2 * padding)
+
+        session = await context.new_cdp_session(page)
+        await session.send('Emulation.setDeviceMetricsOverride', {
+            'width': viewport[0], 'height': viewport[1], 'deviceScaleFactor': width / viewport[0], 'mobile': False})
+        await page.evaluate(REWIND, selector)
+
+        frames, acks = [], []
+
+        def on_frame(event):
+            stamp = event.get('metadata', {}).get('timestamp') or time.time()
+            frames.append((stamp, event['data']))
+            # The compositor sends the next frame only after this one is acknowledged
+            acks.append(asyncio.ensure_future(session.send('Page.screencastFrameAck', {'sessionId': event['sessionId']})))
+
+        session.on('Page.screencastFrame', on_frame)
+        params = {'format': FRAME_FORMAT, 'everyNthFrame': 1}
+        if FRAME_FORMAT == 'jpeg':
+            params['quality'] = FRAME_QUALITY
+        await session.send('Page.startScreencast', params)
+        await asyncio.sleep(seconds)
+        await session.send('Page.stopScreencast')
+        await asyncio.gather(*acks, return_exceptions=True)
+        return sorted(frames, key=lambda frame: frame[0])
+    finally:
+        await context.close()
+
+
+async def capture_size(browser, html_path, width, fps, seconds, fmt, output_dir, telemetry=DISABLED, **options):
+    """Capture and encode one size; returns its throughput report"""
+    output = Path(output_dir) / f"ahk_logo_w{width}.{fmt}"
+    with telemetry.stage('logo_capture', width=width, fps=fps, format=fmt) as stage:
+        started = time.perf_counter()
+        frames = await screencast(browser, html_path, width, seconds, **options)
+        capture_s = time.perf_counter() - started
+        if not frames:
+            raise RuntimeError(f"No screencast frames for {options.get('selector', CAPTURE_SELECTOR)}")
+        timeline = resample([stamp for stamp, _ in frames], fps, seconds)
+
+        started = time.perf_counter()
+        encode = encode_webp if fmt == 'webp' else encode_mp4
+        # Encoding is CPU-bound: off the event loop, so parallel sizes keep capturing meanwhile
+        stored = await asyncio.to_thread(encode, frames, timeline, fps, width, output)
+        report = {
+            'width': width,
+            'output': str(output),
+            'frames_received': len(frames),
+            'capture_fps': round(len(frames) / capture_s, 1),
+            'frames_out': len(timeline),
+            'frames_stored': stored,
+            'unique_frames': len(set(timeline)),
+            'capture_ms': round(capture_s * 1000, 1),
+            'encode_ms': round((time.perf_counter() - started) * 1000, 1),
+            'bytes': output.stat().st_size,
+        }
+        stage.update(**{k: v for k, v in report.items() if k not in ('width', 'output')})
+        stage.add_output(output)
+    return report
+
+
+async def capture_logo(html_path=ANIMATED_LOGO_HTML, sizes=CAPTURE_SIZES, fps=CAPTURE_FPS, seconds=CAPTURE_SECONDS,
+                       fmt='webp', output_dir=ANIMATED_LOGO_DIR, parallel=False, channel=None, telemetry=DISABLED,
+                       **options):
+    """Capture every size in one browser, concurrently (one page each) when parallel=True"""
+    from playwright.async_api import async_playwright  # Before mkdir: no empty folder when it is missing
+
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(channel=channel) if channel else await p.chromium.launch()
+        try:
+            jobs = [capture_size(browser, html_path, width, fps, seconds, fmt, output_dir, telemetry, **options)
+                    for width in sizes]
+            if parallel:
+                return list(await asyncio.gather(*jobs))
+            return [await job for job in jobs]
+        finally:
+            await browser.close()
+
+
+def print_report(reports, fps):
+    print(f"\n🎞️  Target {fps} fps")
+    for r in reports:
+        print(f"✅ {r['width']:>4}px  {r['frames_received']:>4} frames in {r['capture_ms']:.0f} ms "
+              f"({r['capture_fps']} fps captured, {r['unique_frames']} unique) → {r['frames_out']} @ {fps} fps, "
+              f"encode {r['encode_ms']:.0f} ms, {r['bytes'] / 1024:.1f} KB → {Path(r['output']).name}")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Capture the animated logo to animated WebP or MP4")
+    parser.add_argument('html', nargs='?', type=Path, default=ANIMATED_LOGO_HTML)
+    parser.add_argument('--sizes', default=','.join(map(str, CAPTURE_SIZES)), help="Comma-separated output widths")
+    parser.add_argument('--fps', type=int, default=CAPTURE_FPS)
+    parser.add_argument('--seconds', type=float, default=CAPTURE_SECONDS)
+    parser.add_argument('--format', choices=['webp', 'mp4'], default='webp')
+    parser.add_argument('--parallel', action='store_true', help="Capture all sizes at once, one page each")
+    parser.add_argument('--selector', default=CAPTURE_SELECTOR)
+    parser.add_argument('--padding', type=int, default=CAPTURE_PADDING, help="CSS px around the element")
+    parser.add_argument('--video', type=Path, default=LOGO_VIDEO, help="Local file for the logo <video>")
+    parser.add_argument('--channel', help="Browser channel, e.g. chrome (needed for the MP4 logo to play)")
+    parser.add_argument('--output-dir', type=Path, default=ANIMATED_LOGO_DIR)
+    parser.add_argument('--telemetry', nargs='?', const='1', metavar='PATH',
+                        help="Append JSONL stage events to PATH ('-' = stdout, default: Reports/pipeline_telemetry.jsonl)")
+    parser.add_argument('--quiet', action='store_true', help="Suppress the console banners")
+    args = parser.parse_args(argv)
+
+    telemetry = Telemetry.from_env('AHK', args.telemetry, args.quiet)
+    with telemetry.console():
+        reports = asyncio.run(capture_logo(
+            args.html, [int(w) for w in args.sizes.split(',') if w.strip()], args.fps, args.seconds, args.format,
+            args.output_dir, args.parallel, args.channel, telemetry,
+            selector=args.selector, padding=args.padding, video=args.video))
+        print_report(reports, args.fps)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,14 +2,18 @@
 Convert the Master Letterhead to PDF
 """
 
-from docx2pdf import convert
 import os
 
-def convert_to_pdf():
+from brand_paths import MASTER_DOCX
+from pdf_postprocess import postprocess_pdf
+from previews import eager_previews
+from telemetry import Telemetry
+
+def convert_to_pdf(docx_path=MASTER_DOCX, pdf_path=None):
     """Convert the DOCX letterhead to PDF"""
+    from docx2pdf import convert  # Needs Microsoft Word; only paid for when converting
     
-    docx_path = r"C:\Users\ashra\OneDrive\Desktop\AHK_Dashboard_v1\Brand\Letterheads\AHKStrategies_Letterhead_Master_v1.docx"
-    pdf_path = r"C:\Users\ashra\OneDrive\Desktop\AHK_Dashboard_v1\Brand\Letterheads\AHKStrategies_Letterhead_Master_v1.pdf"
+    pdf_path = pdf_path or docx_path.with_suffix('.pdf')
     
     if not os.path.exists(docx_path):
         print(f"❌ DOCX file not found: {docx_path}")
@@ -19,17 +23,26 @@ def convert_to_pdf():
     print("   This may take a moment as Word is being invoked...")
     
     try:
-        convert(docx_path, pdf_path)
+        convert(str(docx_path), str(pdf_path))
+        postprocess_pdf(pdf_path)
+        eager_previews(pdf_path)
         print("\n" + "=" * 80)
         print("✨ PDF EXPORT COMPLETE ✨")
         print("=" * 80)
         print(f"📄 PDF: {pdf_path}")
         print(f"✅ Both formats ready for professional use!")
         print("=" * 80)
+        return docx_path, pdf_path
     except Exception as e:
         print(f"❌ Error during conversion: {e}")
         print("\nNote: docx2pdf requires Microsoft Word to be installed.")
         print("Alternative: Open the DOCX file and use 'Save As > PDF' manually.")
 
 if __name__ == "__main__":
-    convert_to_pdf()
+    telemetry = Telemetry.from_env()
+    with telemetry.console(), telemetry.stage('convert_to_pdf') as stage:
+        converted = convert_to_pdf()
+        stage.update(converted=bool(converted))
+        if converted:
+            stage.add_input(converted[0])
+            stage.add_output(converted[1])
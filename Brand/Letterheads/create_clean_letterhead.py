@@ -8,6 +8,10 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 
+from brand_paths import LEGENDARY_DOCX
+from font_embed import embed_document_fonts
+from telemetry import Telemetry
+
 def add_top_border(paragraph, color='D4AF37', size=12):
     """Add a top border to a paragraph"""
     pPr = paragraph._element.get_or_add_pPr()
@@ -20,7 +24,7 @@ def add_top_border(paragraph, color='D4AF37', size=12):
     pBdr.append(top)
     pPr.append(pBdr)
 
-def create_letterhead():
+def create_letterhead(output_path=None):
     """Create the letterhead with header and footer"""
     
     # Create new document
@@ -131,10 +135,15 @@ def create_letterhead():
     run.font.color.rgb = RGBColor(153, 153, 153)
     
     # Save
-    doc.save('AHKStrategies_Letterhead_LEGENDARY.docx')
+    output_path = output_path or LEGENDARY_DOCX
+    embed_document_fonts(doc)
+    doc.save(output_path)
     print("✅ Clean letterhead created!")
-    print("📄 File: AHKStrategies_Letterhead_LEGENDARY.docx")
+    print(f"📄 File: {output_path}")
     print("✨ You can now type your content in the middle section")
+    return output_path
 
 if __name__ == "__main__":
-    create_letterhead()
+    telemetry = Telemetry.from_env()
+    with telemetry.console(), telemetry.stage('create_clean_letterhead') as stage:
+        stage.add_output(create_letterhead())
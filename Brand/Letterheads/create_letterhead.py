@@ -11,6 +11,13 @@ from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 from docx.oxml.shared import OxmlElement as OxmlElementShared
 import os
+from pathlib import Path
+
+from artifact_registry import register_output
+from brand_paths import LETTERHEAD_DOCX, LOGO_PATH
+from font_embed import embed_document_fonts
+from media_cache import add_picture
+from telemetry import Telemetry
 
 def add_geometric_line(paragraph, color_hex="#d4b37f", width_pt=1.5, style='single'):
     """Add a sophisticated line to a paragraph using border"""
@@ -52,7 +59,7 @@ def add_shading(paragraph, color_hex="#f9f7f4"):
     shd.set(qn('w:fill'), color_hex.strip('#'))
     pPr.append(shd)
 
-def create_letterhead():
+def create_letterhead(output_path=None):
     """Create the AHKStrategies MASTERPIECE letterhead document"""
     
     # Initialize document
@@ -96,10 +103,9 @@ def create_letterhead():
     logo_paragraph.paragraph_format.space_after = Pt(12)
     
     # Add logo with optimal size
-    logo_path = r"c:\Users\ashra\OneDrive\Desktop\AHK Profile\AHK-Digital-ID-Kit\ahkstrategies-logo.png"
-    if os.path.exists(logo_path):
+    if os.path.exists(LOGO_PATH):
         run = logo_paragraph.add_run()
-        run.add_picture(logo_path, width=Cm(4.2))  # Larger, more prominent
+        add_picture(run, LOGO_PATH, width=Cm(4.2))  # Larger, more prominent
     
     # Right cell - Sophisticated geometric pattern
     right_cell = logo_section.rows[0].cells[1]
@@ -270,11 +276,12 @@ def create_letterhead():
     # Save the MASTERPIECE
     import datetime
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_path = rf"C:\Users\ashra\OneDrive\Desktop\AHK_Dashboard_v1\Brand\Letterheads\AHKStrategies_Letterhead_v1_{timestamp}.docx"
+    main_path = Path(output_path or LETTERHEAD_DOCX)
+    output_path = main_path.with_name(f"{main_path.stem}_{timestamp}.docx")
+    embed_document_fonts(doc)
     doc.save(output_path)
     
     # Also try to save the main version (if not locked)
-    main_path = r"C:\Users\ashra\OneDrive\Desktop\AHK_Dashboard_v1\Brand\Letterheads\AHKStrategies_Letterhead_v1.docx"
     try:
         doc.save(main_path)
         output_path = main_path
@@ -292,4 +299,8 @@ def create_letterhead():
     return output_path
 
 if __name__ == "__main__":
-    create_letterhead()
+    telemetry = Telemetry.from_env()
+    with telemetry.console(), telemetry.stage('create_letterhead') as stage:
+        output = create_letterhead()
+        stage.add_output(output)
+        register_output(output, 'AHKStrategies_Letterhead', 'v1')  # AHK_REGISTRY=1: index in the artifact registry
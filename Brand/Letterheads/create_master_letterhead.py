@@ -8,8 +8,14 @@ from docx.shared import Inches, Pt, RGBColor, Cm
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
-from PIL import Image
 import os
+from pathlib import Path
+
+from artifact_registry import register_output
+from brand_paths import BANNER_TRANSPARENT, MASTER_DOCX
+from font_embed import embed_document_fonts
+from media_cache import add_picture
+from telemetry import Telemetry
 
 def add_geometric_line(paragraph, color_hex="#d4b37f", width_pt=1.5, style='single'):
     """Add a sophisticated line to a paragraph"""
@@ -37,7 +43,7 @@ def add_character_spacing(run, spacing):
     spacing_elem.set(qn('w:val'), str(spacing))
     rPr.append(spacing_elem)
 
-def create_master_letterhead():
+def create_master_letterhead(output_path=None, banner_path=None):
     """Create the ULTIMATE AHKStrategies Master Letterhead"""
     
     # Initialize document
@@ -88,10 +94,10 @@ def create_master_letterhead():
     banner_para.paragraph_format.space_before = Pt(0)
     banner_para.paragraph_format.space_after = Pt(14)
     
-    banner_path = r"C:\Users\ashra\OneDrive\Desktop\AHK_Dashboard_v1\Brand\Letterheads\banner_transparent.png"
+    banner_path = banner_path or BANNER_TRANSPARENT
     if os.path.exists(banner_path):
         run = banner_para.add_run()
-        run.add_picture(banner_path, width=Cm(14))  # Proper width for cropped banner
+        add_picture(run, banner_path, width=Cm(14))  # Proper width for cropped banner
     
     # Elegant thin separator after banner
     separator = doc.add_paragraph()
@@ -206,12 +212,13 @@ def create_master_letterhead():
     # Save DOCX
     import datetime
     timestamp = datetime.datetime.now().strftime("%H%M%S")
-    output_path_docx = rf"C:\Users\ashra\OneDrive\Desktop\AHK_Dashboard_v1\Brand\Letterheads\AHKStrategies_Letterhead_Master_v1.docx"
+    output_path_docx = Path(output_path or MASTER_DOCX)
+    embed_document_fonts(doc)
     
     try:
         doc.save(output_path_docx)
     except PermissionError:
-        output_path_docx = rf"C:\Users\ashra\OneDrive\Desktop\AHK_Dashboard_v1\Brand\Letterheads\AHKStrategies_Letterhead_Master_FIXED_{timestamp}.docx"
+        output_path_docx = output_path_docx.with_name(f"{output_path_docx.stem.replace('_v1', '')}_FIXED_{timestamp}.docx")
         doc.save(output_path_docx)
         print("⚠️  Original file is open - saved as FIXED version")
     
@@ -227,4 +234,8 @@ def create_master_letterhead():
     return output_path_docx
 
 if __name__ == "__main__":
-    create_master_letterhead()
+    telemetry = Telemetry.from_env()
+    with telemetry.console(), telemetry.stage('create_master_letterhead') as stage:
+        output = create_master_letterhead()
+        stage.add_output(output)
+        register_output(output, 'AHKStrategies_Letterhead_Master', 'v1')  # AHK_REGISTRY=1: index in the artifact registry
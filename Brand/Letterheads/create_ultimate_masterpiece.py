@@ -11,8 +11,14 @@ from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 from PIL import Image, ImageDraw, ImageFont
 import os
+from functools import lru_cache
 
-def create_elegant_banner():
+from brand_paths import BANNER_MASTERPIECE, MASTERPIECE_DOCX
+from font_embed import embed_document_fonts
+from media_cache import add_picture
+from telemetry import Telemetry
+
+def create_elegant_banner(output_path=None):
     """Create a beautiful transparent brain-circuit banner from scratch"""
     
     # Create transparent image
@@ -107,7 +113,7 @@ def create_elegant_banner():
             draw.ellipse([1600 - 8, y - 8, 1600 + 8, y + 8], fill=gold)
     
     # Save transparent PNG
-    output_path = r"C:\Users\ashra\OneDrive\Desktop\AHK_Dashboard_v1\Brand\Letterheads\banner_masterpiece.png"
+    output_path = output_path or BANNER_MASTERPIECE
     img.save(output_path, "PNG")
     print(f"✨ Masterpiece banner created: {output_path}")
     return output_path
@@ -131,15 +137,20 @@ def hex_to_rgb(hex_color):
     hex_color = hex_color.lstrip('#')
     return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
-def create_ultimate_letterhead():
+@lru_cache(maxsize=None)
+def masterpiece_banner():
+    """The default banner, drawn on first use; later letterheads reuse the file (and its cached image)"""
+    return create_elegant_banner()
+
+def create_ultimate_letterhead(output_path=None):
     """Create THE ULTIMATE letterhead - pure masterpiece"""
     
     print("=" * 80)
     print("🎨 CREATING MASTERPIECE FROM SCRATCH...")
     print("=" * 80)
     
-    # Create banner first
-    banner_path = create_elegant_banner()
+    # Create banner first (once per process: the drawing is deterministic)
+    banner_path = masterpiece_banner()
     
     # Initialize document
     doc = Document()
@@ -190,7 +201,7 @@ def create_ultimate_letterhead():
     
     if os.path.exists(banner_path):
         run = banner_para.add_run()
-        run.add_picture(banner_path, width=Cm(15))
+        add_picture(run, banner_path, width=Cm(15))
     
     # Separator
     separator = doc.add_paragraph()
@@ -282,7 +293,8 @@ def create_ultimate_letterhead():
     font.color.rgb = RGBColor(*hex_to_rgb('#1a1a1a'))
     
     # Save
-    output_path = r"C:\Users\ashra\OneDrive\Desktop\AHK_Dashboard_v1\Brand\Letterheads\AHKStrategies_Letterhead_MASTERPIECE.docx"
+    output_path = output_path or MASTERPIECE_DOCX
+    embed_document_fonts(doc)
     doc.save(output_path)
     
     print("\n" + "=" * 80)
@@ -297,4 +309,6 @@ def create_ultimate_letterhead():
     return output_path
 
 if __name__ == "__main__":
-    create_ultimate_letterhead()
+    telemetry = Telemetry.from_env()
+    with telemetry.console(), telemetry.stage('create_ultimate_letterhead') as stage:
+        stage.add_output(create_ultimate_letterhead())
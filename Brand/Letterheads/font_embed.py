@@ -0,0 +1,616 @@
+"""
+AHKStrategies DOCX Font Embedding
+Embeds subsetted copies of the brand fonts (Playfair Display, Inter, Cormorant
+Garamond, Montserrat, the Segoe UI symbol/emoji faces...) into generated DOCX
+files, so Linux converters (LibreOffice on the brand daemon) lay documents out
+with the real fonts instead of searching for fallbacks and reflowing
+
+Every run is resolved to its face (family + bold/italic, through run, character
+and paragraph styles down to the document defaults) and only the characters
+each face actually shows are kept. The default paragraph style's faces also
+get printable Latin-1: letterheads are templates people type into. Page-number
+fields add the digits. Faces come from Brand/Fonts (plus AHK_FONT_DIRS), then
+fontconfig; variable fonts are instanced at the run's weight. Fonts whose
+licence forbids embedding (OS/2 fsType restricted or bitmap-only) are skipped.
+
+Subsets are cached in FontSubsets/ (AHK_FONT_SUBSETS) by font file and
+glyph-set hash, so a document only pays for fontTools on a new glyph set. Parts
+are stored the way Word writes them: /word/fonts/fontN.odttf, obfuscated with
+the fontKey GUID, referenced from fontTable.xml, with embedTrueTypeFonts and
+saveSubsetFonts set.
+
+warm_fonts() is the start-up step (brand daemon, render_memos batches,
+`brand.py fonts --warm`). It refreshes the fontconfig cache, resolves every
+brand face once and builds the body-font subsets, so the first conversion
+costs the same as the rest.
+
+    from font_embed import embed_document_fonts
+    embed_document_fonts(doc)   # just before doc.save(); AHK_EMBED_FONTS=0 turns it off
+
+Usage:
+    python font_embed.py embed DOCX [DOCX ...]
+    python font_embed.py warm [--family NAME ...]
+    python font_embed.py list DOCX
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from io import BytesIO
+from pathlib import Path
+
+from brand_paths import FONT_CACHE_DIR, FONT_DIRS, FONT_SUBSET_DIR
+from telemetry import DISABLED, Telemetry
+
+BRAND_FONTS = ('Playfair Display', 'Inter', 'Cormorant Garamond', 'Montserrat', 'Garamond', 'Segoe UI Symbol',
+               'Segoe UI Emoji')
+BODY_FONTS = ('Inter', 'Garamond')  # Default paragraph fonts of the builders: their subsets are built at warm-up
+FONT_SUFFIXES = ('.ttf', '.otf', '.ttc')
+TYPING_CHARS = ''.join(map(chr, range(0x20, 0x7F))) + ''.join(map(chr, range(0xA0, 0x100))) + '‘’“”–—…•€™'
+FIELD_CHARS = '0123456789'
+SLOTS = {(False, False): 'embedRegular', (True, False): 'embedBold', (False, True): 'embedItalic',
+         (True, True): 'embedBoldItalic'}
+OBFUSCATED_FONT = 'application/vnd.openxmlformats-officedocument.obfuscatedFont'
+FS_TYPE_RESTRICTED = 0x0002
+FS_TYPE_NO_SUBSETTING = 0x0100
+FS_TYPE_BITMAP_ONLY = 0x0200
+INDEX_NAME = 'font_index.json'
+MAX_WEIGHT_GAP = 200  # A Regular file is not the Bold face
+FC_TIMEOUT = 60  # fc-cache on a cold machine scans every font directory
+
+_INDEX = None
+_RESOLVED = {}
+_SUBSETS = {}
+_LOCK = threading.Lock()
+
+
+def embedding_enabled():
+    return os.environ.get("AHK_EMBED_FONTS", "1") != "0"
+
+
+# === FONT FILES =============================================================
+
+def _describe_font(path, index=0):
+    """Index entry for one face: family, weight, italic, variable axes, fsType"""
+    from fontTools.ttLib import TTFont
+
+    font = TTFont(path, fontNumber=index, lazy=True)
+    try:
+        names = font['name']
+        family = str(names.getDebugName(16) or names.getDebugName(1) or '')
+        os2 = font['OS/2'] if 'OS/2' in font else None
+        axes = {a.axisTag: [a.minValue, a.defaultValue, a.maxValue] for a in font['fvar'].axes} if 'fvar' in font else {}
+        return {'path': str(path), 'index': index, 'family': family,
+                'weight': os2.usWeightClass if os2 else 400,
+                'italic': bool(os2.fsSelection & 1) if os2 else 'italic' in str(names.getDebugName(2)).lower(),
+                'fs_type': os2.fsType if os2 else 0, 'axes': axes}
+    finally:
+        font.close()
+
+
+def font_files():
+    """Brand font files from FONT_DIRS (the fetched web-font cache excluded)"""
+    for directory in FONT_DIRS:
+        if not Path(directory).is_dir():
+            continue
+        for path in sorted(Path(directory).rglob('*')):
+            if path.suffix.lower() in FONT_SUFFIXES and FONT_CACHE_DIR not in path.parents:
+                yield path
+
+
+def font_index():
+    """Every face in the brand font folders; persisted by path/mtime/size so only new files are opened"""
+    global _INDEX
+    with _LOCK:
+        if _INDEX is not None:
+            return _INDEX
+        stored = FONT_SUBSET_DIR / INDEX_NAME
+        try:
+            known = json.loads(stored.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError):
+            known = {}
+        index, described = {}, False
+        for path in font_files():
+            stat = path.stat()
+            key = f"{path}|{stat.st_mtime_ns}|{stat.st_size}"
+            if key not in known:
+                described = True
+                try:
+                    count = 1
+                    if path.suffix.lower() == '.ttc':
+                        from fontTools.ttLib import TTCollection
+                        count = len(TTCollection(path, lazy=True).fonts)
+                    known[key] = [_describe_font(path, i) for i in range(count)]
+                except Exception as e:
+                    print(f"⚠️  Unreadable font {path.name}: {type(e).__name__}: {e}")
+                    known[key] = []
+            index[key] = known[key]
+        if described or len(index) != len(known):  # New, changed or removed font files
+            FONT_SUBSET_DIR.mkdir(parents=True, exist_ok=True)
+            partial = stored.with_suffix(f'.{os.getpid()}.tmp')
+            partial.write_text(json.dumps(index), encoding='utf-8')
+            os.replace(partial, stored)
+        _INDEX = [face for faces in index.values() for face in faces]
+        return _INDEX
+
+
+def _fontconfig_face(family, bold, italic):
+    """fc-match for the face, or None when fontconfig is missing or only offers a substitute"""
+    fc_match = shutil.which('fc-match')
+    if not fc_match:
+        return None
+    pattern = f"{family}:weight={200 if bold else 80}:slant={100 if italic else 0}"
+    try:
+        result = subprocess.run([fc_match, '-f', '%{family}\t%{file}\t%{index}', pattern], capture_output=True,
+                                text=True, timeout=FC_TIMEOUT)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    families, path, index = (result.stdout.split('\t') + ['', '', ''])[:3]
+    if family.lower() not in [f.strip().lower() for f in families.split(',')] or not Path(path).is_file():
+        return None
+    try:
+        return _describe_font(path, int(index or 0))
+    except Exception:
+        return None
+
+
+def find_font(family, bold=False, italic=False):
+    """Index entry of the closest face of family (brand folders first, then fontconfig), or None"""
+    key = (family.lower(), bold, italic)
+    if key in _RESOLVED:
+        return _RESOLVED[key]
+    weight = 700 if bold else 400
+    candidates = [f for f in font_index() if f['family'].lower() == family.lower()]
+
+    def distance(face):
+        wght = face['axes'].get('wght')
+        weight_gap = 0 if wght and wght[0] <= weight <= wght[2] else abs(face['weight'] - weight)
+        italic_gap = 0 if face['italic'] == italic or 'ital' in face['axes'] or 'slnt' in face['axes'] else 1000
+        return italic_gap + weight_gap
+
+    face = min(candidates, key=distance) if candidates else _fontconfig_face(family, bold, italic)
+    if face and candidates and distance(face) >= MAX_WEIGHT_GAP:
+        face = None  # No such face: better the converter synthesises bold/italic than embed the wrong one
+    _RESOLVED[key] = face
+    return face
+
+
+def embeddable(face):
+    """(allowed, subsetting allowed) from the OS/2 fsType licence bits"""
+    fs_type = face['fs_type']
+    allowed = not (fs_type & FS_TYPE_RESTRICTED and not fs_type & 0x000C) and not fs_type & FS_TYPE_BITMAP_ONLY
+    return allowed, not fs_type & FS_TYPE_NO_SUBSETTING
+
+
+# === SUBSETS ================================================================
+
+def _face_key(face, bold, italic):
+    stat = Path(face['path']).stat()
+    return hashlib.sha256(f"{face['path']}|{face['index']}|{stat.st_mtime_ns}|{stat.st_size}|{bold}|{italic}"
+                          .encode('utf-8')).hexdigest()[:16]
+
+
+def _glyph_key(chars):
+    return hashlib.sha256(''.join(sorted(chars)).encode('utf-8')).hexdigest()[:16]
+
+
+def _build_subset(face, chars, bold, italic, subset=True):
+    """sfnt bytes: the face instanced at bold/italic (variable fonts) and cut down to chars"""
+    from fontTools import subset as ftsubset
+    from fontTools.ttLib import TTFont
+
+    font = TTFont(face['path'], fontNumber=face['index'])
+    if face['axes']:
+        from fontTools.varLib import instancer
+
+        location = {tag: default for tag, (_, default, _) in face['axes'].items()}
+        if 'wght' in location:
+            low, _, high = face['axes']['wght']
+            location['wght'] = min(max(700 if bold else 400, low), high)
+        if 'ital' in location:
+            location['ital'] = 1 if italic else 0
+        font = instancer.instantiateVariableFont(font, location)
+    if subset:
+        import logging
+        logging.getLogger('fontTools.subset').setLevel(logging.ERROR)  # "FFTM NOT subset"-style notices per font
+
+        options = ftsubset.Options()
+        options.layout_features = ['*']  # Keep kerning and ligatures
+        options.name_IDs = ['*']
+        options.name_languages = ['*']
+        options.notdef_outline = True
+        subsetter = ftsubset.Subsetter(options)
+        subsetter.populate(text=''.join(sorted(chars)))
+        subsetter.subset(font)
+    font.flavor = None
+    out = BytesIO()
+    font.save(out)
+    return out.getvalue()
+
+
+def subset_font(face, chars, bold=False, italic=False):
+    """(bytes, cached) for face cut down to chars, from FONT_SUBSET_DIR when built before"""
+    _, can_subset = embeddable(face)
+    glyph_key = _glyph_key(chars) if can_subset else 'full'
+    key = f"{_face_key(face, bold, italic)}_{glyph_key}"
+    with _LOCK:
+        blob = _SUBSETS.get(key)
+    if blob is not None:
+        return blob, True
+    stored = FONT_SUBSET_DIR / f"{key}{Path(face['path']).suffix.lower().replace('.ttc', '.ttf')}"
+    cached = stored.exists()
+    if cached:
+        blob = stored.read_bytes()
+    else:
+        blob = _build_subset(face, chars, bold, italic, can_subset)
+        stored.parent.mkdir(parents=True, exist_ok=True)
+        partial = stored.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        partial.write_bytes(blob)
+        os.replace(partial, stored)
+    with _LOCK:
+        _SUBSETS[key] = blob
+    return blob, cached
+
+
+# === DOCUMENT ===============================================================
+
+class _StyleResolver:
+    """Font family, bold and italic of a run through rPr → character style → paragraph style → defaults"""
+
+    def __init__(self, doc):
+        from docx.oxml.ns import qn
+
+        self.qn = qn
+        styles = doc.styles.element
+        self.styles = {}
+        for style in styles.findall(qn('w:style')):
+            based = style.find(qn('w:basedOn'))
+            self.styles[style.get(qn('w:styleId'))] = (based.get(qn('w:val')) if based is not None else None,
+                                                       self.props(style.find(qn('w:rPr'))))
+        self.default_paragraph = next((s.get(qn('w:styleId')) for s in styles.findall(qn('w:style'))
+                                       if s.get(qn('w:type')) == 'paragraph' and s.get(qn('w:default')) in ('1', 'true')),
+                                      None)
+        defaults = styles.find(f"{qn('w:docDefaults')}/{qn('w:rPrDefault')}/{qn('w:rPr')}")
+        self.defaults = self.props(defaults)
+
+    def props(self, rPr):
+        """(family, bold, italic) set directly on an rPr; None where it inherits"""
+        qn = self.qn
+        if rPr is None:
+            return None, None, None
+        fonts = rPr.find(qn('w:rFonts'))
+        family = (fonts.get(qn('w:ascii')) or fonts.get(qn('w:hAnsi'))) if fonts is not None else None
+
+        def toggle(tag):
+            element = rPr.find(qn(tag))
+            return None if element is None else element.get(qn('w:val'), 'true') not in ('0', 'false', 'off')
+
+        return family, toggle('w:b'), toggle('w:i')
+
+    def chain(self, style_id):
+        seen = set()
+        while style_id and style_id in self.styles and style_id not in seen:
+            seen.add(style_id)
+            based, props = self.styles[style_id]
+            yield props
+            style_id = based
+
+    def body_family(self):
+        """Family of text typed into an unstyled paragraph"""
+        for family, _, _ in [*self.chain(self.default_paragraph), self.defaults]:
+            if family:
+                return family
+        return None
+
+    def resolve(self, run, paragraph_style):
+        """(family, bold, italic) for a w:r element; family None for theme fonts"""
+        qn = self.qn
+        rPr = run.find(qn('w:rPr'))
+        layers = [self.props(rPr)]
+        character_style = rPr.find(qn('w:rStyle')) if rPr is not None else None
+        if character_style is not None:
+            layers += list(self.chain(character_style.get(qn('w:val'))))
+        layers += list(self.chain(paragraph_style or self.default_paragraph))
+        layers.append(self.defaults)
+        family, bold, italic = None, None, None
+        for layer_family, layer_bold, layer_italic in layers:
+            family = family if family is not None else layer_family
+            bold = bold if bold is not None else layer_bold
+            italic = italic if italic is not None else layer_italic
+        return family, bool(bold), bool(italic)
+
+
+def _story_parts(doc):
+    """The document body plus every header, footer, footnote and endnote part"""
+    from docx.opc.constants import CONTENT_TYPE as CT
+
+    stories = {CT.WML_DOCUMENT_MAIN, CT.WML_HEADER, CT.WML_FOOTER, CT.WML_FOOTNOTES, CT.WML_ENDNOTES}
+    return [part for part in doc.part.package.iter_parts() if part.content_type in stories and hasattr(part, 'element')]
+
+
+def used_glyphs(doc):
+    """{(family, bold, italic): set of characters} for every face the document shows"""
+    from docx.oxml.ns import qn
+
+    resolver = _StyleResolver(doc)
+    faces = {}
+    for part in _story_parts(doc):
+        for paragraph in part.element.iter(qn('w:p')):
+            style = paragraph.find(f"{qn('w:pPr')}/{qn('w:pStyle')}")
+            style_id = style.get(qn('w:val')) if style is not None else None
+            has_field = paragraph.find(f".//{qn('w:fldSimple')}") is not None or \
+                paragraph.find(f".//{qn('w:fldChar')}") is not None
+            for run in paragraph.iter(qn('w:r')):
+                text = ''.join(t.text or '' for t in run.iter(qn('w:t')))
+                if not text and not has_field:
+                    continue
+                family, bold, italic = resolver.resolve(run, style_id)
+                if family:
+                    faces.setdefault((family, bold, italic), set()).update(text + (FIELD_CHARS if has_field else ''))
+    body_family = resolver.body_family()
+    for (family, bold, italic), chars in faces.items():
+        if family == body_family:
+            chars.update(TYPING_CHARS)
+    return faces
+
+
+def _obfuscate(blob, font_key):
+    """ECMA-376 font obfuscation: the first 32 bytes XOR the fontKey GUID bytes, last to first"""
+    key = bytes.fromhex(font_key.strip('{}').replace('-', ''))[::-1]
+    head = bytes(b ^ key[i % 16] for i, b in enumerate(blob[:32]))
+    return head + blob[32:]
+
+
+def _set_embed_settings(doc):
+    """w:embedTrueTypeFonts and w:saveSubsetFonts, after the print/protection settings per the schema"""
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+
+    settings = doc.settings.element
+    earlier = {qn(f'w:{tag}') for tag in ('writeProtection', 'view', 'zoom', 'removePersonalInformation',
+                                         'removeDateAndTime', 'doNotDisplayPageBoundaries', 'displayBackgroundShape',
+                                         'printPostScriptOverText', 'printFractionalCharacterWidth',
+                                         'printFormsData', 'embedTrueTypeFonts', 'embedSystemFonts')}
+    for tag in ('embedTrueTypeFonts', 'saveSubsetFonts'):
+        if settings.find(qn(f'w:{tag}')) is not None:
+            continue
+        position = next((i for i, child in enumerate(settings) if child.tag not in earlier), len(settings))
+        settings.insert(position, OxmlElement(f'w:{tag}'))
+        earlier.add(qn(f'w:{tag}'))
+
+
+def embed_fonts(doc, subsets):
+    """Add {(family, bold, italic): (sfnt bytes, subsetted)} to doc's fontTable as obfuscated font parts"""
+    from docx.opc.constants import RELATIONSHIP_TYPE as RT
+    from docx.opc.packuri import PackURI
+    from docx.opc.part import Part
+    from docx.opc.oxml import serialize_part_xml
+    from docx.oxml import OxmlElement, parse_xml
+    from docx.oxml.ns import qn
+
+    font_table = doc.part.part_related_by(RT.FONT_TABLE)
+    root = parse_xml(font_table.blob)
+    for slot in [e for name in SLOTS.values() for e in root.iter(qn(f'w:{name}'))]:
+        font_table.drop_rel(slot.get(qn('r:id')))  # Embedded before (e.g. a reopened DOCX): replace, glyphs may differ
+        slot.getparent().remove(slot)
+    package = doc.part.package
+    used = {str(part.partname) for part in package.iter_parts()}
+    number = 1
+    fonts = {f.get(qn('w:name')): f for f in root.findall(qn('w:font'))}
+    for (family, bold, italic), (blob, subsetted) in sorted(subsets.items(), key=lambda item: (
+            item[0][0], list(SLOTS).index(item[0][1:]))):
+        while f'/word/fonts/font{number}.odttf' in used:
+            number += 1
+        partname = f'/word/fonts/font{number}.odttf'
+        used.add(partname)
+        font_key = '{' + str(uuid.UUID(bytes=hashlib.sha256(blob).digest()[:16])).upper() + '}'  # Stable per subset
+        part = Part(PackURI(partname), OBFUSCATED_FONT, _obfuscate(blob, font_key), package)
+        rId = font_table.relate_to(part, RT.FONT)
+        font = fonts.get(family)
+        if font is None:
+            font = fonts[family] = OxmlElement('w:font')
+            font.set(qn('w:name'), family)
+            root.append(font)
+        slot = OxmlElement(f'w:{SLOTS[(bold, italic)]}')
+        slot.set(qn('r:id'), rId)
+        slot.set(qn('w:fontKey'), font_key)
+        if subsetted:
+            slot.set(qn('w:subsetted'), '1')
+        font.append(slot)  # Embed slots close w:font, in Regular/Bold/Italic/BoldItalic order
+    font_table._blob = serialize_part_xml(root)
+    _set_embed_settings(doc)
+    return len(subsets)
+
+
+def embed_used_fonts(doc, glyphs=None):
+    """Subset and embed every face doc uses (or glyphs, collected with used_glyphs()); returns the report"""
+    started = time.perf_counter()
+    subsets, missing, refused, cached = {}, set(), set(), 0
+    for (family, bold, italic), chars in (used_glyphs(doc) if glyphs is None else glyphs).items():
+        face = find_font(family, bold, italic)
+        if face is None:
+            missing.add(f"{family} {SLOTS[(bold, italic)][5:]}")
+            continue
+        allowed, can_subset = embeddable(face)
+        if not allowed:
+            refused.add(family)
+            continue
+        blob, hit = subset_font(face, chars, bold, italic)
+        cached += hit
+        subsets[(family, bold, italic)] = (blob, can_subset)
+    embed_fonts(doc, subsets)
+    return {
+        'faces': sorted(f"{family} {SLOTS[(bold, italic)][5:]}" for family, bold, italic in subsets),
+        'bytes': sum(len(blob) for blob, _ in subsets.values()),
+        'cached': cached,
+        'missing': sorted(missing),
+        'refused': sorted(refused),
+        'ms': round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def describe(report):
+    line = (f"{len(report['faces'])} faces, {report['bytes'] / 1024:.1f} KB "
+            f"({report['cached']} cached) in {report['ms']:.0f} ms")
+    if report['missing']:
+        line += f"; not found: {', '.join(report['missing'])}"
+    if report['refused']:
+        line += f"; licence forbids embedding: {', '.join(report['refused'])}"
+    return line
+
+
+def embed_document_fonts(doc, telemetry=DISABLED, glyphs=None):
+    """Generation hook: embed subsetted fonts before doc.save(); never fails the generation"""
+    if not embedding_enabled():
+        return None
+    try:
+        with telemetry.stage('font_embed') as stage:
+            report = embed_used_fonts(doc, glyphs)
+            stage.update(faces=len(report['faces']), bytes=report['bytes'], cached=report['cached'],
+                         missing=report['missing'])
+    except ImportError as e:
+        print(f"⚠️  Font embedding skipped ({e.name} not installed)")
+        return None
+    except Exception as e:
+        print(f"⚠️  Font embedding failed: {type(e).__name__}: {e}")
+        return None
+    print(f"🔤 Fonts embedded: {describe(report)}")
+    return report
+
+
+# === WARM-UP ================================================================
+
+def warm_fontconfig():
+    """Bring fontconfig's cache up to date (only stale folders are rescanned); returns ms, or None without it"""
+    fc_cache = shutil.which('fc-cache')
+    if not fc_cache:
+        return None
+    started = time.perf_counter()
+    try:
+        subprocess.run([fc_cache], capture_output=True, timeout=FC_TIMEOUT)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+def warm_fonts(families=BRAND_FONTS, telemetry=DISABLED):
+    """Start-up step: fontconfig cache, every face of families resolved, body-font subsets built
+
+    Returns a report; never raises, so a service can always call it.
+    """
+    started = time.perf_counter()
+    report = {'fontconfig_ms': None, 'found': [], 'missing': [], 'subsets': 0}
+    try:
+        with telemetry.stage('font_warmup') as stage:
+            report['fontconfig_ms'] = warm_fontconfig()
+            for family in families:
+                faces = {(bold, italic): find_font(family, bold, italic) for bold, italic in SLOTS}
+                if not any(faces.values()):
+                    report['missing'].append(family)
+                    continue
+                report['found'].append(family)
+                if family not in BODY_FONTS:
+                    continue
+                for (bold, italic), face in faces.items():
+                    if face and embeddable(face)[0]:
+                        subset_font(face, set(TYPING_CHARS), bold, italic)
+                        report['subsets'] += 1
+            stage.update(**{k: v for k, v in report.items()})
+    except ImportError as e:
+        report['error'] = f"{e.name} not installed"
+    except Exception as e:
+        report['error'] = f"{type(e).__name__}: {e}"
+    report['ms'] = round((time.perf_counter() - started) * 1000, 1)
+    return report
+
+
+def print_warm_report(report):
+    if report.get('error'):
+        print(f"⚠️  Font warm-up incomplete: {report['error']}")
+    fontconfig = f"{report['fontconfig_ms']:.0f} ms" if report['fontconfig_ms'] is not None else 'not installed'
+    print(f"🔤 Fonts warm in {report['ms']:.0f} ms (fontconfig: {fontconfig}): {len(report['found'])} families, "
+          f"{report['subsets']} body subsets")
+    if report['missing']:
+        print(f"   Not found (converters will substitute): {', '.join(report['missing'])}")
+
+
+def embedded_fonts(docx_path):
+    """[(family, slot, bytes, subsetted)] embedded in a DOCX"""
+    import zipfile
+    from xml.etree import ElementTree
+
+    w = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+    r = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+    with zipfile.ZipFile(docx_path) as archive:
+        if 'word/fontTable.xml' not in archive.namelist():
+            return []
+        table = ElementTree.fromstring(archive.read('word/fontTable.xml'))
+        try:
+            rels = ElementTree.fromstring(archive.read('word/_rels/fontTable.xml.rels'))
+        except KeyError:
+            return []
+        targets = {rel.get('Id'): rel.get('Target') for rel in rels}
+        found = []
+        for font in table.iter(f'{w}font'):
+            for slot in SLOTS.values():
+                element = font.find(f'{w}{slot}')
+                if element is not None:
+                    size = archive.getinfo(f"word/{targets[element.get(f'{r}id')]}").file_size
+                    found.append((font.get(f'{w}name'), slot[5:], size, element.get(f'{w}subsetted') in ('1', 'true')))
+    return found
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Embed subsetted brand fonts into DOCX files")
+    parser.add_argument('action', choices=['embed', 'warm', 'list'])
+    parser.add_argument('docx', nargs='*', type=Path, metavar='DOCX')
+    parser.add_argument('--family', action='append', help="Warm these families instead of the brand fonts")
+    parser.add_argument('--telemetry', nargs='?', const='1', metavar='PATH',
+                        help="Append JSONL stage events to PATH ('-' = stdout, default: Reports/pipeline_telemetry.jsonl)")
+    parser.add_argument('--quiet', action='store_true', help="Suppress the console banners")
+    args = parser.parse_intermixed_args(argv)
+    if args.action != 'warm' and not args.docx:
+        parser.error(f"{args.action} needs at least one DOCX")
+
+    telemetry = Telemetry.from_env('AHK', args.telemetry, args.quiet)
+    failed = 0
+    with telemetry.console():
+        if args.action == 'warm':
+            report = warm_fonts(args.family or BRAND_FONTS, telemetry)
+            print_warm_report(report)
+            return 1 if report.get('error') else 0
+        for path in args.docx:
+            try:
+                if args.action == 'list':
+                    fonts = embedded_fonts(path)
+                    print(f"📄 {path.name}: {len(fonts)} embedded faces")
+                    for family, slot, size, subsetted in fonts:
+                        print(f"   {family} {slot}: {size / 1024:.1f} KB{' (subset)' if subsetted else ''}")
+                    continue
+                from docx import Document
+
+                doc = Document(path)
+                with telemetry.stage('font_embed', source=path.name) as stage:
+                    report = embed_used_fonts(doc, glyphs)
+                    stage.update(faces=len(report['faces']), bytes=report['bytes'], missing=report['missing'])
+                    partial = path.with_suffix(f'.{os.getpid()}.tmp.docx')
+                    doc.save(partial)
+                    os.replace(partial, path)
+                    stage.add_output(path)
+                print(f"✅ {path.name}: {describe(report)}")
+            except Exception as e:
+                failed += 1
+                print(f"❌ {path.name}: {type(e).__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
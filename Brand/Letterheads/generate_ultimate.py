@@ -5,16 +5,22 @@ BEST OF BOTH WORLDS
 """
 
 import asyncio
-from playwright.async_api import async_playwright
-from docx import Document
-from docx.shared import Pt, RGBColor, Mm
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
 import os
 
+from brand_paths import LEGENDARY_DOCX, LEGENDARY_HTML, LEGENDARY_PDF
+from bundle_html import bundle_for_render, load_for_print
+from font_embed import embed_document_fonts
+from pdf_postprocess import postprocess_pdf
+from previews import eager_previews
+from telemetry import Telemetry
+
+telemetry = Telemetry.from_env()
+
 def add_top_border(paragraph, color='D4AF37', size=12):
     """Add a top border to a paragraph"""
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+
     pPr = paragraph._element.get_or_add_pPr()
     pBdr = OxmlElement('w:pBdr')
     top = OxmlElement('w:top')
@@ -25,8 +31,12 @@ def add_top_border(paragraph, color='D4AF37', size=12):
     pBdr.append(top)
     pPr.append(pBdr)
 
-def create_docx_with_footer():
+def create_docx_with_footer(docx_path=None):
     """Create DOCX with styled header and proper Word footer"""
+    # python-docx is imported here so `brand.py render-pdf` only loads Playwright
+    from docx import Document
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Mm, Pt, RGBColor
     
     # Create new document
     doc = Document()
@@ -145,48 +155,34 @@ def create_docx_with_footer():
     run.font.color.rgb = RGBColor(153, 153, 153)
     
     # Save
-    docx_path = 'AHKStrategies_Letterhead_LEGENDARY.docx'
+    docx_path = docx_path or LEGENDARY_DOCX
+    embed_document_fonts(doc)
     doc.save(docx_path)
     return docx_path
 
-async def html_to_pdf_to_docx():
+async def html_to_pdf_to_docx(html_path=LEGENDARY_HTML, pdf_path=LEGENDARY_PDF, docx_path=LEGENDARY_DOCX):
     """Generate both PDF (animated) and DOCX (editable) versions"""
     
-    html_path = r"C:\Users\ashra\OneDrive\Desktop\AHK_Dashboard_v1\Brand\Letterheads\letterhead_legendary.html"
-    pdf_path = r"C:\Users\ashra\OneDrive\Desktop\AHK_Dashboard_v1\Brand\Letterheads\AHKStrategies_Letterhead_LEGENDARY.pdf"
-    
     print("=" * 100)
     print("🔥 LEGENDARY LETTERHEAD GENERATION - PERFECTION IN TWO FORMATS")
     print("=" * 100)
     print("📄 Step 1: Rendering HTML with Chromium (cinema-quality with animations)...")
     
-    async with async_playwright() as p:
-        # Launch browser
-        browser = await p.chromium.launch()
-        page = await browser.new_page()
-        
-        # Load HTML file
-        await page.goto(f'file:///{html_path}')
-        
-        # Wait for fonts and animations to load
-        await page.wait_for_timeout(3000)
-        
-        # Generate PDF with maximum quality
-        await page.pdf(
-            path=pdf_path,
-            format='A4',
-            print_background=True,
-            prefer_css_page_size=True,
-            margin={'top': '0mm', 'right': '0mm', 'bottom': '0mm', 'left': '0mm'}
-        )
-        
-        await browser.close()
+    render_html = bundle_for_render(html_path, telemetry)  # Fonts and images inline: no network during the render
+    with telemetry.stage('render_pdf') as stage:
+        stage.add_input(render_html)
+        await _render_pdf(render_html, pdf_path)
+        stage.add_output(pdf_path)
+    postprocess_pdf(pdf_path, telemetry)  # AHK_PDF_OPTIMIZE=1: dedupe, recompress, linearise
+    eager_previews(pdf_path, telemetry)  # Dashboard thumbnails, cached by content hash
     
     print(f"✅ Step 1 Complete: Animated PDF with quantum neural design")
     print(f"📄 Step 2: Creating clean editable DOCX with proper footer...")
     
     # Create DOCX with proper footer
-    docx_path = create_docx_with_footer()
+    with telemetry.stage('create_docx') as stage:
+        docx_path = create_docx_with_footer(docx_path)
+        stage.add_output(docx_path)
     
     print(f"✅ Step 2 Complete: DOCX with editable content area and Word footer")
     print("\n" + "=" * 100)
@@ -203,5 +199,29 @@ async def html_to_pdf_to_docx():
     print("🔥 STATUS: READY TO DOMINATE THE UNIVERSE")
     print("=" * 100)
 
+async def _render_pdf(html_path, pdf_path):
+    """Print the HTML letterhead to PDF with Chromium"""
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        # Launch browser
+        browser = await p.chromium.launch()
+        page = await browser.new_page()
+        
+        # Load HTML file, wait for its fonts and settle the entrance animations
+        await load_for_print(page, html_path)
+        
+        # Generate PDF with maximum quality
+        await page.pdf(
+            path=str(pdf_path),
+            format='A4',
+            print_background=True,
+            prefer_css_page_size=True,
+            margin={'top': '0mm', 'right': '0mm', 'bottom': '0mm', 'left': '0mm'}
+        )
+        
+        await browser.close()
+
 if __name__ == "__main__":
-    asyncio.run(html_to_pdf_to_docx())
+    with telemetry.console():
+        asyncio.run(html_to_pdf_to_docx())
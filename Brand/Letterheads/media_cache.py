@@ -0,0 +1,154 @@
+"""
+AHKStrategies Brand Media Cache
+Process-wide cache of the brand images (logo, banners) the letterhead
+generators embed. Each file is read, hashed and header-parsed once per
+process; after that every new document gets its image part straight from
+memory, with no disk read and no decode.
+
+The embedded bytes are the losslessly recompressed PNG (zlib level 9, about 8%
+smaller for the banners). That costs seconds per image, so it is done once per
+machine and kept in MediaCache/ (AHK_MEDIA_CACHE), keyed by source path, mtime
+and size; a process then reads the final bytes instead of the source.
+
+run.add_picture(path) in python-docx re-reads the file, re-computes its SHA-1
+and re-parses the PNG header for every document. add_picture(run, path) here
+takes the same arguments and writes the same inline shape from the cached
+python-docx Image (bytes, sha1, pixel size, DPI). The image part is not
+byte-identical to add_picture() output: it holds the recompressed PNG.
+Entries are keyed by path, mtime and size, so a regenerated banner is picked
+up. Recompression runs under a per-image lock, so one slow banner never
+blocks lookups of the others.
+
+    from media_cache import add_picture
+    add_picture(run, BANNER_TRANSPARENT, width=Cm(14))
+
+AHK_MEDIA_OPTIMIZE=0 embeds the original bytes instead of the recompressed PNG.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from io import BytesIO
+from pathlib import Path
+
+from brand_paths import MEDIA_CACHE_DIR
+
+_CACHE = {}
+_LOADING = {}  # key → lock held while that image is read and recompressed
+_LOCK = threading.Lock()
+_STATS = {'hits': 0, 'misses': 0, 'bytes_saved': 0, 'load_ms': 0.0}
+
+
+def optimize_enabled():
+    return os.environ.get("AHK_MEDIA_OPTIMIZE", "1") != "0"
+
+
+def optimize_png(blob):
+    """Lossless PNG recompression (Pillow optimize); keeps DPI, ICC profile and transparency"""
+    from PIL import Image
+
+    with Image.open(BytesIO(blob)) as image:
+        if image.format != 'PNG':
+            return blob
+        options = {key: image.info[key] for key in ('dpi', 'icc_profile', 'transparency') if key in image.info}
+        out = BytesIO()
+        image.save(out, 'PNG', optimize=True, **options)
+    return out.getvalue() if out.tell() < len(blob) else blob
+
+
+def final_bytes(path, stat):
+    """(bytes to embed, source size): the recompressed copy from MEDIA_CACHE_DIR, made on first use"""
+    if not optimize_enabled():
+        return path.read_bytes(), stat.st_size
+    key = hashlib.sha256(f"{path}|{stat.st_mtime_ns}|{stat.st_size}".encode('utf-8')).hexdigest()[:32]
+    stored = Path(MEDIA_CACHE_DIR) / f"{key}{path.suffix.lower()}"
+    if stored.exists():
+        return stored.read_bytes(), stat.st_size
+    blob = optimize_png(path.read_bytes())
+    stored.parent.mkdir(parents=True, exist_ok=True)
+    partial = stored.with_suffix(f'.{os.getpid()}.tmp')
+    partial.write_bytes(blob)
+    os.replace(partial, stored)
+    return blob, stat.st_size
+
+
+def load_image(path):
+    """The cached python-docx Image for path (bytes, sha1, px size, DPI all precomputed)"""
+    from docx.image.image import Image
+
+    path = Path(path).resolve()
+    stat = path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _LOCK:
+        image = _CACHE.get(key)
+        if image is not None:
+            _STATS['hits'] += 1
+            return image
+        loading = _LOADING.setdefault(key, threading.Lock())
+    with loading:  # Threads wanting the same image wait here; every other lookup goes on
+        with _LOCK:
+            image = _CACHE.get(key)
+            if image is not None:  # Loaded by the thread we waited for
+                _STATS['hits'] += 1
+                return image
+        try:
+            started = time.perf_counter()
+            blob, source_size = final_bytes(path, stat)
+            image = Image.from_blob(blob)
+            image._filename = path.name  # from_blob() names it image.<ext>; keep the docPr name add_picture() writes
+            image.sha1  # Computed now, so documents only compare hashes
+            with _LOCK:
+                for stale in [k for k in _CACHE if k[0] == key[0]]:
+                    del _CACHE[stale]
+                _CACHE[key] = image
+                _STATS['misses'] += 1
+                _STATS['bytes_saved'] += source_size - len(blob)
+                _STATS['load_ms'] += (time.perf_counter() - started) * 1000
+            return image
+        finally:
+            with _LOCK:
+                _LOADING.pop(key, None)
+
+
+def image_part(package, image):
+    """The package's part for image: reused when the document already has it, else created from memory"""
+    from docx.opc.packuri import PackURI
+    from docx.parts.image import ImagePart
+
+    image_parts = package.image_parts
+    for part in image_parts:
+        if part.sha1 == image.sha1:
+            return part
+    used = {part.partname for part in image_parts}
+    number = next(n for n in range(1, len(used) + 2) if f'/word/media/image{n}.{image.ext}' not in used)
+    part = ImagePart.from_image(image, PackURI(f'/word/media/image{number}.{image.ext}'))
+    image_parts.append(part)
+    return part
+
+
+def add_picture(run, path, width=None, height=None):
+    """Drop-in for run.add_picture(path, width, height) backed by the cache; returns the InlineShape"""
+    from docx.opc.constants import RELATIONSHIP_TYPE as RT
+    from docx.oxml.shape import CT_Inline
+    from docx.shape import InlineShape
+
+    image = load_image(path)
+    story = run.part
+    rId = story.relate_to(image_part(story.package, image), RT.IMAGE)
+    cx, cy = image.scaled_dimensions(width, height)
+    inline = CT_Inline.new_pic_inline(story.next_id, rId, image.filename, cx, cy)
+    run._r.add_drawing(inline)
+    return InlineShape(inline)
+
+
+def stats():
+    """Hit/miss counters, entries held and bytes saved by recompression"""
+    with _LOCK:
+        return {**_STATS, 'load_ms': round(_STATS['load_ms'], 1), 'entries': len(_CACHE),
+                'cached_bytes': sum(len(image.blob) for image in _CACHE.values())}
+
+
+def clear():
+    with _LOCK:
+        _CACHE.clear()
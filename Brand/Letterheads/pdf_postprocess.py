@@ -0,0 +1,214 @@
+"""
+AHKStrategies PDF Post-Processing
+Shrinks generated PDFs and makes them open fast from OneDrive and web links:
+identical streams (image and form XObjects, embedded font programs) and then
+identical font, font-descriptor and graphics-state dictionaries are merged into
+one object each, resources the pages never use are dropped, Flate streams are
+recompressed at level 9 and packed into object streams, and the file is written
+linearised ("fast web view"), so a viewer can show page 1 before the rest
+arrives. Everything is lossless: JPEG images are never re-encoded.
+
+Chromium's page.pdf() and LibreOffice both repeat resources (a font or banner
+per page or per section); merging happens by content hash, so only byte-identical
+objects are merged.
+
+Optional in the generators: AHK_PDF_OPTIMIZE=1 runs it on every PDF they write
+(generate_ultimate, convert_to_pdf, render_memos --pdf, brand.py, the brand
+daemon), before previews are built. Needs pikepdf (qpdf).
+
+    report = optimize_pdf("AHKStrategies_Letterhead_LEGENDARY.pdf")
+    report['bytes_saved'], report['duplicates'], report['ms']
+
+Usage:
+    python pdf_postprocess.py PDF [PDF ...] [--output PATH] [--no-dedupe] [--no-linearize]
+"""
+
+import hashlib
+import os
+import sys
+import time
+from pathlib import Path
+
+from telemetry import DISABLED, Telemetry
+
+# Dictionaries merged once the streams they point at are merged (streams of any type are always merged)
+DEDUPE_TYPES = frozenset(('/Font', '/FontDescriptor', '/ExtGState', '/Pattern', '/Shading', '/XObject'))
+MAX_PASSES = 6  # Streams, then descriptors, then fonts, then whatever referenced those fonts
+FLATE_LEVEL = 9
+
+
+def optimize_enabled():
+    return os.environ.get("AHK_PDF_OPTIMIZE") == "1"
+
+
+def _token(value):
+    import pikepdf
+
+    if isinstance(value, pikepdf.Object):
+        return value.unparse(resolved=False)  # Indirect values as 'N G R', so merged targets compare equal
+    return repr(value).encode()
+
+
+def _fingerprint(obj):
+    """Content hash of a stream (raw bytes + dictionary minus /Length) or a dictionary; None if not mergeable"""
+    import pikepdf
+
+    if isinstance(obj, pikepdf.Stream):
+        digest = hashlib.sha256(obj.read_raw_bytes())
+        items = obj.stream_dict.items()
+    elif isinstance(obj, pikepdf.Dictionary) and obj.get('/Type') in DEDUPE_TYPES:
+        digest = hashlib.sha256(b'dict')
+        items = obj.items()
+    else:
+        return None
+    for key, value in sorted(items, key=lambda item: item[0]):
+        if key != '/Length':
+            digest.update(key.encode() + b' ' + _token(value) + b'\n')
+    return digest.hexdigest()
+
+
+def _redirect(container, replacements):
+    """Point references to merged objects at the kept copy; recurses through direct arrays/dictionaries"""
+    import pikepdf
+
+    if isinstance(container, (pikepdf.Dictionary, pikepdf.Stream)):
+        entries = [(key, container[key]) for key in container.keys()]
+    elif isinstance(container, pikepdf.Array):
+        entries = list(enumerate(container))
+    else:
+        return 0
+    changed = 0
+    for key, value in entries:
+        if not isinstance(value, pikepdf.Object):
+            continue
+        if value.is_indirect:
+            keep = replacements.get(value.objgen)
+            if keep is not None:
+                container[key] = keep
+                changed += 1
+        else:
+            changed += _redirect(value, replacements)
+    return changed
+
+
+def dedupe_objects(pdf):
+    """Merge byte-identical objects until nothing changes; returns how many were merged"""
+    merged = 0
+    for _ in range(MAX_PASSES):
+        seen, replacements = {}, {}
+        for obj in pdf.objects:
+            fingerprint = _fingerprint(obj)
+            if fingerprint is None:
+                continue
+            keep = seen.setdefault(fingerprint, obj)
+            if keep.objgen != obj.objgen:
+                replacements[obj.objgen] = keep
+        if not replacements:
+            break
+        for obj in list(pdf.objects):
+            if obj.objgen not in replacements:  # Merged objects are unreachable after this pass
+                _redirect(obj, replacements)
+        _redirect(pdf.trailer, replacements)
+        merged += len(replacements)
+    return merged
+
+
+def optimize_pdf(pdf_path, output=None, dedupe=True, linearize=True):
+    """Post-process pdf_path into output (default: in place, atomically); returns the report"""
+    import pikepdf
+
+    started = time.perf_counter()
+    pdf_path = Path(pdf_path)
+    output = Path(output or pdf_path)
+    before = pdf_path.stat().st_size
+    pikepdf.settings.set_flate_compression_level(FLATE_LEVEL)
+    partial = output.with_suffix(f'.{os.getpid()}.tmp.pdf')
+    with pikepdf.open(pdf_path) as pdf:
+        objects = len(pdf.objects)
+        merged = dedupe_objects(pdf) if dedupe else 0
+        pdf.remove_unreferenced_resources()
+        pdf.save(partial, linearize=linearize, compress_streams=True, recompress_flate=True,
+                 stream_decode_level=pikepdf.StreamDecodeLevel.generalized,
+                 object_stream_mode=pikepdf.ObjectStreamMode.generate)
+        pages = len(pdf.pages)
+    after = partial.stat().st_size
+    os.replace(partial, output)
+    return {
+        'source': pdf_path.name,
+        'output': str(output),
+        'pages': pages,
+        'objects': objects,
+        'duplicates': merged,
+        'bytes_before': before,
+        'bytes_after': after,
+        'bytes_saved': before - after,
+        'linearized': linearize,
+        'ms': round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def describe(report):
+    change = report['bytes_after'] - report['bytes_before']  # Negative when the file shrank
+    percent = change / report['bytes_before'] * 100 if report['bytes_before'] else 0
+    return (f"{report['bytes_before'] / 1024:.1f} KB → {report['bytes_after'] / 1024:.1f} KB "
+            f"({change / 1024:+.1f} KB, {percent:+.1f}%), "
+            f"{report['duplicates']} duplicates merged"
+            f"{', linearised' if report['linearized'] else ''} in {report['ms']:.0f} ms")
+
+
+def postprocess_pdf(pdf_path, telemetry=DISABLED):
+    """Generation hook: optimise a freshly written PDF in place when AHK_PDF_OPTIMIZE=1; never fails the generation"""
+    if not optimize_enabled() or not Path(pdf_path).exists():
+        return None
+    try:
+        with telemetry.stage('pdf_postprocess', source=Path(pdf_path).name) as stage:
+            report = optimize_pdf(pdf_path)
+            stage.update(**{k: report[k] for k in ('pages', 'duplicates', 'bytes_before', 'bytes_after', 'bytes_saved')})
+    except ImportError as e:
+        print(f"⚠️  PDF post-processing skipped ({e.name} not installed)")
+        return None
+    except Exception as e:
+        print(f"⚠️  PDF post-processing failed for {Path(pdf_path).name}: {type(e).__name__}: {e}")
+        return None
+    print(f"🗜️  PDF optimised: {describe(report)}")
+    return report
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Deduplicate, recompress and linearise generated PDFs")
+    parser.add_argument('pdfs', nargs='+', type=Path, metavar='PDF')
+    parser.add_argument('--output', type=Path, help="Write here instead of in place (one PDF only)")
+    parser.add_argument('--no-dedupe', dest='dedupe', action='store_false', help="Skip merging identical objects")
+    parser.add_argument('--no-linearize', dest='linearize', action='store_false', help="Skip fast web view")
+    parser.add_argument('--telemetry', nargs='?', const='1', metavar='PATH',
+                        help="Append JSONL stage events to PATH ('-' = stdout, default: Reports/pipeline_telemetry.jsonl)")
+    parser.add_argument('--quiet', action='store_true', help="Suppress the console banners")
+    args = parser.parse_args(argv)
+    if args.output and len(args.pdfs) > 1:
+        parser.error("--output needs a single PDF")
+
+    telemetry = Telemetry.from_env('AHK', args.telemetry, args.quiet)
+    failed, saved = 0, 0
+    with telemetry.console():
+        for pdf in args.pdfs:
+            try:
+                with telemetry.stage('pdf_postprocess', source=pdf.name) as stage:
+                    report = optimize_pdf(pdf, args.output, args.dedupe, args.linearize)
+                    stage.update(**{k: report[k] for k in ('pages', 'duplicates', 'bytes_before', 'bytes_after',
+                                                           'bytes_saved')})
+                    stage.add_output(report['output'])
+            except Exception as e:
+                failed += 1
+                print(f"❌ {pdf.name}: {type(e).__name__}: {e}")
+                continue
+            saved += report['bytes_saved']
+            print(f"✅ {pdf.name}: {describe(report)}")
+        if len(args.pdfs) > 1:
+            print(f"\n🗜️  Total saved: {saved / 1024:.1f} KB")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+AHKStrategies PDF Previews
+Rasterises the first page(s) of a generated PDF at several widths into a
+content-hash cache (Previews/ab/<sha256>/p1_w320.webp + previews.json), so the
+dashboard only ever reads small cached images and never renders on request
+
+The generators call eager_previews() as soon as they write a PDF
+(generate_ultimate, convert_to_pdf, render_memos --pdf, brand.py, the brand
+daemon); AHK_PREVIEWS=0 turns that off. pdfium is not thread-safe, so each page
+is rendered once, at the largest width, under a lock; the downscales and the
+WebP/PNG encodes (Pillow releases the GIL for both) run in a thread pool while
+the next page renders.
+
+    manifest = ensure_previews("AHKStrategies_Letterhead_LEGENDARY.pdf")
+    manifest['images']   # [{'page': 1, 'width': 320, 'height': 453, 'file': 'p1_w320.webp'}, ...]
+
+Usage:
+    python previews.py PDF [PDF ...] [--widths 160,320,640] [--pages N] [--format webp|png] [--force]
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from brand_paths import PREVIEW_DIR
+from telemetry import DISABLED, Telemetry
+
+PREVIEW_WIDTHS = (160, 320, 640)
+PREVIEW_PAGES = 1
+PREVIEW_FORMAT = 'webp'
+MANIFEST_NAME = 'previews.json'
+WEBP_QUALITY = 82
+
+_PDFIUM_LOCK = threading.Lock()  # Shared by every caller in the process (daemon worker threads included)
+
+
+def previews_enabled():
+    return os.environ.get("AHK_PREVIEWS", "1") != "0"
+
+
+def preview_dir(digest, root=PREVIEW_DIR):
+    """'ab/<sha256>/': one 256-way level keeps the cache root small"""
+    return Path(root) / digest[:2] / digest
+
+
+def load_manifest(digest, root=PREVIEW_DIR):
+    path = preview_dir(digest, root) / MANIFEST_NAME
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _covers(manifest, widths, pages, fmt):
+    """The cached set already holds every requested image"""
+    if not manifest or manifest['format'] != fmt:
+        return False
+    have = {(image['page'], image['width']) for image in manifest['images']}
+    wanted_pages = min(pages, manifest['page_count'])
+    return all((page, width) in have for page in range(1, wanted_pages + 1) for width in widths)
+
+
+def _save(image, width, target, fmt):
+    """Downscale (Lanczos) and encode one preview; runs on a pool thread"""
+    from PIL import Image
+
+    if image.width != width:
+        image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+    partial = target.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+    if fmt == 'webp':
+        image.save(partial, 'WEBP', quality=WEBP_QUALITY, method=4)
+    else:
+        image.save(partial, 'PNG', compress_level=6)
+    os.replace(partial, target)
+    return {'width': width, 'height': image.height, 'file': target.name, 'bytes': target.stat().st_size}
+
+
+def ensure_previews(pdf_path, widths=PREVIEW_WIDTHS, pages=PREVIEW_PAGES, fmt=PREVIEW_FORMAT, root=PREVIEW_DIR,
+                    force=False, workers=None):
+    """Cached previews for pdf_path, rendering only on a cache miss; returns the manifest
+
+    The manifest gains 'cached': True when nothing had to be rendered.
+    """
+    import pypdfium2
+    from PIL import features
+
+    from artifact_registry import content_hash
+
+    if fmt == 'webp' and not features.check('webp'):
+        fmt = 'png'  # Pillow built without libwebp
+    widths = sorted(set(widths), reverse=True)
+    digest = content_hash(pdf_path)
+    manifest = load_manifest(digest, root)
+    if not force and _covers(manifest, widths, pages, fmt):
+        return {**manifest, 'cached': True}
+
+    started = time.perf_counter()
+    directory = preview_dir(digest, root)
+    directory.mkdir(parents=True, exist_ok=True)
+    images = []
+    with ThreadPoolExecutor(max_workers=workers or min(len(widths) * pages, os.cpu_count() or 1, 8)) as pool:
+        with _PDFIUM_LOCK:
+            pdf = pypdfium2.PdfDocument(str(pdf_path))
+            page_count = len(pdf)
+        try:
+            futures = []
+            for index in range(min(pages, page_count)):
+                with _PDFIUM_LOCK:
+                    page = pdf[index]
+                    try:
+                        rendered = page.render(scale=widths[0] / page.get_width()).to_pil()
+                    finally:
+                        page.close()
+                for width in widths:
+                    target = directory / f"p{index + 1}_w{width}.{fmt}"
+                    futures.append((index + 1, pool.submit(_save, rendered, width, target, fmt)))
+            images = [{'page': page, **future.result()} for page, future in futures]
+        finally:
+            with _PDFIUM_LOCK:
+                pdf.close()
+
+    manifest = {
+        'hash': digest,
+        'source': Path(pdf_path).name,
+        'page_count': page_count,
+        'format': fmt,
+        'images': sorted(images, key=lambda i: (i['page'], i['width'])),
+        'render_ms': round((time.perf_counter() - started) * 1000, 1),
+    }
+    partial = directory / f"{MANIFEST_NAME}.{os.getpid()}.tmp"
+    partial.write_text(json.dumps(manifest, indent=1), encoding='utf-8')
+    os.replace(partial, directory / MANIFEST_NAME)  # Written last: its presence marks a complete entry
+    return {**manifest, 'cached': False}
+
+
+def eager_previews(pdf_path, telemetry=DISABLED):
+    """Generation hook: build previews for a freshly written PDF; never fails the generation
+
+    Returns the manifest, or None when previews are off or unavailable here.
+    """
+    if not previews_enabled() or not Path(pdf_path).exists():
+        return None
+    try:
+        with telemetry.stage('pdf_previews', source=Path(pdf_path).name) as stage:
+            manifest = ensure_previews(pdf_path)
+            stage.update(images=len(manifest['images']), cached=manifest['cached'])
+    except ImportError as e:
+        print(f"⚠️  Previews skipped ({e.name} not installed)")
+        return None
+    except Exception as e:
+        print(f"⚠️  Previews failed for {Path(pdf_path).name}: {type(e).__name__}: {e}")
+        return None
+    detail = 'cached' if manifest['cached'] else f"{manifest['render_ms']} ms"
+    print(f"🖼️  Previews: {len(manifest['images'])} images ({detail}) → {preview_dir(manifest['hash'])}")
+    return manifest
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build cached preview images for generated PDFs")
+    parser.add_argument('pdfs', nargs='+', type=Path, metavar='PDF')
+    parser.add_argument('--widths', default=','.join(map(str, PREVIEW_WIDTHS)), help="Comma-separated pixel widths")
+    parser.add_argument('--pages', type=int, default=PREVIEW_PAGES, help="Leading pages to preview")
+    parser.add_argument('--format', choices=['webp', 'png'], default=PREVIEW_FORMAT)
+    parser.add_argument('--force', action='store_true', help="Render again even when cached")
+    parser.add_argument('--telemetry', nargs='?', const='1', metavar='PATH',
+                        help="Append JSONL stage events to PATH ('-' = stdout, default: Reports/pipeline_telemetry.jsonl)")
+    parser.add_argument('--quiet', action='store_true', help="Suppress the console banners")
+    args = parser.parse_args(argv)
+
+    widths = [int(w) for w in args.widths.split(',') if w.strip()]
+    telemetry = Telemetry.from_env('AHK', args.telemetry, args.quiet)
+    failed = 0
+    with telemetry.console():
+        for pdf in args.pdfs:
+            try:
+                with telemetry.stage('pdf_previews', source=pdf.name) as stage:
+                    manifest = ensure_previews(pdf, widths, args.pages, args.format, force=args.force)
+                    stage.update(images=len(manifest['images']), cached=manifest['cached'])
+            except Exception as e:
+                failed += 1
+                print(f"❌ {pdf.name}: {type(e).__name__}: {e}")
+                continue
+            detail = 'cached' if manifest['cached'] else f"{manifest['render_ms']} ms"
+            print(f"✅ {pdf.name}: {len(manifest['images'])} images ({detail}) → {preview_dir(manifest['hash'])}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,9 @@ Remove gray background from banner image and make it transparent
 from PIL import Image
 import os
 
+from brand_paths import BANNER_SOURCE, BANNER_TRANSPARENT
+from telemetry import Telemetry
+
 def remove_gray_background(input_path, output_path):
     """Remove gray/white background and make transparent"""
     
@@ -26,9 +29,13 @@ def remove_gray_background(input_path, output_path):
     img.putdata(new_data)
     img.save(output_path, "PNG")
     print(f"✓ Transparent banner created: {output_path}")
+    return output_path
 
 if __name__ == "__main__":
-    input_banner = r"C:\Users\ashra\OneDrive\Desktop\AHK_Dashboard_v1\Brand\banner_cropped.png"
-    output_banner = r"C:\Users\ashra\OneDrive\Desktop\AHK_Dashboard_v1\Brand\Letterheads\banner_transparent.png"
+    input_banner = BANNER_SOURCE
+    output_banner = BANNER_TRANSPARENT
     
-    remove_gray_background(input_banner, output_banner)
+    telemetry = Telemetry.from_env()
+    with telemetry.console(), telemetry.stage('remove_background') as stage:
+        stage.add_input(input_banner)
+        stage.add_output(remove_gray_background(input_banner, output_banner))
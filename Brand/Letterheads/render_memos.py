@@ -0,0 +1,714 @@
+"""
+AHKStrategies Memo Renderer
+Turns Emma_KnowledgeBase memos (markdown, or the orchestrator's HTML) into
+branded letterhead DOCX/PDF: brand header on page 1, a continuation header
+with the memo title and "Page X of Y" on every later page, and the Word footer
+from the LEGENDARY letterhead on all pages
+
+A whole memo directory is rendered across a process pool; memos whose output is
+newer than the memo, the renderer modules and the brand font files are skipped,
+and a memo that crashes its worker is recorded as failed without stopping the
+batch. With --registry the
+outputs go into the content-addressed artifact store instead (see
+artifact_registry.py) and a memo is skipped when the registry already holds
+output of this TEMPLATE_VERSION for its current contents.
+
+Usage:
+    python render_memos.py [MEMO_DIR] [--output DIR] [--pdf] [--workers N] [--force]
+                           [--registry [DB]] [--telemetry [PATH|-]] [--quiet]
+"""
+
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from html.parser import HTMLParser
+from io import BytesIO
+from pathlib import Path
+
+from brand_paths import REPO_ROOT
+from telemetry import DISABLED, Telemetry
+
+MEMOS_DIR = Path(os.environ.get("AHK_MEMOS_DIR", REPO_ROOT / "server" / "Emma_KnowledgeBase" / "Memos"))
+OUTPUT_DIR = Path(os.environ.get("AHK_MEMO_OUTPUT", Path(__file__).parent / "Rendered_Memos"))
+MEMO_SUFFIXES = ('.md', '.html')
+TEMPLATE_NAME = 'memo'
+TEMPLATE_VERSION = 'v1'  # Bump when the memo layout changes, so registered outputs are re-rendered
+RENDERER_MODULES = ('render_memos.py', 'font_embed.py', 'brand_paths.py')
+PDF_MODULES = ('pdf_postprocess.py', 'previews.py')
+
+GOLD = (212, 175, 55)
+MUTED_GOLD = (160, 130, 109)
+BRONZE = (139, 115, 85)
+GREY = (85, 85, 85)
+INK = (26, 26, 26)
+
+HEADING = re.compile(r'^(#{1,6})\s+(.*?)\s*#*$')
+BULLET = re.compile(r'^(\s*)[-*+]\s+(.*)$')
+NUMBERED = re.compile(r'^(\s*)\d+[.)]\s+(.*)$')
+RULE = re.compile(r'^\s*(?:-{3,}|\*{3,}|_{3,})\s*$')
+PAGE_BREAK = re.compile(r'^\s*(?:<!--\s*pagebreak\s*-->|\\pagebreak|\\newpage)\s*$', re.IGNORECASE)
+TABLE_ROW = re.compile(r'^\s*\|.*\|\s*$')
+TABLE_DIVIDER = re.compile(r'^\s*\|?\s*:?-{3,}:?\s*(?:\|\s*:?-{3,}:?\s*)*\|?\s*$')
+INLINE = re.compile(r'(\*\*.+?\*\*|__.+?__|\*[^*\s][^*]*?\*|_[^_\s][^_]*?_|`[^`]+`)')
+
+
+# === MEMO PARSING ===========================================================
+
+def parse_markdown(text):
+    """Split memo markdown into (kind, content, level) blocks
+
+    kinds: heading, paragraph, bullet, number, code, table (content = rows),
+    rule and break (explicit page break).
+    """
+    blocks = []
+    paragraph = []
+    table = []
+    code = None
+
+    def flush():
+        if paragraph:
+            blocks.append(('paragraph', ' '.join(paragraph), 0))
+            paragraph.clear()
+        if table:
+            blocks.append(('table', [row[:] for row in table], 0))
+            table.clear()
+
+    for line in text.splitlines():
+        if code is not None:
+            if line.strip().startswith('```'):
+                blocks.append(('code', '\n'.join(code), 0))
+                code = None
+            else:
+                code.append(line)
+            continue
+        if line.strip().startswith('```'):
+            flush()
+            code = []
+            continue
+        if TABLE_ROW.match(line):
+            if paragraph:
+                flush()
+            if not TABLE_DIVIDER.match(line):
+                table.append([cell.strip() for cell in line.strip().strip('|').split('|')])
+            continue
+        if not line.strip():
+            flush()
+            continue
+        heading = HEADING.match(line)
+        bullet = BULLET.match(line)
+        numbered = NUMBERED.match(line)
+        if PAGE_BREAK.match(line):
+            flush()
+            blocks.append(('break', '', 0))
+        elif RULE.match(line):
+            flush()
+            blocks.append(('rule', '', 0))
+        elif heading:
+            flush()
+            blocks.append(('heading', heading.group(2), len(heading.group(1))))
+        elif bullet:
+            flush()
+            blocks.append(('bullet', bullet.group(2), len(bullet.group(1).expandtabs(4)) // 2))
+        elif numbered:
+            flush()
+            blocks.append(('number', numbered.group(2), len(numbered.group(1).expandtabs(4)) // 2))
+        else:
+            if table:
+                flush()
+            paragraph.append(line.strip())
+    if code is not None:
+        blocks.append(('code', '\n'.join(code), 0))
+    flush()
+    return blocks
+
+
+class _MemoHTMLParser(HTMLParser):
+    """Reduce the orchestrator's memo HTML to the same blocks as parse_markdown()"""
+
+    BLOCK_TAGS = {'h1': 1, 'h2': 2, 'h3': 3, 'h4': 4, 'h5': 5, 'h6': 6, 'p': 0, 'li': 0, 'pre': 0, 'div': 0}
+    EMPHASIS = {'strong': '**', 'b': '**', 'em': '*', 'i': '*', 'code': '`'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks = []
+        self._text = []
+        self._tag = None
+        self._lists = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('head', 'style', 'script', 'title'):
+            self._skip += 1
+        elif tag in ('ul', 'ol'):
+            self._lists.append(tag)
+        elif tag == 'hr':
+            self._flush()
+            self.blocks.append(('rule', '', 0))
+        elif tag == 'br':
+            self._text.append(' ')
+        elif tag in self.EMPHASIS:
+            self._text.append(self.EMPHASIS[tag])
+        elif tag in self.BLOCK_TAGS:
+            self._flush()
+            self._tag = tag
+
+    def handle_endtag(self, tag):
+        if tag in ('head', 'style', 'script', 'title'):
+            self._skip = max(0, self._skip - 1)
+        elif tag in ('ul', 'ol') and self._lists:
+            self._flush()
+            self._lists.pop()
+        elif tag in self.EMPHASIS:
+            self._text.append(self.EMPHASIS[tag])
+        elif tag in self.BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if not self._skip:
+            self._text.append(data if self._tag == 'pre' else re.sub(r'\s+', ' ', data))
+
+    def _flush(self):
+        text = ''.join(self._text).strip()
+        self._text = []
+        tag, self._tag = self._tag, None
+        if not text:
+            return
+        if tag and tag.startswith('h'):
+            self.blocks.append(('heading', text, self.BLOCK_TAGS[tag]))
+        elif tag == 'li':
+            kind = 'number' if self._lists and self._lists[-1] == 'ol' else 'bullet'
+            self.blocks.append((kind, text, max(len(self._lists) - 1, 0)))
+        elif tag == 'pre':
+            self.blocks.append(('code', text, 0))
+        else:
+            self.blocks.append(('paragraph', text, 0))
+
+
+def parse_html(text):
+    parser = _MemoHTMLParser()
+    parser.feed(text)
+    parser.close()
+    parser._flush()
+    return parser.blocks
+
+
+def split_title(blocks, fallback):
+    """Return (title, blocks); the first level-1 heading becomes the memo title"""
+    for position, (kind, content, level) in enumerate(blocks):
+        if kind == 'heading' and level == 1:
+            return strip_inline(content), blocks[:position] + blocks[position + 1:]
+    return fallback, blocks
+
+
+def load_memo(memo_path):
+    """Return (title, blocks) for a markdown or HTML memo"""
+    memo_path = Path(memo_path)
+    text = memo_path.read_text(encoding='utf-8', errors='replace')
+    blocks = parse_html(text) if memo_path.suffix.lower() == '.html' else parse_markdown(text)
+    return split_title(blocks, memo_path.stem.replace('_', ' '))
+
+
+def strip_inline(text):
+    return ''.join(part for part, _ in inline_runs(text))
+
+
+def inline_runs(text):
+    """Split **bold**, *italic* and `code` markup into (text, style) runs"""
+    runs = []
+    for part in INLINE.split(text):
+        if not part:
+            continue
+        if part[:2] in ('**', '__') and part[-2:] == part[:2] and len(part) > 4:
+            runs.append((part[2:-2], 'bold'))
+        elif part[0] in '*_' and part[-1] == part[0] and len(part) > 2:
+            runs.append((part[1:-1], 'italic'))
+        elif part[0] == '`' and part[-1] == '`' and len(part) > 2:
+            runs.append((part[1:-1], 'code'))
+        else:
+            runs.append((part, None))
+    return runs
+
+
+# === LETTERHEAD LAYOUT ======================================================
+
+def add_border(paragraph, side='top', color='D4AF37', size=12, space=8):
+    """Add a single-line border to one side of a paragraph"""
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+
+    pPr = paragraph._element.get_or_add_pPr()
+    pBdr = OxmlElement('w:pBdr')
+    edge = OxmlElement(f'w:{side}')
+    edge.set(qn('w:val'), 'single')
+    edge.set(qn('w:sz'), str(size))
+    edge.set(qn('w:space'), str(space))
+    edge.set(qn('w:color'), color)
+    pBdr.append(edge)
+    pPr.append(pBdr)
+
+
+def add_field(paragraph, instruction, placeholder='1'):
+    """Append a simple field (PAGE, NUMPAGES) that Word and LibreOffice fill in at layout time"""
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+
+    field = OxmlElement('w:fldSimple')
+    field.set(qn('w:instr'), instruction)
+    run = OxmlElement('w:r')
+    text = OxmlElement('w:t')
+    text.text = placeholder
+    run.append(text)
+    field.append(run)
+    paragraph._p.append(field)
+
+
+@lru_cache(maxsize=None)
+def run_properties(font, size, color, bold, italic):
+    """<w:rPr> for one run format, built once through python-docx and copied onto every run"""
+    from docx import Document
+    from docx.shared import Pt, RGBColor
+
+    run = Document().add_paragraph().add_run()
+    run.font.name = font
+    run.font.size = Pt(size)
+    run.font.color.rgb = RGBColor(*color)
+    run.font.bold = bold
+    run.font.italic = italic
+    return run._r.rPr
+
+
+def styled_run(paragraph, text, font='Inter', size=10.5, color=INK, bold=False, italic=False):
+    from copy import deepcopy
+
+    run = paragraph.add_run(text)
+    run._r.insert(0, deepcopy(run_properties(font, size, tuple(color), bold, italic)))
+    return run
+
+
+def add_brand_header(doc):
+    """First-page header block (in the body, as in the LEGENDARY letterhead)"""
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Pt
+
+    h1 = doc.add_paragraph()
+    h1.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    styled_run(h1, 'AHKSTRATEGIES', 'Playfair Display', 28, GOLD, bold=True)
+    h1.paragraph_format.space_after = Pt(2)
+
+    h2 = doc.add_paragraph()
+    h2.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    styled_run(h2, 'Where Human Brilliance Fuses with AI Symphony', 'Cormorant Garamond', 10.5, MUTED_GOLD, italic=True)
+    h2.paragraph_format.space_after = Pt(2)
+
+    h3 = doc.add_paragraph()
+    h3.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    styled_run(h3, 'BUILDING EMPIRES • CRAFTING FUTURES • TRANSCENDING LIMITS', 'Inter', 7.5, BRONZE)
+    h3.paragraph_format.space_after = Pt(18)
+    add_border(h3, 'bottom', 'D4AF37', 8, 6)
+
+
+def add_continuation_header(header, title, total='NUMPAGES'):
+    """Header for pages 2+: memo title left, page X of Y right, gold rule below
+
+    total is the field for Y: SECTIONPAGES when one document holds several letters.
+    """
+    from docx.enum.text import WD_TAB_ALIGNMENT
+    from docx.shared import Mm, Pt
+
+    paragraph = header.paragraphs[0]
+    paragraph.paragraph_format.tab_stops.add_tab_stop(Mm(174), WD_TAB_ALIGNMENT.RIGHT)
+    paragraph.paragraph_format.space_after = Pt(6)
+    styled_run(paragraph, 'AHKStrategies', 'Playfair Display', 8.5, GOLD)
+    styled_run(paragraph, f'  ◆  {title}', 'Inter', 8, GREY)
+    styled_run(paragraph, '\tPage ', 'Inter', 8, GREY)
+    add_field(paragraph, 'PAGE', '2')
+    styled_run(paragraph, ' of ', 'Inter', 8, GREY)
+    add_field(paragraph, total, '2')
+    add_border(paragraph, 'bottom', 'D4AF37', 6, 4)
+
+
+def add_brand_footer(footer):
+    """The two-line LEGENDARY footer: contact line under a gold rule, then the copyright"""
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Pt
+
+    p1 = footer.paragraphs[0]
+    add_border(p1, 'top', 'D4AF37', 12, 8)
+    p1.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    p1.paragraph_format.space_before = Pt(12)
+    p1.paragraph_format.space_after = Pt(4)
+    styled_run(p1, 'AHKStrategies', 'Playfair Display', 8.5, GOLD)
+    styled_run(p1, ' ◆ ', 'Inter', 8.5, GOLD)
+    styled_run(p1, 'Cairo • Dubai • Amman • +20 104 078 7571 • ', 'Inter', 8.5, GREY)
+    styled_run(p1, 'www.ahkstrategies.net', 'Inter', 8.5, MUTED_GOLD, italic=True)
+
+    p2 = footer.add_paragraph()
+    p2.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    p2.paragraph_format.space_after = Pt(8)
+    styled_run(p2, 'Confidential & Proprietary © 2025 AHKStrategies – All Rights Reserved', 'Inter', 6.5, (153, 153, 153))
+
+
+def add_inline(paragraph, text, size=10.5, color=INK):
+    for part, style in inline_runs(text):
+        styled_run(paragraph, part, 'Consolas' if style == 'code' else 'Inter', size - (1 if style == 'code' else 0),
+                   color, bold=style == 'bold', italic=style == 'italic')
+
+
+def add_blocks(doc, blocks):
+    """Lay memo blocks out in the body; headings stay with the paragraph that follows them"""
+    from docx.enum.text import WD_BREAK
+    from docx.shared import Mm, Pt
+
+    heading_sizes = {1: 16, 2: 13, 3: 11.5}
+    style_ids = {}
+
+    def set_style(paragraph, name):
+        # Resolving a style by name scans styles.xml; do it once per document, not per paragraph
+        if name not in style_ids:
+            style_ids[name] = doc.styles[name].style_id
+        paragraph._p.get_or_add_pPr().style = style_ids[name]
+
+    for kind, content, level in blocks:
+        if kind == 'break':
+            doc.add_paragraph().add_run().add_break(WD_BREAK.PAGE)
+            continue
+        if kind == 'table':
+            columns = max(len(row) for row in content)
+            table = doc.add_table(rows=len(content), cols=columns)
+            table.style = 'Table Grid'
+            for r, row in enumerate(content):
+                for c, cell in enumerate(row):
+                    paragraph = table.cell(r, c).paragraphs[0]
+                    add_inline(paragraph, f"**{cell}**" if r == 0 and cell else cell, size=9.5)
+            doc.add_paragraph().paragraph_format.space_after = Pt(2)
+            continue
+
+        paragraph = doc.add_paragraph()
+        paragraph.paragraph_format.widow_control = True
+        if kind == 'heading':
+            set_style(paragraph, f'Heading {min(level, 6)}')  # Keeps the outline for navigation and extract_docx.py
+            paragraph.paragraph_format.keep_with_next = True
+            paragraph.paragraph_format.space_before = Pt(14 if level <= 2 else 10)
+            paragraph.paragraph_format.space_after = Pt(6)
+            styled_run(paragraph, strip_inline(content), 'Playfair Display' if level <= 2 else 'Inter',
+                       heading_sizes.get(level, 10.5), BRONZE if level > 1 else GOLD, bold=level > 2)
+        elif kind == 'rule':
+            add_border(paragraph, 'bottom', 'E8DCC8', 6, 1)
+            paragraph.paragraph_format.space_after = Pt(10)
+        elif kind == 'code':
+            paragraph.paragraph_format.left_indent = Mm(6)
+            lines = content.split('\n')
+            for position, line in enumerate(lines):
+                run = styled_run(paragraph, line, 'Consolas', 9, GREY)
+                if position < len(lines) - 1:
+                    run.add_break()
+        else:
+            if kind in ('bullet', 'number'):
+                set_style(paragraph, 'List Bullet' if kind == 'bullet' else 'List Number')
+                paragraph.paragraph_format.left_indent = Mm(6 + 6 * level)
+            paragraph.paragraph_format.space_after = Pt(6)
+            paragraph.paragraph_format.line_spacing = 1.2
+            add_inline(paragraph, content)
+
+
+@lru_cache(maxsize=1)
+def letterhead_template():
+    """The memo letterhead without a memo (page setup, brand header, both footers) as DOCX bytes
+
+    Built once per process; every memo starts from a parse of these bytes
+    instead of re-running the layout code.
+    """
+    from docx import Document
+    from docx.shared import Mm
+
+    doc = Document()
+    section = doc.sections[0]
+    section.page_height = Mm(297)
+    section.page_width = Mm(210)
+    section.top_margin = Mm(15)
+    section.bottom_margin = Mm(15)
+    section.left_margin = Mm(18)
+    section.right_margin = Mm(18)
+    section.different_first_page_header_footer = True
+
+    add_brand_header(doc)
+    add_brand_footer(section.first_page_footer)
+    add_brand_footer(section.footer)
+    doc.core_properties.author = 'AHKStrategies'
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def add_memo(doc, title, blocks, subtitle=None):
+    """Memo title, optional subtitle line and body blocks"""
+    from docx.shared import Pt
+
+    heading = doc.add_paragraph(style='Title')
+    heading.paragraph_format.keep_with_next = True
+    heading.paragraph_format.space_after = Pt(4)
+    styled_run(heading, title, 'Playfair Display', 18, INK, bold=True)
+    if subtitle:
+        meta = doc.add_paragraph()
+        meta.paragraph_format.space_after = Pt(14)
+        styled_run(meta, subtitle, 'Inter', 8.5, MUTED_GOLD, italic=True)
+    add_blocks(doc, blocks)
+
+
+def build_memo_docx(title, blocks, subtitle=None):
+    """Letterhead document with the memo laid out in its content area (brand fonts embedded, see font_embed.py)"""
+    from docx import Document
+    from font_embed import embed_document_fonts
+
+    doc = Document(BytesIO(letterhead_template()))
+    add_continuation_header(doc.sections[0].header, title)
+    add_memo(doc, title, blocks, subtitle)
+    doc.core_properties.title = title
+    embed_document_fonts(doc)
+    return doc
+
+
+def convert_docx_to_pdf(docx_path, pdf_path):
+    """DOCX → PDF with Word (docx2pdf) where available, else headless LibreOffice"""
+    import shutil
+    import subprocess
+    import tempfile
+
+    try:
+        from docx2pdf import convert
+    except ImportError:
+        convert = None
+    if convert and sys.platform in ('win32', 'darwin'):
+        convert(str(docx_path), str(pdf_path))
+        return pdf_path
+
+    soffice = os.environ.get("AHK_SOFFICE") or shutil.which('soffice') or shutil.which('libreoffice')
+    if not soffice:
+        raise RuntimeError("PDF output needs Microsoft Word (docx2pdf) or LibreOffice (soffice) on PATH")
+    # A private profile per call, so parallel workers do not fight over one LibreOffice instance
+    with tempfile.TemporaryDirectory(prefix='ahk_soffice_') as profile:
+        result = subprocess.run([soffice, f'-env:UserInstallation={Path(profile).as_uri()}', '--headless',
+                                 '--convert-to', 'pdf', '--outdir', str(Path(pdf_path).parent), str(docx_path)],
+                                capture_output=True, timeout=300)
+    produced = Path(pdf_path).parent / f"{Path(docx_path).stem}.pdf"
+    if result.returncode != 0 or not produced.exists():
+        raise RuntimeError(f"LibreOffice conversion failed: {result.stderr.decode(errors='replace').strip()}")
+    if produced != Path(pdf_path):
+        os.replace(produced, pdf_path)
+    return pdf_path
+
+
+# === BATCH ==================================================================
+
+def discover_memos(memo_dir):
+    return sorted(p for p in Path(memo_dir).iterdir()
+                  if p.is_file() and p.suffix.lower() in MEMO_SUFFIXES and not p.name.startswith(('~$', '.')))
+
+
+def outputs_for(memo_path, output_dir, pdf=False):
+    stem = Path(output_dir) / Path(memo_path).stem
+    return [stem.with_suffix('.docx')] + ([stem.with_suffix('.pdf')] if pdf else [])
+
+
+@lru_cache(maxsize=2)
+def renderer_mtime(pdf=False):
+    """Newest mtime among what a render depends on besides the memo
+
+    The renderer and font embedding modules, the brand font files whose
+    subsets get embedded and, for PDF output, the post-processing steps.
+    """
+    from font_embed import embedding_enabled, font_files
+
+    here = Path(__file__).parent
+    inputs = [here / name for name in RENDERER_MODULES + (PDF_MODULES if pdf else ())]
+    if embedding_enabled():
+        inputs.extend(font_files())
+    return max(path.stat().st_mtime for path in inputs if path.exists())
+
+
+def is_up_to_date(memo_path, output_dir, pdf=False):
+    """Every output exists and is newer than the memo and every renderer input"""
+    newest_input = max(Path(memo_path).stat().st_mtime, renderer_mtime(pdf))
+    return all(out.exists() and out.stat().st_mtime >= newest_input for out in outputs_for(memo_path, output_dir, pdf))
+
+
+def render_memo(memo_path, output_dir, pdf=False, telemetry=None):
+    """Worker entry point: render one memo; returns a result record"""
+    memo_path = Path(memo_path)
+    started = time.perf_counter()
+    record = {'memo': memo_path.name}
+    telemetry = Telemetry(**telemetry) if telemetry else DISABLED
+    try:
+        with telemetry.stage('render_memo', source=memo_path.name) as stage:
+            stage.add_input(memo_path)
+            title, blocks = load_memo(memo_path)
+            docx_path, *pdf_path = outputs_for(memo_path, output_dir, pdf)
+            partial = docx_path.with_suffix(f'.{os.getpid()}.tmp.docx')
+            build_memo_docx(title, blocks, f"Memo • {memo_path.name}").save(partial)
+            os.replace(partial, docx_path)  # Never leave a half-written DOCX that looks up to date
+            if pdf_path:
+                from pdf_postprocess import postprocess_pdf
+                from previews import eager_previews
+                convert_docx_to_pdf(docx_path, pdf_path[0])
+                postprocess_pdf(pdf_path[0], telemetry)
+                eager_previews(pdf_path[0], telemetry)
+            stage.add_output(docx_path, *pdf_path)
+            stage.update(blocks=len(blocks))
+        record.update(status='ok', title=title, blocks=len(blocks), outputs=[str(docx_path), *map(str, pdf_path)])
+    except Exception as e:
+        record.update(status='failed', error=f"{type(e).__name__}: {e}")
+    record['duration'] = round(time.perf_counter() - started, 3)
+    return record
+
+
+def crashed_record(memo_path):
+    """Result record for a memo whose worker process died (OOM kill, segfault in LibreOffice or lxml)"""
+    return {'memo': Path(memo_path).name, 'status': 'failed',
+            'error': "BrokenProcessPool: worker process died (out of memory?)", 'duration': 0.0}
+
+
+def _drain(queue, workers, submit):
+    """Render queued memos with at most `workers` in flight, yielding (memo, record)
+
+    Returns the memos whose futures were lost when a worker died, so the
+    caller can decide how to retry them.
+    """
+    lost, broken = [], False
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = {}
+        while (queue and not broken) or in_flight:
+            while queue and not broken and len(in_flight) < workers:
+                memo = queue.popleft()
+                try:
+                    in_flight[submit(pool, memo)] = memo
+                except BrokenProcessPool:
+                    queue.appendleft(memo)  # Never started: the next pool picks it up
+                    broken = True
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                memo = in_flight.pop(future)
+                try:
+                    yield memo, future.result()
+                except BrokenProcessPool:
+                    lost.append(memo)
+                    broken = True
+    return lost
+
+
+def iter_records(pending, workers, submit):
+    """Yield (memo, record) for every pending memo, surviving worker crashes
+
+    As in batch_extract.py: only the memos in flight are lost to a crash,
+    each is re-run alone in a fresh single-worker pool, and the one that
+    kills its worker again is recorded as failed.
+    """
+    queue = deque(pending)
+    while queue:
+        casualties = yield from _drain(queue, workers, submit)
+        for memo in casualties:
+            for crashed in (yield from _drain(deque([memo]), 1, submit)):
+                yield crashed, crashed_record(crashed)
+
+
+def render_directory(memo_dir=MEMOS_DIR, output_dir=OUTPUT_DIR, pdf=False, workers=None, force=False,
+                     telemetry=DISABLED, registry=None):
+    """Render every memo in memo_dir that is not already up to date; returns the result records
+
+    registry is an artifact_registry.ArtifactRegistry: output_dir then only
+    stages files, which are moved into the store and registered by this
+    (single-writer) process as each memo finishes.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    memos = discover_memos(memo_dir)
+    if registry:
+        from artifact_registry import source_signature
+        kinds = ('docx', 'pdf') if pdf else ('docx',)
+        pending = [m for m in memos if force or not registry.is_current(
+            m.stem, TEMPLATE_NAME, TEMPLATE_VERSION, source_signature(m), kinds)]
+    else:
+        pending = [m for m in memos if force or not is_up_to_date(m, output_dir, pdf)]
+
+    print(f"📨 Found {len(memos)} memos in {memo_dir}")
+    print(f"⏭️  Up to date: {len(memos) - len(pending)}  |  🔄 Rendering: {len(pending)}\n")
+
+    records = []
+    if not pending:
+        return records
+    from font_embed import embedding_enabled, print_warm_report, warm_fonts
+    if embedding_enabled():  # Once here, so workers find the font index and body subsets on disk
+        print_warm_report(warm_fonts(telemetry=telemetry))
+
+    def submit(pool, memo):
+        return pool.submit(render_memo, memo, output_dir, pdf, telemetry.settings())
+
+    workers = min(workers or os.cpu_count() or 1, len(pending))
+    with telemetry.stage('render_memos', memos=len(pending)) as stage:
+        for finished, (memo, record) in enumerate(iter_records(pending, workers, submit), 1):
+            if registry and record['status'] == 'ok':
+                record['outputs'] = register_outputs(registry, memo, record['outputs'])
+            records.append(record)
+            icon = '✅' if record['status'] == 'ok' else '❌'
+            detail = f"{record['duration']:.2f}s" if record['status'] == 'ok' else record['error']
+            print(f"{icon} [{finished}/{len(pending)}] {record['memo']} ({detail})")
+        stage.update(failed=sum(r['status'] != 'ok' for r in records))
+    return records
+
+
+def register_outputs(registry, memo_path, outputs):
+    """Move a memo's rendered files into the artifact store; returns their stored paths"""
+    from artifact_registry import source_signature
+
+    signature = source_signature(memo_path)
+    return [registry.store(output, TEMPLATE_NAME, TEMPLATE_VERSION, subject=memo_path.stem,
+                           signature=signature, move=True)['path'] for output in outputs]
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render memos onto the AHKStrategies letterhead")
+    parser.add_argument('memo_dir', nargs='?', type=Path, default=MEMOS_DIR, help="Directory of .md/.html memos")
+    parser.add_argument('--output', type=Path, default=OUTPUT_DIR, help="Directory for the rendered documents")
+    parser.add_argument('--pdf', action='store_true', help="Also export PDF (Word via docx2pdf, or LibreOffice)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="Re-render memos that are already up to date")
+    parser.add_argument('--registry', nargs='?', const='default', metavar='DB',
+                        help="Store outputs in the hash-sharded artifact store and register them (optionally in DB)")
+    parser.add_argument('--telemetry', nargs='?', const='1', metavar='PATH',
+                        help="Append JSONL stage events to PATH ('-' = stdout, default: Reports/pipeline_telemetry.jsonl)")
+    parser.add_argument('--quiet', action='store_true', help="Suppress the console banners")
+    args = parser.parse_args(argv)
+
+    telemetry = Telemetry.from_env('AHK', args.telemetry, args.quiet)
+    with telemetry.console():
+        print("=" * 70)
+        print("📨 MEMO LETTERHEAD RENDERING")
+        print("=" * 70)
+        registry = None
+        if args.registry:
+            from artifact_registry import REGISTRY_DB, ArtifactRegistry
+            registry = ArtifactRegistry(REGISTRY_DB if args.registry == 'default' else Path(args.registry))
+        try:
+            records = render_directory(args.memo_dir, args.output, args.pdf, args.workers, args.force, telemetry,
+                                       registry)
+        finally:
+            if registry:
+                registry.close()
+        failed = sum(r['status'] != 'ok' for r in records)
+        print("=" * 70)
+        print(f"✨ Rendered: {len(records) - failed}  |  ❌ Failed: {failed}")
+        print(f"📁 Output: {args.output}")
+        print("=" * 70)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
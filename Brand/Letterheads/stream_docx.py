@@ -0,0 +1,277 @@
+"""
+AHKStrategies Streaming Letterhead DOCX Writer
+Builds one consolidated DOCX ("all letters of the quarter") without holding
+the document in memory: every part of the letterhead template (styles,
+numbering, headers, footers, media) is copied into the zip unchanged, and
+word/document.xml is streamed into its zip entry one letter at a time
+
+Each letter is laid out with the normal render_memos code in a scratch
+document, serialized, written and dropped, so memory is bounded by the
+largest single letter, not the page count. Letters are separate sections:
+each one opens with the template's letterhead block and restarts its page
+numbering ("Page X of Y" counts the letter's own pages).
+
+Font embedding (see font_embed.py) needs every letter's glyphs, so the parts
+it rewrites (fontTable.xml with its rels and fonts, settings.xml and
+[Content_Types].xml) are held back from the copy and written by close(),
+subsetted to the characters collected letter by letter.
+
+    with StreamingDocxWriter("Q3_Letters.docx", title="Q3 2026 Correspondence") as writer:
+        for memo in memos:
+            writer.add_letter(*load_memo(memo))
+
+Usage:
+    python stream_docx.py MEMO_DIR OUTPUT.docx [--title TEXT] [--template DOCX] [--telemetry [PATH|-]] [--quiet]
+"""
+
+import os
+import re
+import shutil
+import sys
+import zipfile
+from io import BytesIO
+from pathlib import Path
+
+from telemetry import DISABLED, Telemetry
+
+DOCUMENT_PART = 'word/document.xml'
+BODY_MARKER = '<!--AHK-STREAM-BODY-->'
+COPY_CHUNK = 1 << 20
+W_SECT_PR = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}sectPr'
+NS_DECLARATION = re.compile(r' xmlns(?::[\w.-]+)?="[^"]*"')
+
+
+def memo_template(title):
+    """The memo letterhead with a consolidated continuation header, as DOCX bytes"""
+    from docx import Document
+    from render_memos import add_continuation_header, letterhead_template
+
+    doc = Document(BytesIO(letterhead_template()))
+    add_continuation_header(doc.sections[0].header, title, total='SECTIONPAGES')
+    doc.core_properties.title = title
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def font_parts(doc):
+    """Zip names of the parts embed_fonts() rewrites: fontTable with its rels and fonts, settings, content types"""
+    from docx.opc.constants import RELATIONSHIP_TYPE as RT
+
+    names = set()
+    for reltype in (RT.SETTINGS, RT.FONT_TABLE):
+        try:
+            part = doc.part.part_related_by(reltype)
+        except KeyError:
+            continue
+        names.update((part.partname, part.partname.rels_uri))
+        names.update(rel.target_part.partname for rel in part.rels.values() if not rel.is_external)
+    return {'[Content_Types].xml'} | {name[1:] for name in names}
+
+
+def restart_page_numbers(sect_pr):
+    """Make a section number its pages from 1 (pgNumType sits just before cols in the schema)"""
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+
+    pg_num = sect_pr.find(qn('w:pgNumType'))
+    if pg_num is None:
+        pg_num = OxmlElement('w:pgNumType')
+        anchor = next((sect_pr.find(qn(f'w:{tag}')) for tag in ('cols', 'formProt', 'vAlign', 'noEndnote',
+                                                                 'titlePg', 'textDirection', 'bidi', 'docGrid')
+                       if sect_pr.find(qn(f'w:{tag}')) is not None), None)
+        if anchor is None:
+            sect_pr.append(pg_num)
+        else:
+            anchor.addprevious(pg_num)
+    pg_num.set(qn('w:start'), '1')
+
+
+class StreamingDocxWriter:
+    """Append letters to a letterhead DOCX whose body is streamed straight into the zip
+
+    template is DOCX bytes or a path; by default the memo letterhead. Custom
+    templates must carry python-docx's default styles (Title, Heading N, List
+    Bullet, Table Grid), as the create_* letterheads do. The output appears
+    atomically on close().
+    """
+
+    def __init__(self, path, template=None, title='AHKStrategies Correspondence'):
+        from docx import Document
+        from font_embed import embedding_enabled, used_glyphs
+        from lxml import etree
+
+        self.path = Path(path)
+        self.letters = 0
+        self.bytes_written = 0
+        if template is None:
+            template = memo_template(title)
+        elif not isinstance(template, bytes):
+            template = Path(template).read_bytes()
+
+        # Scratch document: same styles and numbering as the output, reused for every letter
+        self._scratch = Document(BytesIO(template))
+        self._body = self._scratch.element.body
+        sect_pr = self._body.find(W_SECT_PR)
+        restart_page_numbers(sect_pr)
+
+        # document.xml split around the body content: namespace declarations stay on the root
+        marker = etree.Comment(BODY_MARKER[4:-3])
+        self._body.insert(0, marker)
+        document = etree.tostring(self._scratch.element, encoding='unicode')
+        self._body.remove(marker)
+        head, tail = document.split(BODY_MARKER)
+        self._root_namespaces = set(NS_DECLARATION.findall(head[:head.index('>')]))
+        self._letterhead = ''.join(self._serialize(child) for child in self._body if child is not sect_pr)
+        self._sect_pr = self._serialize(sect_pr)
+        self._glyphs = used_glyphs(self._scratch) if embedding_enabled() else None  # Letterhead, headers, footers
+        self._held_back = font_parts(self._scratch)
+        self._clear()
+        tail = tail[tail.index('</w:body>'):]  # Letterhead and sectPr are re-emitted per letter
+        self._head = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n' + head
+        self._tail = self._sect_pr + tail
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._partial = self.path.with_suffix(f'.{os.getpid()}.tmp.docx')
+        self._zip = zipfile.ZipFile(self._partial, 'w', zipfile.ZIP_DEFLATED)
+        self._stream = None
+        try:
+            with zipfile.ZipFile(BytesIO(template)) as source:
+                for info in source.infolist():
+                    if info.filename != DOCUMENT_PART and info.filename not in self._held_back:
+                        with source.open(info) as src, self._zip.open(info.filename, 'w') as dst:
+                            shutil.copyfileobj(src, dst, COPY_CHUNK)
+            # Written last: only one zip entry can be open for writing at a time
+            info = zipfile.ZipInfo(DOCUMENT_PART, (1980, 1, 1, 0, 0, 0))
+            info.compress_type = zipfile.ZIP_DEFLATED
+            self._stream = self._zip.open(info, 'w', force_zip64=True)  # Size unknown up front
+            self._write(self._head)
+        except BaseException:
+            self.abort()
+            raise
+
+    def _clear(self):
+        for child in list(self._body):
+            if child.tag != W_SECT_PR:
+                self._body.remove(child)
+
+    def _serialize(self, element):
+        """Element XML without the namespace declarations the document root already makes"""
+        from lxml import etree
+
+        xml = etree.tostring(element, encoding='unicode')
+        end = xml.index('>')
+        start_tag = NS_DECLARATION.sub(lambda m: '' if m.group(0) in self._root_namespaces else m.group(0), xml[:end])
+        return start_tag + xml[end:]
+
+    def _write(self, text):
+        data = text.encode('utf-8')
+        self._stream.write(data)
+        self.bytes_written += len(data)
+
+    def add_letter(self, title, blocks, subtitle=None):
+        """Lay one memo out on the letterhead and stream it into document.xml"""
+        from font_embed import used_glyphs
+        from render_memos import add_memo
+
+        if self.letters:
+            # Close the previous letter's section; the next one starts on a fresh page
+            self._write(f'<w:p><w:pPr>{self._sect_pr}</w:pPr></w:p>')
+        self._write(self._letterhead)
+        add_memo(self._scratch, title, blocks, subtitle)
+        if self._glyphs is not None:
+            for face, chars in used_glyphs(self._scratch).items():
+                self._glyphs.setdefault(face, set()).update(chars)
+        for child in self._body:
+            if child.tag != W_SECT_PR:
+                self._write(self._serialize(child))
+        self._clear()
+        self.letters += 1
+
+    def close(self):
+        """Finish document.xml, embed the letters' fonts and move the DOCX into place"""
+        from font_embed import embed_document_fonts
+
+        try:
+            self._write(self._tail)
+            self._stream.close()
+            if self._glyphs is not None:
+                embed_document_fonts(self._scratch, glyphs=self._glyphs)
+            # The scratch document's body is empty: saving it only serializes the template parts
+            buffer = BytesIO()
+            self._scratch.save(buffer)
+            with zipfile.ZipFile(buffer) as scratch:
+                for name in sorted(font_parts(self._scratch) & set(scratch.namelist())):  # Not every part has rels
+                    self._zip.writestr(name, scratch.read(name))
+            self._zip.close()
+        except BaseException:
+            self.abort()
+            raise
+        os.replace(self._partial, self.path)
+        return self.path
+
+    def abort(self):
+        """Discard a half-written document"""
+        try:
+            if self._stream is not None and not self._stream.closed:
+                self._stream.close()
+            self._zip.close()
+        except Exception:
+            pass
+        self._partial.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def consolidate(memo_dir, output, title=None, template=None, telemetry=DISABLED):
+    """Stream every memo in memo_dir, in name order, into one letterhead DOCX; returns a summary"""
+    from render_memos import discover_memos, load_memo
+
+    memos = discover_memos(memo_dir)
+    title = title or f"{Path(memo_dir).name.replace('_', ' ')} Correspondence"
+    with telemetry.stage('stream_docx', memos=len(memos)) as stage:
+        with StreamingDocxWriter(output, template, title) as writer:
+            for memo in memos:
+                stage.add_input(memo)
+                letter_title, blocks = load_memo(memo)
+                writer.add_letter(letter_title, blocks, f"Memo • {memo.name}")
+        stage.add_output(output)
+        stage.update(letters=writer.letters, xml_bytes=writer.bytes_written)
+    return {'letters': writer.letters, 'xml_bytes': writer.bytes_written, 'bytes': Path(output).stat().st_size}
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Stream many memos into one AHKStrategies letterhead DOCX")
+    parser.add_argument('memo_dir', type=Path, help="Directory of .md/.html memos")
+    parser.add_argument('output', type=Path, help="Consolidated DOCX to write")
+    parser.add_argument('--title', help="Title for the continuation header and document properties")
+    parser.add_argument('--template', type=Path, help="Letterhead DOCX to build on (default: the memo letterhead)")
+    parser.add_argument('--telemetry', nargs='?', const='1', metavar='PATH',
+                        help="Append JSONL stage events to PATH ('-' = stdout, default: Reports/pipeline_telemetry.jsonl)")
+    parser.add_argument('--quiet', action='store_true', help="Suppress the console banners")
+    args = parser.parse_args(argv)
+
+    telemetry = Telemetry.from_env('AHK', args.telemetry, args.quiet)
+    with telemetry.console():
+        print("=" * 70)
+        print("📚 STREAMING CONSOLIDATED LETTERHEAD DOCX")
+        print("=" * 70)
+        summary = consolidate(args.memo_dir, args.output, args.title, args.template, telemetry)
+        print(f"✉️  Letters: {summary['letters']:,}")
+        print(f"📝 document.xml: {summary['xml_bytes'] / 1e6:.1f} MB  |  📦 DOCX: {summary['bytes'] / 1e6:.1f} MB")
+        print(f"📁 Output: {args.output}")
+        print("=" * 70)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
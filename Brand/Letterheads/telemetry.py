@@ -0,0 +1,47 @@
+"""
+Structured JSONL Telemetry for Letterhead Generation
+The repository's shared pipeline_telemetry.py with AHK_* defaults: one
+implementation and one event schema for extraction and letterhead runs,
+appended to the file telemetry_collector.js folds into the daily report (or
+written to stdout)
+
+    telemetry = Telemetry.from_env('AHK')    # AHK_TELEMETRY=1|PATH|-  AHK_QUIET=1
+    with telemetry.console(), telemetry.stage('create_letterhead') as stage:
+        stage.add_output(create_letterhead())
+
+AHK_TELEMETRY_MEMORY=1 adds a per-stage tracemalloc peak; opt-in, as tracing
+inflates python-docx and Pillow timings several times over.
+"""
+
+import importlib.util
+import sys
+
+from brand_paths import REPO_ROOT
+
+_MODULE = 'pipeline_telemetry'
+
+
+def _load_shared():
+    if _MODULE in sys.modules:
+        return sys.modules[_MODULE]
+    spec = importlib.util.spec_from_file_location(_MODULE, REPO_ROOT / f"{_MODULE}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[_MODULE] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+_shared = _load_shared()
+Stage = _shared.Stage
+TELEMETRY_FILE = _shared.TELEMETRY_FILE
+
+
+class Telemetry(_shared.Telemetry):
+    """JSONL stage events to a file ('-' for stdout); sink=None disables everything but quiet"""
+
+    @classmethod
+    def from_env(cls, prefix='AHK', sink=None, quiet=False, default_file=None):
+        return super().from_env(prefix, sink, quiet, default_file)
+
+
+DISABLED = Telemetry()
@@ -0,0 +1,79 @@
+"""
+Cold-start budget test for the brand CLI
+Run: python test_brand_cold_start.py  (or collect with pytest)
+
+Commands whose dependencies are not installed here cannot be measured; they
+are reported (a warning under pytest) rather than counted as passing.
+"""
+
+import json
+import subprocess
+import sys
+import warnings
+from pathlib import Path
+
+HERE = Path(__file__).parent
+HEAVY_MODULES = ('docx', 'PIL', 'playwright', 'fontTools', 'numpy', 'pypdfium2', 'pikepdf', 'lxml')
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import brand
+elapsed_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({
+    'elapsed_ms': elapsed_ms,
+    'heavy': [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def measure_cli_import():
+    """Import brand.py in a fresh interpreter: what `brand.py --help` pays"""
+    result = subprocess.run([sys.executable, '-c', PROBE], cwd=HERE, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure_commands(runs=3):
+    """{command: report} for every command in brand.COMMAND_IMPORTS"""
+    sys.path.insert(0, str(HERE))
+    import brand
+    return {command: {**brand.measure_cold_start(command, runs), 'budget_ms': brand.COLD_START_BUDGET_MS[command]}
+            for command in brand.COMMAND_IMPORTS}
+
+
+def test_every_command_has_a_budget():
+    sys.path.insert(0, str(HERE))
+    import brand
+    assert set(brand.COMMAND_IMPORTS) == set(brand.COLD_START_BUDGET_MS)
+
+
+def test_cli_import_defers_heavy_dependencies():
+    report = measure_cli_import()
+    assert report['heavy'] == [], report
+
+
+def test_commands_within_budget():
+    reports = measure_commands()
+    missing = {command: r['missing'] for command, r in reports.items() if r['missing']}
+    if missing:
+        warnings.warn(f"Cold start not measured (dependency missing): {missing}")
+    over = {command: round(r['elapsed_ms'], 1) for command, r in reports.items()
+            if not r['missing'] and r['elapsed_ms'] > r['budget_ms']}
+    assert not over, over
+    assert len(missing) < len(reports), "No command could be measured"
+
+
+if __name__ == "__main__":
+    print('🧪 Testing brand CLI cold-start budgets\n')
+    cli = measure_cli_import()
+    print(f"⏱️  CLI import: {cli['elapsed_ms']:.1f} ms, heavy modules loaded: {cli['heavy'] or 'none'}")
+    ok = not cli['heavy']
+    for command, report in measure_commands().items():
+        if report['missing']:
+            print(f"⚠️  {command:<18} not measured: {report['missing']}")
+            continue
+        within = report['elapsed_ms'] <= report['budget_ms']
+        ok = ok and within
+        print(f"{'✅' if within else '❌'} {command:<18} {report['elapsed_ms']:7.1f} ms  (budget {report['budget_ms']} ms)")
+    print('\n✅ Cold-start budget test passed!' if ok else '\n❌ Cold-start budget test FAILED')
+    sys.exit(0 if ok else 1)
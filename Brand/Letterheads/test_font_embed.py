@@ -0,0 +1,149 @@
+"""
+Font embedding tests for the letterhead DOCX builders
+Run: python test_font_embed.py  (or collect with pytest)
+
+The fonts are generated with fontTools, so no brand font files are needed.
+"""
+
+import sys
+import tempfile
+import zipfile
+from contextlib import contextmanager
+from io import BytesIO
+from pathlib import Path
+from xml.etree import ElementTree
+
+import font_embed
+from font_embed import _obfuscate, embed_fonts, embedded_fonts
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+R = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+FONT_KEY = '{1B2C3D4E-5F60-4172-8394-A5B6C7D8E9F0}'
+CHARS = ''.join(map(chr, range(0x20, 0x7F))) + 'ĀőŁ•'
+
+
+def make_font(family, chars=CHARS):
+    """TTF bytes of a font named family with an empty glyph for every character"""
+    from fontTools.fontBuilder import FontBuilder
+    from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+    names = ['.notdef'] + [f'uni{ord(c):04X}' for c in chars]
+    builder = FontBuilder(1000, isTTF=True)
+    builder.setupGlyphOrder(names)
+    builder.setupCharacterMap({ord(c): f'uni{ord(c):04X}' for c in chars})
+    builder.setupGlyf({name: TTGlyphPen(None).glyph() for name in names})
+    builder.setupHorizontalMetrics({name: (500, 0) for name in names})
+    builder.setupHorizontalHeader(ascent=800, descent=-200)
+    builder.setupNameTable({'familyName': family, 'styleName': 'Regular'})
+    builder.setupOS2(usWeightClass=400, fsType=0)
+    builder.setupPost()
+    out = BytesIO()
+    builder.save(out)
+    return out.getvalue()
+
+
+def embedded_blobs(docx):
+    """{(family, slot): de-obfuscated font bytes} read back from a DOCX"""
+    with zipfile.ZipFile(docx) as archive:
+        table = ElementTree.fromstring(archive.read('word/fontTable.xml'))
+        rels = ElementTree.fromstring(archive.read('word/_rels/fontTable.xml.rels'))
+        targets = {rel.get('Id'): rel.get('Target') for rel in rels}
+        blobs = {}
+        for font in table.iter(f'{W}font'):
+            for slot in font:
+                if slot.tag.startswith(f'{W}embed'):
+                    blob = archive.read(f"word/{targets[slot.get(f'{R}id')]}")
+                    blobs[(font.get(f'{W}name'), slot.tag[len(W):])] = _obfuscate(blob, slot.get(f'{W}fontKey'))
+    return blobs
+
+
+def cmap(blob):
+    from fontTools.ttLib import TTFont
+
+    return set(map(chr, TTFont(BytesIO(blob)).getBestCmap()))
+
+
+@contextmanager
+def brand_fonts(*families):
+    """Generated fonts as the only brand fonts, with a scratch subset cache"""
+    saved = (list(font_embed.FONT_DIRS), font_embed.FONT_SUBSET_DIR, font_embed._INDEX, dict(font_embed._RESOLVED),
+             dict(font_embed._SUBSETS))
+    with tempfile.TemporaryDirectory() as tmp:
+        for family in families:
+            (Path(tmp) / f"{family.replace(' ', '')}-Regular.ttf").write_bytes(make_font(family))
+        font_embed.FONT_DIRS[:] = [Path(tmp)]
+        font_embed.FONT_SUBSET_DIR = Path(tmp) / 'subsets'
+        font_embed._INDEX = None
+        font_embed._RESOLVED.clear()
+        font_embed._SUBSETS.clear()
+        try:
+            yield Path(tmp)
+        finally:
+            font_embed.FONT_DIRS[:], font_embed.FONT_SUBSET_DIR, font_embed._INDEX = saved[:3]
+            font_embed._RESOLVED.clear()
+            font_embed._RESOLVED.update(saved[3])
+            font_embed._SUBSETS.clear()
+            font_embed._SUBSETS.update(saved[4])
+
+
+def test_obfuscate_round_trip():
+    blob = bytes(range(256)) * 2
+    obfuscated = _obfuscate(blob, FONT_KEY)
+    assert obfuscated[:32] != blob[:32] and obfuscated[32:] == blob[32:]
+    assert _obfuscate(obfuscated, FONT_KEY) == blob
+    assert _obfuscate(blob, FONT_KEY.strip('{}').lower()) == obfuscated
+
+
+def test_embed_fonts_round_trip():
+    from docx import Document
+
+    regular, italic = make_font('Test Sans'), make_font('Test Sans', 'abc')
+    doc = Document()
+    embed_fonts(doc, {('Test Sans', False, False): (regular, True)})
+    # Embedding again replaces the slots instead of piling up parts
+    subsets = {('Test Sans', False, False): (regular, True), ('Test Sans', False, True): (italic, False)}
+    assert embed_fonts(doc, subsets) == 2
+    buffer = BytesIO()
+    doc.save(buffer)
+    assert embedded_blobs(buffer) == {('Test Sans', 'embedRegular'): regular, ('Test Sans', 'embedItalic'): italic}
+    assert sorted(embedded_fonts(buffer)) == [('Test Sans', 'Italic', len(italic), False),
+                                              ('Test Sans', 'Regular', len(regular), True)]
+    with zipfile.ZipFile(buffer) as archive:
+        settings = archive.read('word/settings.xml').decode('utf-8')
+        assert sum(name.endswith('.odttf') for name in archive.namelist()) == 2
+    assert '<w:embedTrueTypeFonts/>' in settings and '<w:saveSubsetFonts/>' in settings
+
+
+def test_streaming_writer_embeds_every_letters_glyphs():
+    from docx import Document
+    from stream_docx import StreamingDocxWriter
+
+    with brand_fonts('Inter') as tmp:
+        output = tmp / 'letters.docx'
+        with StreamingDocxWriter(output, title='Test Correspondence') as writer:
+            writer.add_letter('First', [('paragraph', 'Only the first letter has Ā.', 0)])
+            writer.add_letter('Second', [('paragraph', 'Only the second letter has ő.', 0)])
+        with zipfile.ZipFile(output) as archive:
+            names = archive.namelist()
+        assert len(names) == len(set(names)), 'template font parts were copied as well as rewritten'
+        inter = embedded_blobs(output)[('Inter', 'embedRegular')]
+        assert {'Ā', 'ő'} <= cmap(inter), 'glyphs of an earlier letter were dropped'
+        assert 'Ł' not in cmap(inter), 'subset keeps characters no letter uses'
+        assert len(Document(output).paragraphs) > 2
+
+
+TESTS = (test_obfuscate_round_trip, test_embed_fonts_round_trip, test_streaming_writer_embeds_every_letters_glyphs)
+
+
+if __name__ == "__main__":
+    print('🧪 Testing DOCX font embedding\n')
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+    print('\n✅ Font embedding tests passed!' if not failed else f'\n❌ {failed} font embedding test(s) FAILED')
+    sys.exit(1 if failed else 0)
@@ -1,31 +1,62 @@
-from docx import Document
-
-doc = Document('AHKStrategies_Letterhead_LEGENDARY.docx')
-
-print('='*60)
-print('DOCX VERIFICATION')
-print('='*60)
-print(f'Sections: {len(doc.sections)}')
-print(f'Body paragraphs: {len(doc.paragraphs)}')
-
-print('\nBody content:')
-for i in range(min(6, len(doc.paragraphs))):
-    text = doc.paragraphs[i].text
-    if text:
-        print(f'  Para {i}: {text[:80]}...' if len(text) > 80 else f'  Para {i}: {text}')
-    else:
-        print(f'  Para {i}: [empty paragraph for content]')
-
-footer = doc.sections[0].footer
-print(f'\nFooter paragraphs: {len(footer.paragraphs)}')
-print('Footer content:')
-for i, p in enumerate(footer.paragraphs):
-    text = p.text
-    if text:
-        print(f'  Line {i+1}: {text}')
-    else:
-        print(f'  Line {i+1}: [empty]')
-
-print('='*60)
-print('✅ VERIFICATION COMPLETE')
-print('='*60)
+"""
+Verify a Letterhead DOCX
+Prints the section count, the first body paragraphs and the footer lines
+
+Usage:
+    python verify_docx.py [DOCX]      # default: AHKStrategies_Letterhead_LEGENDARY.docx
+"""
+
+import sys
+
+from brand_paths import LEGENDARY_DOCX
+
+
+def summarize_docx(path):
+    """Section/paragraph/footer summary of a DOCX"""
+    from docx import Document
+
+    doc = Document(str(path))
+    footer = doc.sections[0].footer
+    return {
+        'path': str(path),
+        'sections': len(doc.sections),
+        'paragraphs': len(doc.paragraphs),
+        'tables': len(doc.tables),
+        'first_paragraphs': [p.text for p in doc.paragraphs[:6]],
+        'footer': [p.text for p in footer.paragraphs],
+        'different_first_page': doc.sections[0].different_first_page_header_footer,
+    }
+
+
+def verify_docx(path=LEGENDARY_DOCX):
+    summary = summarize_docx(path)
+
+    print('='*60)
+    print('DOCX VERIFICATION')
+    print('='*60)
+    print(f"Sections: {summary['sections']}")
+    print(f"Body paragraphs: {summary['paragraphs']}")
+
+    print('\nBody content:')
+    for i, text in enumerate(summary['first_paragraphs']):
+        if text:
+            print(f'  Para {i}: {text[:80]}...' if len(text) > 80 else f'  Para {i}: {text}')
+        else:
+            print(f'  Para {i}: [empty paragraph for content]')
+
+    print(f"\nFooter paragraphs: {len(summary['footer'])}")
+    print('Footer content:')
+    for i, text in enumerate(summary['footer']):
+        if text:
+            print(f'  Line {i+1}: {text}')
+        else:
+            print(f'  Line {i+1}: [empty]')
+
+    print('='*60)
+    print('✅ VERIFICATION COMPLETE')
+    print('='*60)
+    return summary
+
+
+if __name__ == "__main__":
+    verify_docx(sys.argv[1] if len(sys.argv) > 1 else LEGENDARY_DOCX)
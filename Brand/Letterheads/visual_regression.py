@@ -0,0 +1,421 @@
+"""
+AHKStrategies Visual Regression
+Checks the letterhead editions (the create_* DOCX files, the HTML editions,
+the LEGENDARY PDF) against approved page renders in Goldens/ (AHK_GOLDEN_DIR),
+so nobody has to open every output by hand after a change
+
+Three steps, each skipped when the one before it proves nothing changed:
+  1. Source signature: for HTML, the bundle marker, which covers the page and
+     every stylesheet, font and image it resolves (see bundle_html.py; pages
+     that cannot be fully bundled are always rendered); the DOCX member CRCs
+     (python-docx stamps every zip entry with the save time); or the PDF
+     bytes. Same as the golden: no render at all.
+  2. Each page is rasterised once (pypdfium2, DOCX via LibreOffice/Word, HTML
+     via Chromium) and hashed: a SHA-256 of the pixels and a 64-bit DCT
+     perceptual hash. Same pixels as the golden: the page is skipped.
+  3. Otherwise a vectorised per-tile diff (numpy, TILE x TILE pixels) against
+     the golden PNG lists the tiles where more than TILE_THRESHOLD of the
+     pixels moved by more than PIXEL_THRESHOLD; anti-aliasing noise below that
+     passes. Changed pages get an overlay with those tiles marked in
+     VisualDiffs/<output>/.
+
+    reports = check_outputs()            # the default EDITIONS that exist
+    approve_outputs([MASTER_DOCX])       # accept the current renders as goldens
+
+Usage:
+    python visual_regression.py check [OUTPUT ...] [--dpi 96] [--tile 32] [--force]
+    python visual_regression.py approve [OUTPUT ...] [--dpi 96]
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from brand_paths import (GOLDEN_DIR, LEGENDARY_HTML, LEGENDARY_PDF, LETTERHEAD_DOCX, LETTERHEADS_DIR, MASTER_DOCX,
+                         MASTERPIECE_DOCX, VISUAL_DIFF_DIR)
+from telemetry import Telemetry
+
+EDITIONS = (
+    LETTERHEAD_DOCX,
+    MASTER_DOCX,
+    MASTERPIECE_DOCX,
+    LEGENDARY_PDF,
+    LEGENDARY_HTML,
+    LETTERHEADS_DIR / "AHKStrategies_Letterhead.html",
+    LETTERHEADS_DIR / "AHKStrategies_Letterhead_PrintEdition.html",
+    LETTERHEADS_DIR / "AHKStrategies_Letterhead_WordEdition.html",
+)
+DPI = 96
+TILE = 32
+PIXEL_THRESHOLD = 24     # Max channel difference (0-255) a pixel may move and still count as unchanged
+TILE_THRESHOLD = 0.004   # Share of a tile's pixels that must change for the tile to be reported (4 of 1024)
+MANIFEST_NAME = 'golden.json'
+HASH_SIZE = 8            # Perceptual hash: the 8x8 lowest frequencies of a 32x32 DCT
+
+
+# === SIGNATURES AND HASHES ==================================================
+
+def source_signature(path):
+    """Stable hash of what the render depends on: DOCX member CRCs, else the file bytes"""
+    import zipfile
+
+    from artifact_registry import content_hash
+
+    path = Path(path)
+    if path.suffix.lower() == '.docx':
+        with zipfile.ZipFile(path) as archive:
+            members = sorted(f"{i.filename}:{i.CRC:08x}:{i.file_size}" for i in archive.infolist())
+        return hashlib.sha256('\n'.join(members).encode('utf-8')).hexdigest()
+    return content_hash(path)
+
+
+def html_signature(html_path):
+    """Signature of an HTML edition, or None when it cannot be trusted (the page is then always rendered)
+
+    The bundle is rebuilt whenever the page, a linked stylesheet, font or image
+    changes, and its marker hashes all of them; a page that is already a
+    bundle is self-contained, so its bytes are enough.
+    """
+    from artifact_registry import content_hash
+    from bundle_html import bundle_for_render, bundle_marker, is_bundled
+
+    if is_bundled(html_path):
+        return content_hash(html_path)
+    bundle = bundle_for_render(html_path)
+    return None if Path(bundle) == Path(html_path) else bundle_marker(bundle)
+
+
+def output_signature(output):
+    """source_signature(), with HTML editions signed through their bundle"""
+    if Path(output).suffix.lower() in ('.html', '.htm'):
+        return html_signature(output)
+    return source_signature(output)
+
+
+def pixel_hash(pixels):
+    return hashlib.sha256(f"{pixels.shape}".encode() + pixels.tobytes()).hexdigest()
+
+
+def _dct_matrix(n):
+    import numpy as np
+
+    k = np.arange(n)[:, None]
+    return np.cos(np.pi * (2 * np.arange(n)[None, :] + 1) * k / (2 * n))
+
+
+def perceptual_hash(pixels):
+    """64-bit pHash (hex): low-frequency DCT coefficients of the 32x32 greyscale page above their median"""
+    import numpy as np
+    from PIL import Image
+
+    size = HASH_SIZE * 4
+    grey = Image.fromarray(pixels).convert('L').resize((size, size), Image.LANCZOS)
+    dct = _dct_matrix(size)
+    coefficients = (dct @ np.asarray(grey, dtype=np.float64) @ dct.T)[:HASH_SIZE, :HASH_SIZE].ravel()
+    bits = coefficients > np.median(coefficients[1:])  # DC term excluded: it only tracks overall brightness
+    return f"{int(''.join('1' if b else '0' for b in bits), 2):016x}"
+
+
+def hash_distance(a, b):
+    """Differing bits between two perceptual hashes (0 = same, 64 = opposite)"""
+    return bin(int(a, 16) ^ int(b, 16)).count('1')
+
+
+def tile_diff(current, golden, tile=TILE, pixel_threshold=PIXEL_THRESHOLD):
+    """Share of changed pixels per tile, as a (rows, cols) array; both images HxWx3 uint8 of the same shape"""
+    import numpy as np
+
+    changed = (np.maximum(current, golden) - np.minimum(current, golden)).max(axis=2) > pixel_threshold  # No int16 copies
+    height, width = changed.shape
+    rows, cols = -(-height // tile), -(-width // tile)
+    padded = np.zeros((rows * tile, cols * tile), dtype=np.uint16)
+    padded[:height, :width] = changed
+    counts = padded.reshape(rows, tile, cols, tile).sum(axis=(1, 3), dtype=np.uint32)
+    tile_heights = np.minimum(tile, height - np.arange(rows) * tile)
+    tile_widths = np.minimum(tile, width - np.arange(cols) * tile)
+    return counts / np.outer(tile_heights, tile_widths)
+
+
+def changed_tiles(fractions, tile=TILE, tile_threshold=TILE_THRESHOLD):
+    """[{'x', 'y', 'size', 'changed'}] in pixels for the tiles over the threshold"""
+    import numpy as np
+
+    rows, cols = np.nonzero(fractions > tile_threshold)
+    return [{'x': int(c) * tile, 'y': int(r) * tile, 'size': tile, 'changed': round(float(fractions[r, c]), 4)}
+            for r, c in zip(rows, cols)]
+
+
+# === RENDERING ==============================================================
+
+def render_pdf_for(output, work_dir):
+    """The PDF whose pages represent output: itself, a DOCX conversion or a Chromium print of the HTML"""
+    output = Path(output)
+    suffix = output.suffix.lower()
+    if suffix == '.pdf':
+        return output
+    pdf = Path(work_dir) / f"{output.stem}.pdf"
+    if suffix == '.docx':
+        from render_memos import convert_docx_to_pdf
+        return convert_docx_to_pdf(output, pdf)
+    if suffix in ('.html', '.htm'):
+        import asyncio
+
+        from bundle_html import bundle_for_render
+        from generate_ultimate import _render_pdf
+        asyncio.run(_render_pdf(bundle_for_render(output), pdf))
+        return pdf
+    raise ValueError(f"Cannot render {output.name}: expected .docx, .html or .pdf")
+
+
+def rasterise(pdf_path, dpi=DPI):
+    """Every page as an HxWx3 uint8 array, rendered once each under the shared pdfium lock"""
+    import numpy as np
+    import pypdfium2
+
+    from previews import _PDFIUM_LOCK
+
+    pages = []
+    with _PDFIUM_LOCK:
+        pdf = pypdfium2.PdfDocument(str(pdf_path))
+        try:
+            for index in range(len(pdf)):
+                page = pdf[index]
+                try:
+                    image = page.render(scale=dpi / 72).to_pil().convert('RGB')
+                finally:
+                    page.close()
+                pages.append(np.asarray(image))
+        finally:
+            pdf.close()
+    return pages
+
+
+# === GOLDENS ================================================================
+
+def golden_dir(output, root=GOLDEN_DIR):
+    return Path(root) / Path(output).name
+
+
+def load_golden(output, root=GOLDEN_DIR):
+    try:
+        return json.loads((golden_dir(output, root) / MANIFEST_NAME).read_text(encoding='utf-8'))
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def load_golden_page(output, number, root=GOLDEN_DIR):
+    import numpy as np
+    from PIL import Image
+
+    with Image.open(golden_dir(output, root) / f"p{number}.png") as image:
+        return np.asarray(image.convert('RGB'))
+
+
+def approve(output, signature, pages, dpi=DPI, root=GOLDEN_DIR):
+    """Store the current page renders as output's goldens; the manifest is written last"""
+    from PIL import Image
+
+    directory = golden_dir(output, root)
+    if directory.exists():
+        shutil.rmtree(directory)
+    directory.mkdir(parents=True)
+    entries = []
+    for number, pixels in enumerate(pages, 1):
+        Image.fromarray(pixels).save(directory / f"p{number}.png", 'PNG', compress_level=6)
+        entries.append({'page': number, 'width': pixels.shape[1], 'height': pixels.shape[0],
+                        'pixels': pixel_hash(pixels), 'phash': perceptual_hash(pixels)})
+    manifest = {'source': Path(output).name, 'signature': signature, 'dpi': dpi, 'pages': entries,
+                'approved': time.strftime('%Y-%m-%dT%H:%M:%S')}
+    partial = directory / f"{MANIFEST_NAME}.{os.getpid()}.tmp"
+    partial.write_text(json.dumps(manifest, indent=1), encoding='utf-8')
+    os.replace(partial, directory / MANIFEST_NAME)
+    return manifest
+
+
+def save_overlay(pixels, tiles, target):
+    """The current page with its changed tiles tinted red and outlined"""
+    from PIL import Image, ImageDraw
+
+    image = Image.fromarray(pixels).convert('RGBA')
+    layer = Image.new('RGBA', image.size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(layer)
+    for t in tiles:
+        draw.rectangle((t['x'], t['y'], t['x'] + t['size'] - 1, t['y'] + t['size'] - 1),
+                       fill=(220, 38, 38, 70), outline=(220, 38, 38, 255))
+    target.parent.mkdir(parents=True, exist_ok=True)
+    Image.alpha_composite(image, layer).convert('RGB').save(target, 'PNG', compress_level=3)
+    return target
+
+
+# === CHECK ==================================================================
+
+def compare_page(output, number, pixels, golden_page, tile=TILE, root=GOLDEN_DIR, diff_dir=VISUAL_DIFF_DIR):
+    """One page against its golden entry: skipped by pixel hash, else diffed tile by tile"""
+    digest = pixel_hash(pixels)
+    if golden_page is None:
+        return {'page': number, 'status': 'new page'}
+    if digest == golden_page['pixels']:
+        return {'page': number, 'status': 'unchanged'}
+    distance = hash_distance(perceptual_hash(pixels), golden_page['phash'])
+    if (pixels.shape[1], pixels.shape[0]) != (golden_page['width'], golden_page['height']):
+        return {'page': number, 'status': 'resized', 'phash_distance': distance,
+                'size': [pixels.shape[1], pixels.shape[0]], 'golden_size': [golden_page['width'], golden_page['height']]}
+    tiles = changed_tiles(tile_diff(pixels, load_golden_page(output, number, root), tile), tile)
+    if not tiles:
+        return {'page': number, 'status': 'within tolerance', 'phash_distance': distance}
+    overlay = save_overlay(pixels, tiles, Path(diff_dir) / Path(output).name / f"p{number}.png")
+    return {'page': number, 'status': 'changed', 'phash_distance': distance, 'tiles': tiles,
+            'bbox': [min(t['x'] for t in tiles), min(t['y'] for t in tiles),
+                     max(t['x'] + t['size'] for t in tiles), max(t['y'] + t['size'] for t in tiles)],
+            'overlay': str(overlay)}
+
+
+def check_output(output, dpi=DPI, tile=TILE, force=False, root=GOLDEN_DIR, diff_dir=VISUAL_DIFF_DIR, work_dir=None):
+    """Check one output against its goldens; returns a report whose 'status' is one of
+    unchanged / passed / changed / no golden"""
+    started = time.perf_counter()
+    output = Path(output)
+    golden = load_golden(output, root)
+    signature = output_signature(output)
+    report = {'output': output.name, 'signature': signature, 'rendered': False}
+    if golden and not force and signature and golden['signature'] == signature and golden['dpi'] == dpi:
+        return {**report, 'status': 'unchanged', 'pages': [], 'ms': round((time.perf_counter() - started) * 1000, 1)}
+
+    with tempfile.TemporaryDirectory(prefix='ahk_visual_', dir=work_dir) as scratch:
+        pages = rasterise(render_pdf_for(output, scratch), dpi)
+    report.update(rendered=True, page_count=len(pages))
+    if not golden:
+        return {**report, 'status': 'no golden', 'pages': [], 'ms': round((time.perf_counter() - started) * 1000, 1)}
+    if golden['dpi'] != dpi:
+        raise ValueError(f"Goldens for {output.name} are at {golden['dpi']} dpi; check with --dpi {golden['dpi']}")
+
+    shutil.rmtree(Path(diff_dir) / output.name, ignore_errors=True)
+    golden_pages = {entry['page']: entry for entry in golden['pages']}
+    results = [compare_page(output, number, pixels, golden_pages.get(number), tile, root, diff_dir)
+               for number, pixels in enumerate(pages, 1)]
+    results += [{'page': number, 'status': 'missing page'} for number in sorted(golden_pages) if number > len(pages)]
+    passed = all(r['status'] in ('unchanged', 'within tolerance') for r in results)
+    return {**report, 'status': 'passed' if passed else 'changed', 'pages': results,
+            'ms': round((time.perf_counter() - started) * 1000, 1)}
+
+
+def default_outputs():
+    return [path for path in EDITIONS if path.exists()]
+
+
+def check_outputs(outputs=None, dpi=DPI, tile=TILE, force=False, workers=None, telemetry=None):
+    """Check outputs (default: every existing edition) in parallel; returns the reports in input order
+
+    Conversions run in separate LibreOffice/Chromium processes and numpy
+    releases the GIL for the diffs; pdfium rasterises one page at a time.
+    """
+    outputs = [Path(o) for o in (outputs or default_outputs())]
+
+    def run(output):
+        if telemetry is None:
+            return check_output(output, dpi, tile, force)
+        with telemetry.stage('visual_check', source=output.name) as stage:
+            report = check_output(output, dpi, tile, force)
+            stage.update(status=report['status'], rendered=report['rendered'],
+                         changed_pages=sum(p['status'] != 'unchanged' for p in report['pages']))
+            return report
+
+    def guarded(output):
+        try:
+            return run(output)
+        except Exception as e:
+            return {'output': output.name, 'status': 'error', 'error': f"{type(e).__name__}: {e}", 'pages': []}
+
+    with ThreadPoolExecutor(max_workers=workers or min(len(outputs) or 1, os.cpu_count() or 1, 4)) as pool:
+        return list(pool.map(guarded, outputs))
+
+
+def approve_outputs(outputs=None, dpi=DPI):
+    """Render outputs (default: every existing edition) and store them as the new goldens"""
+    manifests = []
+    for output in [Path(o) for o in (outputs or default_outputs())]:
+        signature = output_signature(output)
+        with tempfile.TemporaryDirectory(prefix='ahk_visual_') as scratch:
+            pages = rasterise(render_pdf_for(output, scratch), dpi)
+        manifests.append(approve(output, signature, pages, dpi))
+    return manifests
+
+
+def print_report(reports):
+    """Console summary; returns how many outputs failed"""
+    failed = 0
+    for report in reports:
+        status = report['status']
+        if status == 'error':
+            failed += 1
+            print(f"❌ {report['output']}: {report['error']}")
+            continue
+        if status == 'no golden':
+            failed += 1
+            print(f"⚠️  {report['output']}: no golden yet ({report['page_count']} pages) - run approve")
+            continue
+        if status == 'unchanged':
+            print(f"✅ {report['output']}: unchanged source, skipped ({report['ms']:.0f} ms)")
+            continue
+        skipped = sum(p['status'] == 'unchanged' for p in report['pages'])
+        if status == 'passed':
+            print(f"✅ {report['output']}: {report['page_count']} pages match "
+                  f"({skipped} by hash) in {report['ms']:.0f} ms")
+            continue
+        failed += 1
+        print(f"❌ {report['output']}: changed ({report['ms']:.0f} ms)")
+        for page in report['pages']:
+            if page['status'] in ('unchanged', 'within tolerance'):
+                continue
+            if page['status'] == 'changed':
+                x0, y0, x1, y1 = page['bbox']
+                print(f"   p{page['page']}: {len(page['tiles'])} tiles changed in ({x0},{y0})-({x1},{y1}), "
+                      f"pHash distance {page['phash_distance']} → {page['overlay']}")
+            elif page['status'] == 'resized':
+                print(f"   p{page['page']}: page size {page['golden_size']} → {page['size']}")
+            else:
+                print(f"   p{page['page']}: {page['status']}")
+    return failed
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check letterhead outputs against approved page renders")
+    parser.add_argument('action', choices=['check', 'approve'])
+    parser.add_argument('outputs', nargs='*', type=Path, metavar='OUTPUT',
+                        help="DOCX, HTML or PDF files (default: every edition that exists)")
+    parser.add_argument('--dpi', type=int, default=DPI)
+    parser.add_argument('--tile', type=int, default=TILE, help="Diff tile size in pixels")
+    parser.add_argument('--force', action='store_true', help="Render even when the source signature is unchanged")
+    parser.add_argument('--json', type=Path, metavar='PATH', help="Also write the check reports as JSON")
+    parser.add_argument('--telemetry', nargs='?', const='1', metavar='PATH',
+                        help="Append JSONL stage events to PATH ('-' = stdout, default: Reports/pipeline_telemetry.jsonl)")
+    parser.add_argument('--quiet', action='store_true', help="Suppress the console banners")
+    args = parser.parse_intermixed_args(argv)  # 'check --force A.docx B.pdf'
+
+    telemetry = Telemetry.from_env('AHK', args.telemetry, args.quiet)
+    with telemetry.console():
+        if args.action == 'approve':
+            for manifest in approve_outputs(args.outputs, args.dpi):
+                print(f"✅ {manifest['source']}: {len(manifest['pages'])} golden pages → "
+                      f"{golden_dir(manifest['source'])}")
+            return 0
+        started = time.perf_counter()
+        reports = check_outputs(args.outputs, args.dpi, args.tile, args.force, telemetry=telemetry)
+        failed = print_report(reports)
+        if args.json:
+            args.json.write_text(json.dumps(reports, indent=1), encoding='utf-8')
+        print(f"\n{'❌' if failed else '✅'} {len(reports) - failed}/{len(reports)} outputs match their goldens "
+              f"({time.perf_counter() - started:.1f} s)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
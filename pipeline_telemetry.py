@@ -0,0 +1,190 @@
+"""
+Structured JSONL Telemetry for Pipeline Runs
+One JSON object per line for each stage start/end, appended to the file
+telemetry_collector.js (beside this module) folds into the daily report, or
+written to stdout. Shared by the ERIC extractor and the Brand/Letterheads
+tools, which wrap it with their own environment prefix, so extraction and
+letterhead events keep one schema:
+
+    telemetry = Telemetry.from_env('ERIC')   # ERIC_TELEMETRY=1|PATH|-  ERIC_QUIET=1
+    with telemetry.console(), telemetry.stage('extract', bytes_in=size) as stage:
+        ...
+        stage.update(pages=n)
+        stage.add_output(output_file)
+
+stage_end events carry status, duration_ms, pages_per_sec (when pages is
+set), bytes_in/bytes_out and the process max RSS. {prefix}_TELEMETRY_MEMORY=1
+adds a per-stage tracemalloc peak (peak_memory_bytes); it is opt-in because
+tracing slows pure-Python PDF backends ~10x and would skew every timing.
+Appends are single writes, so batch workers can share one file.
+
+Standard library only.
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPO_ROOT = Path(__file__).resolve().parent
+TELEMETRY_FILE = REPO_ROOT / "server" / "Emma_KnowledgeBase" / "Reports" / "pipeline_telemetry.jsonl"
+
+
+class Stage:
+    """Fields reported on a stage's end event"""
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = dict(fields)
+        self.peak = 0
+
+    def update(self, **fields):
+        self.fields.update(fields)
+
+    def add_input(self, *paths):
+        self.fields['bytes_in'] = self.fields.get('bytes_in', 0) + _size(paths)
+
+    def add_output(self, *paths):
+        self.fields['bytes_out'] = self.fields.get('bytes_out', 0) + _size(paths)
+
+
+def _size(paths):
+    total = 0
+    for path in paths:
+        if path and Path(path).is_file():
+            total += Path(path).stat().st_size
+    return total
+
+
+class Telemetry:
+    """JSONL stage events to a file ('-' for stdout); sink=None disables everything but quiet"""
+
+    def __init__(self, sink=None, quiet=False, run=None, trace_memory=False):
+        self.sink = None if sink is None else (sink if sink == '-' else Path(sink))
+        self.quiet = quiet or sink == '-'  # Banners would corrupt JSONL on stdout
+        self.run = run or uuid.uuid4().hex[:12]
+        self.trace_memory = trace_memory
+        self._stack = []
+        self._tracing = False
+
+    @classmethod
+    def from_env(cls, prefix, sink=None, quiet=False, default_file=None):
+        """Build from {prefix}_TELEMETRY (1 = default_file, PATH or -) and {prefix}_QUIET=1
+
+        Explicit sink/quiet arguments (CLI flags) win over the environment.
+        {prefix}_RUN_ID groups events from separate invocations under one run;
+        {prefix}_TELEMETRY_MEMORY=1 turns on tracemalloc peaks. default_file
+        falls back to TELEMETRY_FILE.
+        """
+        sink = sink or os.environ.get(f"{prefix}_TELEMETRY") or None
+        if sink == '1':
+            sink = default_file or TELEMETRY_FILE
+        return cls(sink, quiet or os.environ.get(f"{prefix}_QUIET") == '1',
+                   run=os.environ.get(f"{prefix}_RUN_ID"),
+                   trace_memory=os.environ.get(f"{prefix}_TELEMETRY_MEMORY") == '1')
+
+    @property
+    def enabled(self):
+        return self.sink is not None
+
+    def settings(self):
+        """Picklable constructor kwargs, so pool workers emit into the same sink and run"""
+        return {'sink': None if self.sink is None else str(self.sink), 'run': self.run,
+                'trace_memory': self.trace_memory}
+
+    def emit(self, event, **fields):
+        if self.sink is None:
+            return
+        record = {'event': event, 'run': self.run, 'pid': os.getpid(),
+                  'ts': datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+                  **fields}
+        line = json.dumps(record, default=str) + '\n'
+        if self.sink == '-':
+            sys.__stdout__.write(line)
+            sys.__stdout__.flush()
+            return
+        self.sink.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.sink, 'a', encoding='utf-8') as f:
+            f.write(line)
+
+    @contextmanager
+    def console(self):
+        """Suppress banner prints in quiet mode (errors on stderr still show)"""
+        if not self.quiet:
+            yield
+            return
+        with open(os.devnull, 'w', encoding='utf-8') as devnull, redirect_stdout(devnull):
+            yield
+
+    @contextmanager
+    def stage(self, name, **fields):
+        """Time a stage; yields a Stage whose fields land on the stage_end event"""
+        stage = Stage(name, fields)
+        if self.sink is None:
+            yield stage
+            return
+        self._start_memory_trace(stage)
+        self.emit('stage_start', stage=name, **stage.fields)
+        started = time.perf_counter()
+        status, error = 'ok', None
+        try:
+            yield stage
+        except BaseException as e:
+            status, error = 'error', f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            peak = self._stop_memory_trace(stage)
+            record = {'stage': name, 'status': status, 'duration_ms': round(duration * 1000, 3), **stage.fields}
+            if stage.fields.get('pages'):
+                record['pages_per_sec'] = round(stage.fields['pages'] / max(duration, 1e-9), 2)
+            if peak is not None:
+                record['peak_memory_bytes'] = peak
+            if resource:
+                record['max_rss_bytes'] = _max_rss()
+            if error:
+                record['error'] = error
+            self.emit('stage_end', **record)
+
+    def _start_memory_trace(self, stage):
+        if not self.trace_memory:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        # reset_peak() is process-wide: fold the peak so far into the enclosing stages first
+        current_peak = tracemalloc.get_traced_memory()[1]
+        for parent in self._stack:
+            parent.peak = max(parent.peak, current_peak)
+        tracemalloc.reset_peak()
+        self._stack.append(stage)
+
+    def _stop_memory_trace(self, stage):
+        if not self.trace_memory:
+            return None
+        peak = max(stage.peak, tracemalloc.get_traced_memory()[1])
+        self._stack.pop()
+        for parent in self._stack:
+            parent.peak = max(parent.peak, peak)
+        if not self._stack and self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+        return peak
+
+
+def _max_rss():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+DISABLED = Telemetry()
@@ -17,6 +17,7 @@ console.log('🔍 ENV CHECK:');
 console.log('   OPENAI_API_KEY:', process.env.OPENAI_API_KEY ? '✅ Loaded' : '❌ MISSING');
 console.log('   GEMINI_API_KEY:', process.env.GEMINI_API_KEY ? '✅ Loaded' : '❌ MISSING');
 console.log('   ELEVENLABS_API_KEY:', process.env.ELEVENLABS_API_KEY ? '✅ Loaded' : '❌ MISSING');
+console.log('   AHK_BRAND_API_TOKEN:', process.env.AHK_BRAND_API_TOKEN ? '✅ Loaded' : '⚠️  MISSING (/api/brand disabled)');
 
 // Now import modules that depend on environment variables
 import express from "express";
@@ -50,6 +51,9 @@ import dashboardDataRouter from "./routes/dashboardData.js";
 // Import fusion router
 import fusionRouter from "./routes/fusion.js";
 
+// Import brand router (proxies to the warm brand daemon)
+import brandRouter from "./routes/brand.js";
+
 // Import fusion emitter service
 import { initializeFusionEmitter, getFusionEmitterHealth } from "./services/fusionEmitter.js";
 
@@ -76,6 +80,9 @@ app.use("/api", dashboardDataRouter);
 // Mount fusion router at /api/fusion
 app.use("/api/fusion", fusionRouter);
 
+// Mount brand router at /api/brand
+app.use("/api/brand", brandRouter);
+
 // Health check
 app.get("/api/health", (_req, res) => res.json({ ok: true, ts: Date.now() }));
 
@@ -0,0 +1,137 @@
+// server/routes/brand.js
+// Brand API - Proxies letterhead generation, conversion and verification to the warm Python brand daemon
+// (Brand/Letterheads/brand_daemon.py) so requests skip the Python/python-docx cold start,
+// and serves the PDF preview images the generators cache eagerly (Brand/Letterheads/previews.py)
+//
+// Every route except /health and the content-addressed previews needs
+// "Authorization: Bearer $AHK_BRAND_API_TOKEN"; without the variable those routes are disabled.
+// Documents are referenced by memo id, artifact hash or a file inside the brand directories,
+// never by an arbitrary server path (the daemon resolves and confines every reference).
+
+import crypto from "crypto";
+import express from "express";
+import http from "http";
+import path from "path";
+import { fileURLToPath } from "url";
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = path.dirname(__filename);
+
+const router = express.Router();
+
+// ---------- DAEMON ADDRESS ----------
+const BRAND_SOCKET = process.env.AHK_BRAND_SOCKET || null;
+const BRAND_HOST = process.env.AHK_BRAND_HOST || "127.0.0.1";
+const BRAND_PORT = Number(process.env.AHK_BRAND_PORT || 8765);
+const BRAND_TIMEOUT_MS = Number(process.env.AHK_BRAND_TIMEOUT_MS || 130000);
+
+// ---------- PREVIEW CACHE ----------
+// Previews/ab/<sha256>/p1_w320.webp + previews.json, keyed by the PDF's content hash
+const PREVIEW_DIR = process.env.AHK_PREVIEW_DIR || path.join(__dirname, "../../Brand/Letterheads/Previews");
+const PREVIEW_HASH = /^[0-9a-f]{64}$/;
+const PREVIEW_FILE = /^(?:p\d+_w\d+\.(?:webp|png)|previews\.json)$/;
+
+// ---------- ACCESS ----------
+// Read per request: static imports run before server/index.js loads .env
+function requireToken(req, res, next) {
+  const BRAND_API_TOKEN = process.env.AHK_BRAND_API_TOKEN;
+  if (!BRAND_API_TOKEN) {
+    return res.status(503).json({ ok: false, error: "Brand API disabled: AHK_BRAND_API_TOKEN is not set" });
+  }
+  const supplied = Buffer.from((req.get("authorization") || "").replace(/^Bearer\s+/i, ""));
+  const expected = Buffer.from(BRAND_API_TOKEN);
+  if (supplied.length !== expected.length || !crypto.timingSafeEqual(supplied, expected)) {
+    return res.status(401).json({ ok: false, error: "Unauthorized" });
+  }
+  next();
+}
+
+// One keep-alive agent: the daemon speaks HTTP/1.1, so connections are reused across requests
+const agent = new http.Agent({ keepAlive: true, maxSockets: 16 });
+
+// ---------- HELPER: Forward one request to the daemon ----------
+function callDaemon(method, route, body) {
+  return new Promise((resolve, reject) => {
+    const payload = body === undefined ? null : Buffer.from(JSON.stringify(body));
+    const target = BRAND_SOCKET ? { socketPath: BRAND_SOCKET } : { host: BRAND_HOST, port: BRAND_PORT, agent };
+    const req = http.request(
+      {
+        ...target,
+        method,
+        path: route,
+        timeout: BRAND_TIMEOUT_MS,
+        headers: payload
+          ? { "Content-Type": "application/json", "Content-Length": payload.length }
+          : {},
+      },
+      (res) => {
+        const chunks = [];
+        res.on("data", (chunk) => chunks.push(chunk));
+        res.on("end", () => {
+          const raw = Buffer.concat(chunks).toString("utf8");
+          try {
+            resolve({ status: res.statusCode, retryAfter: res.headers["retry-after"], data: JSON.parse(raw) });
+          } catch {
+            resolve({ status: 502, data: { error: "Invalid response from brand daemon" } });
+          }
+        });
+      }
+    );
+    req.on("timeout", () => req.destroy(new Error("Brand daemon timed out")));
+    req.on("error", reject);
+    if (payload) req.write(payload);
+    req.end();
+  });
+}
+
+function forward(method, route) {
+  return async (req, res) => {
+    try {
+      const { status, retryAfter, data } = await callDaemon(method, route, method === "POST" ? req.body || {} : undefined);
+      if (retryAfter) res.set("Retry-After", retryAfter); // 503 backpressure passes straight through
+      res.status(status).json({ ok: status < 400, ...data });
+    } catch (err) {
+      console.error(`[Brand] Daemon unavailable for ${route}:`, err.message);
+      res.status(503).json({
+        ok: false,
+        error: "Brand daemon unavailable",
+        message: err.message,
+      });
+    }
+  };
+}
+
+// ---------- ROUTES ----------
+
+// GET /api/brand/health - Daemon liveness and queue depth
+router.get("/health", forward("GET", "/health"));
+
+// GET /api/brand/stats - Queue depth and p50/p95/p99 latency per endpoint
+router.get("/stats", requireToken, forward("GET", "/stats"));
+
+// POST /api/brand/generate - { markdown | memo, title?, subject?, pdf? } → branded DOCX (and PDF)
+router.post("/generate", requireToken, forward("POST", "/generate"));
+
+// POST /api/brand/convert - { docx | html } (artifact hash or file in the brand directories) → PDF
+router.post("/convert", requireToken, forward("POST", "/convert"));
+
+// POST /api/brand/verify - { docx } (artifact hash or file in the brand directories) → section/paragraph/footer summary
+router.post("/verify", requireToken, forward("POST", "/verify"));
+
+// GET /api/brand/preview/:hash/:file - Cached preview image (or previews.json); never renders on request
+router.get("/preview/:hash/:file", (req, res) => {
+  const { hash, file } = req.params;
+  if (!PREVIEW_HASH.test(hash) || !PREVIEW_FILE.test(file)) {
+    return res.status(400).json({ ok: false, error: "Invalid preview reference" });
+  }
+  // Content-addressed: a given URL never changes, so browsers may keep it forever
+  res.sendFile(path.join(PREVIEW_DIR, hash.slice(0, 2), hash, file), {
+    headers: { "Cache-Control": "public, max-age=31536000, immutable" },
+  }, (err) => {
+    if (err && !res.headersSent) {
+      res.status(err.status === 404 ? 404 : 500).json({ ok: false, error: "Preview not found" });
+    }
+  });
+});
+
+export default router;
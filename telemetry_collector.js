@@ -7,6 +7,7 @@
 import 'dotenv/config';
 import fs from 'fs';
 import path from 'path';
+import readline from 'readline';
 import { fileURLToPath } from 'url';
 
 const __filename = fileURLToPath(import.meta.url);
@@ -15,6 +16,8 @@ const __dirname = path.dirname(__filename);
 const TELEMETRY_DIR = path.join(__dirname, 'server/Emma_KnowledgeBase/Reports/Generated');
 const BACKEND_URL = process.env.BACKEND_URL || process.env.VITE_BACKEND_URL || 'http://localhost:4000';
 const EMMA_ENGINE_URL = process.env.EMMA_ENGINE_URL || process.env.VITE_EMMA_ENGINE_URL || 'http://localhost:7070';
+// JSONL stage events appended by the Python extractor and letterhead scripts (telemetry.py)
+const PIPELINE_TELEMETRY_FILE = process.env.PIPELINE_TELEMETRY_FILE || path.join(__dirname, 'server/Emma_KnowledgeBase/Reports/pipeline_telemetry.jsonl');
 
 // ==================== TELEMETRY COLLECTION ====================
 
@@ -106,6 +109,55 @@ async function collectDriveSyncMetrics() {
   }
 }
 
+/**
+ * Summarize pipeline stage_end events from the last 24h, per stage
+ */
+async function collectPipelineMetrics(since = Date.now() - 24 * 60 * 60 * 1000) {
+  if (!fs.existsSync(PIPELINE_TELEMETRY_FILE)) {
+    return { status: 'idle', stages: [], timestamp: new Date().toISOString() };
+  }
+
+  const stages = new Map();
+  const lines = readline.createInterface({
+    input: fs.createReadStream(PIPELINE_TELEMETRY_FILE, { encoding: 'utf-8' }),
+    crlfDelay: Infinity
+  });
+
+  for await (const line of lines) {
+    if (!line.trim()) continue;
+    let event;
+    try {
+      event = JSON.parse(line);
+    } catch {
+      continue; // Torn line from a run still writing
+    }
+    if (event.event !== 'stage_end' || Date.parse(event.ts) < since) continue;
+
+    const stage = stages.get(event.stage) || { stage: event.stage, runs: 0, errors: 0, totalMs: 0, pages: 0, bytesOut: 0, peakMemory: 0 };
+    stage.runs++;
+    if (event.status !== 'ok') stage.errors++;
+    stage.totalMs += event.duration_ms || 0;
+    stage.pages += event.pages || 0;
+    stage.bytesOut += event.bytes_out || 0;
+    stage.peakMemory = Math.max(stage.peakMemory, event.peak_memory_bytes || event.max_rss_bytes || 0);
+    stages.set(event.stage, stage);
+  }
+
+  return {
+    status: stages.size ? 'operational' : 'idle',
+    stages: [...stages.values()].map(s => ({
+      stage: s.stage,
+      runs: s.runs,
+      errors: s.errors,
+      avgMs: (s.totalMs / s.runs).toFixed(1),
+      pagesPerSec: s.pages && s.totalMs ? (s.pages / (s.totalMs / 1000)).toFixed(1) : null,
+      bytesOut: s.bytesOut,
+      peakMemoryMB: (s.peakMemory / 1024 / 1024).toFixed(1)
+    })),
+    timestamp: new Date().toISOString()
+  };
+}
+
 /**
  * Calculate uptime percentage (mock - requires persistent storage)
  */
@@ -165,13 +217,14 @@ async function generateTelemetryReport() {
   console.log('📊 [Telemetry] Collecting metrics...');
   
   // Collect all metrics
-  const [backend, emmaEngine, driveSync] = await Promise.all([
+  const [backend, emmaEngine, driveSync, pipeline] = await Promise.all([
     collectBackendMetrics(),
     collectEmmaEngineMetrics(),
-    collectDriveSyncMetrics()
+    collectDriveSyncMetrics(),
+    collectPipelineMetrics()
   ]);
   
-  const metrics = { backend, emmaEngine, driveSync };
+  const metrics = { backend, emmaEngine, driveSync, pipeline };
   
   // Calculate statistics
   const uptime = calculateUptime(metrics);
@@ -238,6 +291,11 @@ ${metrics.driveSync.error ? `- **Error**: ${metrics.driveSync.error}` : ''}
 | Emma Engine | ${metrics.emmaEngine.status === 'operational' ? '✅' : '❌'} ${metrics.emmaEngine.status} | ${metrics.emmaEngine.responseTime} ms |
 | Drive Sync | ${metrics.driveSync.status === 'operational' ? '✅' : metrics.driveSync.status === 'idle' ? '🟡' : '❌'} ${metrics.driveSync.status} | N/A |
 
+### Pipeline Stages (24h)
+${metrics.pipeline.stages.length ? `| Stage | Runs | Errors | Avg Duration | Pages/sec | Peak Memory |
+|-------|------|--------|--------------|-----------|-------------|
+${metrics.pipeline.stages.map(s => `| ${s.stage} | ${s.runs} | ${s.errors} | ${s.avgMs} ms | ${s.pagesPerSec ?? 'N/A'} | ${s.peakMemoryMB} MB |`).join('\n')}` : '*No extraction or letterhead runs recorded (set ERIC_TELEMETRY=1 / AHK_TELEMETRY=1)*'}
+
 ---
 
 ## Usage Statistics
@@ -349,5 +407,6 @@ export default {
   scheduleTelemetryCollection,
   collectBackendMetrics,
   collectEmmaEngineMetrics,
-  collectDriveSyncMetrics
+  collectDriveSyncMetrics,
+  collectPipelineMetrics
 };